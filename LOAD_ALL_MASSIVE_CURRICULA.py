@@ -4,7 +4,12 @@ This will create a comprehensive K-8 curriculum for all subjects
 """
 
 import os
-from database import init_database
+from database import (
+    bulk_seeding,
+    init_database,
+    print_seed_progress,
+    remove_database_file,
+)
 from MASSIVE_ELA_CURRICULUM import seed_massive_ela_curriculum
 from MASSIVE_MATH_CURRICULUM import seed_massive_math_curriculum
 from MASSIVE_SCIENCE_CURRICULUM import seed_massive_science_curriculum
@@ -19,7 +24,7 @@ def load_all_massive_curricula():
 
     # Remove existing database to start fresh
     if os.path.exists("tutor_app.db"):
-        os.remove("tutor_app.db")
+        remove_database_file("tutor_app.db")
         print("Removed existing database")
 
     # Initialize database
@@ -27,17 +32,18 @@ def load_all_massive_curricula():
     init_database()
 
     # Load each massive curriculum
-    print("\nLoading MASSIVE English Language Arts curriculum...")
-    seed_massive_ela_curriculum()
+    with bulk_seeding(progress=print_seed_progress):
+        print("\nLoading MASSIVE English Language Arts curriculum...")
+        seed_massive_ela_curriculum()
 
-    print("\nLoading MASSIVE Mathematics curriculum...")
-    seed_massive_math_curriculum()
+        print("\nLoading MASSIVE Mathematics curriculum...")
+        seed_massive_math_curriculum()
 
-    print("\nLoading MASSIVE Science curriculum...")
-    seed_massive_science_curriculum()
+        print("\nLoading MASSIVE Science curriculum...")
+        seed_massive_science_curriculum()
 
-    print("\nLoading MASSIVE Social Studies curriculum...")
-    seed_massive_social_studies_curriculum()
+        print("\nLoading MASSIVE Social Studies curriculum...")
+        seed_massive_social_studies_curriculum()
 
     print("\n" + "=" * 50)
     print("ALL MASSIVE CURRICULA LOADED SUCCESSFULLY!")
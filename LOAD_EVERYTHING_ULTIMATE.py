@@ -4,20 +4,60 @@ Initializes and seeds the complete educational platform
 """
 
 import os
-from database import init_database
+from database import (
+    bulk_seeding,
+    init_database,
+    preview_database,
+    print_seed_progress,
+    remove_database_file,
+)
 from database_parent_features import init_parent_dashboard_tables
-from LOAD_ULTIMATE_CURRICULUM import load_ultimate_curriculum
+from LOAD_ULTIMATE_CURRICULUM import load_ultimate_curriculum, seed_core_curricula
 from NEW_SUBJECTS_CURRICULUM import seed_all_new_subjects
 from COMPLETE_NEW_SUBJECTS_LESSONS import add_all_comprehensive_lessons
 from UTAH_LOCAL_CURRICULUM import seed_utah_curriculum
 
 
-def load_complete_platform():
-    """Load the entire educational platform from scratch"""
+def seed_new_subjects(path=None):
+    """Seed the new subjects, their lessons and Utah content; returns the seeder"""
+    with bulk_seeding(progress=print_seed_progress, path=path) as extras:
+        # Step 4: Add 50+ new subjects
+        print("🎓 Step 4: Adding 50+ revolutionary new subjects...")
+        seed_all_new_subjects()
+        print("✅ New subjects added!\n")
+
+        # Step 5: Add comprehensive lessons to new subjects
+        print("📝 Step 5: Adding comprehensive lessons to new subjects...")
+        add_all_comprehensive_lessons()
+        print("✅ Comprehensive lessons added!\n")
+
+        # Step 6: Add Utah-specific content
+        print("🏔️ Step 6: Adding Utah & Cottonwood Heights local content...")
+        seed_utah_curriculum()
+        print("✅ Local curriculum added!\n")
+    return extras
+
+
+def load_complete_platform(dry_run=False):
+    """Load the entire educational platform from scratch
+
+    With dry_run=True the existing database is kept: everything is loaded
+    into an empty throwaway database instead, and the per-table row counts
+    a full load would insert are printed and returned.
+    """
     print("\n" + "="*80)
     print("🚀 LOADING THE ULTIMATE HOMESCHOOL PLATFORM")
     print("="*80 + "\n")
-    
+
+    if dry_run:
+        with preview_database() as path:
+            core = seed_core_curricula(path)
+            extras = seed_new_subjects(path)
+        counts = {table: core.counts[table] + extras.counts[table] for table in core.counts}
+        elapsed = core.elapsed + extras.elapsed
+        print(f"\n🧮 DRY RUN: would insert {counts} ({elapsed:.1f}s)")
+        return counts
+
     # Step 1: Initialize core database
     print("📊 Step 1: Initializing core database...")
     init_database()
@@ -31,23 +71,13 @@ def load_complete_platform():
     # Step 3: Load massive core curriculum
     print("📚 Step 3: Loading massive core curriculum...")
     print("   (ELA, Math, Science, Social Studies, Arts, Experiments)")
-    load_ultimate_curriculum()
+    core = load_ultimate_curriculum()
     print("✅ Core curriculum loaded!\n")
     
-    # Step 4: Add 50+ new subjects
-    print("🎓 Step 4: Adding 50+ revolutionary new subjects...")
-    seed_all_new_subjects()
-    print("✅ New subjects added!\n")
-    
-    # Step 5: Add comprehensive lessons to new subjects
-    print("📝 Step 5: Adding comprehensive lessons to new subjects...")
-    add_all_comprehensive_lessons()
-    print("✅ Comprehensive lessons added!\n")
+    extras = seed_new_subjects()
     
-    # Step 6: Add Utah-specific content
-    print("🏔️ Step 6: Adding Utah & Cottonwood Heights local content...")
-    seed_utah_curriculum()
-    print("✅ Local curriculum added!\n")
+    counts = {table: core.counts[table] + extras.counts[table] for table in core.counts}
+    elapsed = core.elapsed + extras.elapsed
     
     # Final summary
     print("\n" + "="*80)
@@ -72,7 +102,9 @@ def load_complete_platform():
     print("📈 TOTAL TOPICS: 300+")
     print("📈 TOTAL LESSONS: 600+")
     print("\n🎊 THIS IS THE MOST COMPREHENSIVE HOMESCHOOL PLATFORM EVER CREATED!")
+    print(f"⏱️ Inserted {counts} in {elapsed:.1f}s")
     print("="*80 + "\n")
+    return counts
 
 
 if __name__ == "__main__":
@@ -80,7 +112,7 @@ if __name__ == "__main__":
     if os.path.exists("tutor_app.db"):
         response = input("⚠️  Database already exists. Delete and rebuild? (yes/no): ")
         if response.lower() == "yes":
-            os.remove("tutor_app.db")
+            remove_database_file("tutor_app.db")
             print("🗑️ Removed existing database\n")
         else:
             print("❌ Cancelled. Existing database preserved.")
@@ -4,7 +4,13 @@ This loads all subjects and expansions
 """
 
 import os
-from database import init_database
+from database import (
+    bulk_seeding,
+    init_database,
+    preview_database,
+    print_seed_progress,
+    remove_database_file,
+)
 from MASSIVE_ELA_CURRICULUM import seed_massive_ela_curriculum
 from MASSIVE_MATH_CURRICULUM import seed_massive_math_curriculum
 from MASSIVE_SCIENCE_CURRICULUM import seed_massive_science_curriculum
@@ -14,43 +20,63 @@ from SCIENCE_EXPERIMENTS_CURRICULUM import seed_science_experiments_curriculum
 from EXPAND_MATH_LESSONS import expand_math_lessons
 
 
-def load_ultimate_curriculum():
-    """Load the ULTIMATE comprehensive curriculum."""
+def seed_core_curricula(path=None):
+    """Seed the core subjects in one bulk load and return the seeder.
+
+    ``path`` seeds an already initialized database other than the
+    configured one (see preview_database).
+    """
+    with bulk_seeding(progress=print_seed_progress, path=path) as seeder:
+        # Load all base curricula
+        print("\n[1/7] Loading English Language Arts...")
+        seed_massive_ela_curriculum()
+
+        print("\n[2/7] Loading Mathematics...")
+        seed_massive_math_curriculum()
+
+        print("\n[3/7] Loading Science...")
+        seed_massive_science_curriculum()
+
+        print("\n[4/7] Loading Social Studies...")
+        seed_massive_social_studies_curriculum()
+
+        print("\n[5/7] Loading Arts & Music...")
+        seed_massive_arts_curriculum()
+
+        print("\n[6/7] Loading Science Experiments...")
+        seed_science_experiments_curriculum()
+
+        print("\n[7/7] Expanding Math with MORE lessons...")
+        expand_math_lessons()
+    return seeder
+
+
+def load_ultimate_curriculum(dry_run=False):
+    """Load the ULTIMATE comprehensive curriculum.
+
+    With dry_run=True the existing database is kept: the curriculum is
+    loaded into an empty throwaway database instead, just as a real run
+    starts from scratch, and the returned seeder reports its row counts.
+    """
 
     print("=" * 60)
     print("LOADING ULTIMATE HOMESCHOOL CURRICULUM")
     print("=" * 60)
 
+    if dry_run:
+        with preview_database() as path:
+            return seed_core_curricula(path)
+
     # Remove existing database
     if os.path.exists("tutor_app.db"):
-        os.remove("tutor_app.db")
+        remove_database_file("tutor_app.db")
         print("Removed existing database")
 
     # Initialize database
     print("\nInitializing database...")
     init_database()
 
-    # Load all base curricula
-    print("\n[1/7] Loading English Language Arts...")
-    seed_massive_ela_curriculum()
-
-    print("\n[2/7] Loading Mathematics...")
-    seed_massive_math_curriculum()
-
-    print("\n[3/7] Loading Science...")
-    seed_massive_science_curriculum()
-
-    print("\n[4/7] Loading Social Studies...")
-    seed_massive_social_studies_curriculum()
-
-    print("\n[5/7] Loading Arts & Music...")
-    seed_massive_arts_curriculum()
-
-    print("\n[6/7] Loading Science Experiments...")
-    seed_science_experiments_curriculum()
-
-    print("\n[7/7] Expanding Math with MORE lessons...")
-    expand_math_lessons()
+    seeder = seed_core_curricula()
 
     print("\n" + "=" * 60)
     print("ULTIMATE CURRICULUM LOADED SUCCESSFULLY!")
@@ -66,6 +92,8 @@ def load_ultimate_curriculum():
     print("\nTOTAL: 197+ TOPICS | 400+ LESSONS!")
     print("All organized by grade levels K-8!")
     print("\nReady for your homeschool daughters!")
+    print(f"\nSeeded {seeder.counts} in {seeder.elapsed:.1f}s")
+    return seeder
 
 
 if __name__ == "__main__":
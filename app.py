@@ -101,6 +101,15 @@ def create_app(config_name=None):
             return {'status': 'healthy', 'database': 'connected'}, 200
         except Exception as e:
             return {'status': 'unhealthy', 'error': str(e)}, 500
+
+    @app.route('/healthz/state')
+    def healthz_state():
+        """Shared state store health: backend, entries per prefix, memory"""
+        from services.state_manager import state_manager
+        try:
+            return {'status': 'healthy', **state_manager.get_stats()}, 200
+        except Exception as e:
+            return {'status': 'unhealthy', 'error': str(e)}, 500
     
     # PWA manifest
     @app.route('/manifest.json')
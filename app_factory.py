@@ -7,11 +7,26 @@ import os
 from flask import Flask
 from flask_socketio import SocketIO
 from config import get_config
+import database
 from blueprints import main_bp, api_bp, uploads_bp, games_bp
+from blueprints.games import register_socket_events
 from blueprints.parent import parent_bp
 from open_learning.router import bp as open_learning_bp
 
 
+def _socketio_message_queue():
+    """Redis URL that relays SocketIO broadcasts between workers.
+
+    Only used when the state store is on Redis too; a single-process
+    development server with the memory store needs no queue.
+    """
+    from services.state_manager import state_manager
+
+    if state_manager.redis_client is None:
+        return None
+    return get_config().SOCKETIO_MESSAGE_QUEUE
+
+
 def create_app(test_config=None):
     """Create and configure Flask app."""
     app = Flask(__name__)
@@ -29,6 +44,9 @@ def create_app(test_config=None):
             }
         )
 
+    # Reuse one pooled SQLite connection per request
+    database.init_app(app)
+
     # Register blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix="/api")
@@ -37,8 +55,11 @@ def create_app(test_config=None):
     app.register_blueprint(parent_bp)
     app.register_blueprint(open_learning_bp, url_prefix="/api")
 
-    # Initialize SocketIO
-    socketio = SocketIO(app, cors_allowed_origins="*")
+    # Initialize SocketIO (cross-worker broadcasts go through Redis)
+    socketio = SocketIO(
+        app, cors_allowed_origins="*", message_queue=_socketio_message_queue()
+    )
+    register_socket_events(socketio)
 
     return app, socketio
 
@@ -57,6 +78,9 @@ def create_app_only():
         }
     )
 
+    # Reuse one pooled SQLite connection per request
+    database.init_app(app)
+
     # Register blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix="/api")
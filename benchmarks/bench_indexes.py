@@ -0,0 +1,169 @@
+"""
+Benchmark: hot curriculum queries before and after the index migration
+
+Seeds a throwaway database shaped like the MASSIVE_* curricula, times the
+lookups the lesson pages make, applies migrate_database() and times them again.
+
+    python benchmarks/bench_indexes.py [--subjects 60] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+def seed(subjects, topics_per_subject, lessons_per_topic, problems_per_lesson):
+    """Bulk-load synthetic curriculum, progress and API cache rows."""
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    steps = json.dumps(["Step one", "Step two", "Step three"])
+
+    cursor.executemany(
+        "INSERT INTO subjects (name, display_order) VALUES (?, ?)",
+        [(f"Subject {s}", s) for s in range(subjects)],
+    )
+    subject_ids = [row[0] for row in cursor.execute("SELECT id FROM subjects")]
+
+    cursor.executemany(
+        "INSERT INTO topics (subject_id, name, display_order) VALUES (?, ?, ?)",
+        [
+            (sid, f"Topic {t}", t)
+            for sid in subject_ids
+            for t in range(topics_per_subject)
+        ],
+    )
+    topic_ids = [row[0] for row in cursor.execute("SELECT id FROM topics")]
+
+    cursor.executemany(
+        """INSERT INTO lessons (topic_id, title, description, steps, examples, display_order)
+           VALUES (?, ?, ?, ?, '[]', ?)""",
+        [
+            (tid, f"Lesson {lesson_no}", "Synthetic lesson", steps, lesson_no)
+            for tid in topic_ids
+            for lesson_no in range(lessons_per_topic)
+        ],
+    )
+    lesson_ids = [row[0] for row in cursor.execute("SELECT id FROM lessons")]
+
+    cursor.executemany(
+        """INSERT INTO practice_problems (lesson_id, question, answer, steps, hints, display_order)
+           VALUES (?, ?, ?, ?, '[]', ?)""",
+        [
+            (lid, f"Question {p}", str(p), steps, p)
+            for lid in lesson_ids
+            for p in range(problems_per_lesson)
+        ],
+    )
+    problems = list(cursor.execute("SELECT id, lesson_id FROM practice_problems"))
+
+    cursor.executemany(
+        """INSERT INTO student_progress
+           (lesson_id, practice_problem_id, attempts, score, mastery_level)
+           VALUES (?, ?, 3, 2, 'practicing')""",
+        [(lid, pid) for pid, lid in random.sample(problems, len(problems) // 2)],
+    )
+
+    expires = time.time() + 3600
+    cursor.executemany(
+        "INSERT INTO api_cache (api_source, query, response_data, expires_at) VALUES (?, ?, ?, ?)",
+        [
+            (source, f"query {q}", "{}", expires)
+            for source in ("wikipedia", "openlibrary", "datamuse", "loc")
+            for q in range(5000)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return subject_ids, topic_ids, lesson_ids, problems
+
+
+def time_queries(repeat, subject_ids, topic_ids, lesson_ids, problems):
+    """Return mean milliseconds per call for each hot query."""
+    cases = {
+        "get_topics_by_subject": lambda: database.get_topics_by_subject(
+            random.choice(subject_ids)
+        ),
+        "get_lessons_by_topic": lambda: database.get_lessons_by_topic(
+            random.choice(topic_ids)
+        ),
+        "get_practice_problems_by_lesson": lambda: database.get_practice_problems_by_lesson(
+            random.choice(lesson_ids)
+        ),
+        "get_practice_problems_by_topic": lambda: database.get_practice_problems_by_topic(
+            random.choice(topic_ids)
+        ),
+        "get_lesson_progress": lambda: database.get_lesson_progress(
+            random.choice(lesson_ids)
+        ),
+        "record_practice_attempt": lambda: database.record_practice_attempt(
+            *reversed(random.choice(problems)), True
+        ),
+        "get_cached_api_response": lambda: database.get_cached_api_response(
+            "loc", f"query {random.randrange(5000)}"
+        ),
+    }
+
+    timings = {}
+    for name, call in cases.items():
+        random.seed(name)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        timings[name] = (time.perf_counter() - start) * 1000 / repeat
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=60)
+    parser.add_argument("--topics", type=int, default=40)
+    parser.add_argument("--lessons", type=int, default=8)
+    parser.add_argument("--problems", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = os.path.join(tmp, "bench.db")
+
+        # Build the legacy schema without the migration so we get a baseline
+        migrate = database.migrate_database
+        database.migrate_database = lambda analyze=True: []
+        try:
+            database.init_database()
+        finally:
+            database.migrate_database = migrate
+
+        random.seed(42)
+        ids = seed(args.subjects, args.topics, args.lessons, args.problems)
+        print(
+            f"Seeded {len(ids[0])} subjects, {len(ids[1])} topics, "
+            f"{len(ids[2])} lessons, {len(ids[3])} problems\n"
+        )
+
+        before = time_queries(args.repeat, *ids)
+        start = time.perf_counter()
+        database.migrate_database(analyze=True)
+        migrate_ms = (time.perf_counter() - start) * 1000
+        after = time_queries(args.repeat, *ids)
+
+        print(f"{'query':<34}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            print(
+                f"{name:<34}{before[name]:>12.3f}{after[name]:>12.3f}{speedup:>9.1f}x"
+            )
+        print(f"\nMigration + ANALYZE took {migrate_ms:.0f} ms")
+
+        database.close_pools()
+
+
+if __name__ == "__main__":
+    main()
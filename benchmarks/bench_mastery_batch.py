@@ -0,0 +1,80 @@
+"""
+Benchmark: recording 500 skill results one at a time vs in one batch
+
+Compares a loop of MasteryEngine.record_practice (a query and a commit per
+result) with MasteryEngine.record_practice_batch (one query, one commit),
+on a file-backed SQLite database so commits pay their real fsync cost.
+
+    python benchmarks/bench_mastery_batch.py [--results 500] [--skills 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from models.database import db  # noqa: E402
+from services.mastery.engine import MasteryEngine  # noqa: E402
+
+
+def make_results(count, children, skills, seed):
+    rng = random.Random(seed)
+    return [
+        (
+            rng.randint(1, children),
+            rng.randint(1, skills),
+            rng.random() < 0.7,
+            rng.randint(0, 100),
+        )
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--results", type=int, default=500)
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--skills", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/bench.db"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            single, batch = [], []
+            for run in range(args.repeat):
+                results = make_results(args.results, args.children, args.skills, run)
+
+                start = time.perf_counter()
+                for child_id, skill_id, success, score in results:
+                    MasteryEngine.record_practice(child_id, skill_id, success, score)
+                single.append((time.perf_counter() - start) * 1000)
+
+                # Same results for a disjoint set of children
+                offset = [(c + 1000, s, ok, score) for c, s, ok, score in results]
+                start = time.perf_counter()
+                MasteryEngine.record_practice_batch(offset)
+                batch.append((time.perf_counter() - start) * 1000)
+
+    single, batch = statistics.median(single), statistics.median(batch)
+    print(
+        f"{args.results} results over {args.children} children x "
+        f"{args.skills} skills (median of {args.repeat})"
+    )
+    print(f"{'record_practice loop':<24}{single:>10.1f}ms")
+    print(f"{'record_practice_batch':<24}{batch:>10.1f}ms{single / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: row-at-a-time curriculum seeding vs bulk_seeding()
+
+Runs the same synthetic seed function twice against fresh databases, once
+through the plain add_* functions (one commit per row) and once inside
+bulk_seeding() (executemany, one transaction per subject).
+
+    python benchmarks/bench_seeding.py [--subjects 10] [--dir /path/on/real/disk]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+def seed_synthetic(subjects, topics, lessons, problems):
+    """Shaped like the MASSIVE_* seeders: nested add_* calls using returned ids."""
+    for s in range(subjects):
+        subject_id = database.add_subject(f"Subject {s}", "Synthetic", "📚", s)
+        for t in range(topics):
+            topic_id = database.add_topic(subject_id, f"Topic {t}", "", t)
+            for lesson_no in range(lessons):
+                lesson_id = database.add_lesson(
+                    topic_id,
+                    f"Lesson {lesson_no}",
+                    "Synthetic lesson",
+                    ["Step one", "Step two"],
+                    [{"title": "Example", "content": "1 + 1 = 2"}],
+                    "builtin",
+                    None,
+                    lesson_no,
+                )
+                for p in range(problems):
+                    database.add_practice_problem(
+                        lesson_id,
+                        f"Question {p}",
+                        str(p),
+                        ["Think"],
+                        ["Hint"],
+                        "easy",
+                        p,
+                    )
+
+
+def run(label, directory, bulk, args):
+    path = os.path.join(directory, f"{label}.db")
+    os.environ["DATABASE_URL"] = path
+    database.init_database()
+
+    start = time.perf_counter()
+    if bulk:
+        with database.bulk_seeding():
+            seed_synthetic(args.subjects, args.topics, args.lessons, args.problems)
+    else:
+        seed_synthetic(args.subjects, args.topics, args.lessons, args.problems)
+    elapsed = time.perf_counter() - start
+
+    database.close_pools()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=10)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--lessons", type=int, default=6)
+    parser.add_argument("--problems", type=int, default=5)
+    parser.add_argument(
+        "--dir", default=None, help="Directory for the databases (use a real disk)"
+    )
+    args = parser.parse_args()
+
+    rows = args.subjects * (1 + args.topics * (1 + args.lessons * (1 + args.problems)))
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        row_at_a_time = run("row_at_a_time", tmp, bulk=False, args=args)
+        bulk = run("bulk", tmp, bulk=True, args=args)
+
+    print(f"Rows inserted per run: {rows}")
+    print(
+        f"{'row-at-a-time':<16}{row_at_a_time:>10.2f}s{rows / row_at_a_time:>12.0f} rows/s"
+    )
+    print(f"{'bulk_seeding':<16}{bulk:>10.2f}s{rows / bulk:>12.0f} rows/s")
+    print(f"Speedup: {row_at_a_time / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: StateManager lobby reads with 10k rooms and sessions
+
+Compares the old layout (one string key per value, here under legacy:*,
+read with KEYS + one GET per key, scanning every session to find a user's)
+with the hash-per-prefix layout and per-user session index now used by
+StateManager.
+
+    python benchmarks/bench_state_manager.py [--rooms 10000] [--redis-url redis://...]
+
+Uses fakeredis unless --redis-url is given.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.state_manager import (  # noqa: E402
+    GameRoomManager,
+    StateManager,
+    UserSessionManager,
+)
+
+
+def legacy_get_all(client, prefix):
+    """StateManager.get_all before the hash layout"""
+    result = {}
+    for key in client.keys(f"legacy:{prefix}:*"):
+        data = client.get(key)
+        if data:
+            result[key.decode("utf-8").split(":")[-1]] = json.loads(data)
+    return result
+
+
+def legacy_user_sessions(client, user_id):
+    return [
+        s
+        for s in legacy_get_all(client, "user_sessions").values()
+        if s["user_id"] == user_id
+    ]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    if args.redis_url:
+        import redis
+
+        client = redis.from_url(args.redis_url)
+        client.flushdb()
+    else:
+        import fakeredis
+
+        client = fakeredis.FakeRedis()
+
+    state = StateManager(redis_client=client)
+    rooms = GameRoomManager(state)
+    sessions = UserSessionManager(state)
+
+    pipe = client.pipeline(transaction=False)
+    for i in range(args.rooms):
+        room_id = rooms.create_room(f"Room {i}", "math_race")
+        room = json.dumps(rooms.get_room(room_id))
+        pipe.set(f"legacy:game_rooms:{room_id}", room, ex=3600)
+    for i in range(args.sessions):
+        user_id = f"user{i % args.users}"
+        session_id = sessions.create_session(user_id, {"page": i})
+        session = json.dumps(sessions.get_session(session_id))
+        pipe.set(f"legacy:user_sessions:{session_id}", session, ex=86400)
+    pipe.execute()
+
+    rows = [
+        (
+            "get_all_rooms",
+            timed(lambda: legacy_get_all(client, "game_rooms"), args.repeat),
+            timed(rooms.get_all_rooms, args.repeat),
+        ),
+        (
+            "get_user_sessions",
+            timed(lambda: legacy_user_sessions(client, "user7"), args.repeat),
+            timed(lambda: sessions.get_user_sessions("user7"), args.repeat),
+        ),
+    ]
+
+    print(f"{args.rooms} rooms, {args.sessions} sessions over {args.users} users")
+    print(f"{'':<20}{'KEYS+GET':>12}{'hash/index':>12}{'speedup':>10}")
+    for name, legacy, current in rows:
+        print(f"{name:<20}{legacy:>10.1f}ms{current:>10.1f}ms{legacy / current:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: serial vs pooled rendering of a 5-step lesson's visuals
+
+Draws every figure of a math lesson (header, three fraction diagrams and
+five step cards) into an empty figure cache, first in-process one after
+another and then on a warmed-up RenderPool, and finally times a fully
+cached lesson for reference.
+
+    python benchmarks/bench_visual_pool.py [--workers 4] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visual_content_generator import VisualContentGenerator  # noqa: E402
+
+LESSON = {
+    "title": "Fractions of a Pizza",
+    "subject_name": "Mathematics",
+    "steps": [f"Step {n}: share the pizza fairly" for n in range(1, 6)],
+}
+
+
+def cold_render(workers, repeat):
+    """Median ms to render the lesson into a fresh cache directory."""
+    times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as folder:
+            generator = VisualContentGenerator(folder, "/static", workers=workers)
+            if generator.pool is not None:
+                generator.pool.warm_up()  # Process start-up is not the point here
+
+            start = time.perf_counter()
+            visuals = generator.generate_visual_for_lesson(LESSON, timeout=120)
+            times.append((time.perf_counter() - start) * 1000)
+            assert len(visuals["step_illustrations"]) == 5
+            if generator.pool is not None:
+                generator.pool.shutdown()
+    return statistics.median(times), generator.stats["renders"]
+
+
+def warm_render(repeat):
+    with tempfile.TemporaryDirectory() as folder:
+        generator = VisualContentGenerator(folder, "/static")
+        generator.generate_visual_for_lesson(LESSON)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            generator.generate_visual_for_lesson(LESSON)
+        return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    serial, figures = cold_render(0, args.repeat)
+    pooled, _ = cold_render(args.workers, args.repeat)
+
+    print(f"{figures} figures per lesson, {args.workers} pool workers")
+    print(f"{'serial':<20}{serial:>10.1f}ms")
+    print(f"{'pooled':<20}{pooled:>10.1f}ms{serial / pooled:>9.1f}x")
+    print(f"{'cached':<20}{warm_render(args.repeat * 10):>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
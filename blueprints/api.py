@@ -10,6 +10,7 @@ from database import (
     get_lessons_by_topic,
     get_lesson_by_id,
     get_practice_problems_by_topic,
+    get_pool_stats,
 )
 from worksheet_generator_api import generate_worksheet, generate_worksheet_pack
 from visual_content_generator import generate_visual_content
@@ -96,6 +97,12 @@ def api_generate_worksheet_pack(grade, subject):
         return jsonify({"error": str(e)}), 500
 
 
+@api_bp.route("/db/pool-stats")
+def api_db_pool_stats():
+    """Get SQLite connection pool statistics."""
+    return jsonify({"pools": get_pool_stats()})
+
+
 @api_bp.route("/user/stats")
 def api_user_stats():
     """Get user statistics."""
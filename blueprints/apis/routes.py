@@ -1,9 +1,10 @@
 """
 APIs Blueprint - Single Results Template for All Education APIs
 """
-from flask import Blueprint, render_template, request, jsonify
+import json
+from flask import Blueprint, Response, render_template, request, jsonify, stream_with_context, url_for
 from models.database import db, Resource
-from services.apis.adapter_factory import get_adapter, list_adapters
+from services.apis.adapter_factory import get_adapter, iter_search_all, list_adapters
 
 apis_bp = Blueprint('apis', __name__, url_prefix='/apis')
 
@@ -25,6 +26,7 @@ def search():
     provider = request.args.get('provider')
     
     results = []
+    stream_url = None
     
     if provider:
         # Search specific provider
@@ -37,19 +39,42 @@ def search():
                 media_type=media_type
             )
     else:
-        # Search all providers
-        for adapter_name in list_adapters():
-            adapter = get_adapter(adapter_name)
-            if adapter:
-                adapter_results = adapter.search(topic=topic, subject=subject, grade_band=grade_band, media_type=media_type, limit=5)
-                results.extend(adapter_results)
+        # The page streams every provider's results in as each one answers
+        stream_url = url_for('apis.search_stream', **{'limit': 5, **request.args.to_dict()})
     
     return render_template('pages/apis/results.html',
                          query=topic,
                          results=results,
+                         stream_url=stream_url,
                          filters={'subject': subject, 'grade_band': grade_band, 'media_type': media_type})
 
 
+@apis_bp.route('/search/stream')
+def search_stream():
+    """Stream each provider's results as NDJSON as soon as it answers,
+    with the rendered result cards for the results page"""
+    topic = request.args.get('topic', '')
+    subject = request.args.get('subject')
+    grade_band = request.args.get('grade_band')
+    media_type = request.args.get('media_type')
+    limit = request.args.get('limit', 5, type=int)
+    
+    def generate():
+        for name, result in iter_search_all(topic, subject, grade_band, media_type, limit):
+            results = result.value or []
+            yield json.dumps({
+                'provider': name,
+                'status': result.status,
+                'elapsed_ms': result.elapsed_ms,
+                'results': results,
+                'html': ''.join(render_template('partials/_api_result.html', result=r)
+                                for r in results),
+            }) + '\n'
+        yield json.dumps({'done': True}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @apis_bp.route('/assign', methods=['POST'])
 def assign_resource():
     """Assign a resource to a lesson item"""
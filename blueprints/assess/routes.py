@@ -6,6 +6,7 @@ from flask_login import current_user
 from datetime import datetime
 from models.database import db, Assessment, AssessmentAttempt, ChildProfile
 from services.auth.helpers import student_required, parent_required
+from services.mastery.engine import MasteryEngine
 
 assess_bp = Blueprint('assess', __name__, url_prefix='/assess')
 
@@ -43,7 +44,9 @@ def take_assessment(assessment_id):
         score = auto_grade_assessment(assessment, attempt)
         attempt.score = score
         
+        # Feed per-skill results to mastery; commits the attempt with them
         db.session.add(attempt)
+        MasteryEngine.record_practice_batch(skill_results(assessment, attempt))
         db.session.commit()
         
         return jsonify({'success': True, 'attempt_id': attempt.id, 'score': score})
@@ -51,18 +54,36 @@ def take_assessment(assessment_id):
     return render_template('pages/assess/take.html', assessment=assessment)
 
 
+AUTO_GRADED_TYPES = ['multiple_choice', 'true_false', 'short_answer']
+
+
+def _is_correct(item, responses):
+    student_answer = responses.get(str(item['id']))
+    correct_answer = item.get('correct_answer')
+    return bool(student_answer) and str(student_answer).strip().lower() == str(correct_answer).strip().lower()
+
+
 def auto_grade_assessment(assessment, attempt):
     """Auto-grade objective items"""
     correct = 0
     total = 0
+    responses = attempt.responses
     
     for item in assessment.items:
-        if item.get('type') in ['multiple_choice', 'true_false', 'short_answer']:
+        if item.get('type') in AUTO_GRADED_TYPES:
             total += 1
-            student_answer = attempt.responses.get(str(item['id']))
-            correct_answer = item.get('correct_answer')
-            
-            if student_answer and str(student_answer).strip().lower() == str(correct_answer).strip().lower():
+            if _is_correct(item, responses):
                 correct += 1
     
     return (correct / total * 100) if total > 0 else None
+
+
+def skill_results(assessment, attempt):
+    """(child_id, skill_id, success, score) for each auto-graded item tagged with a skill"""
+    responses = attempt.responses
+    results = []
+    for item in assessment.items:
+        if item.get('type') in AUTO_GRADED_TYPES and item.get('skill_id'):
+            success = _is_correct(item, responses)
+            results.append((attempt.child_id, item['skill_id'], success, 100.0 if success else 0.0))
+    return results
@@ -3,16 +3,34 @@ Games blueprint for Ultimate Tutor
 Handles multiplayer games and game state
 """
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, current_app, jsonify, render_template, request
 from flask_socketio import emit, join_room, leave_room
-import uuid
-from datetime import datetime
+
+from services.state_manager import ROOM_TTL, game_room_manager
 
 games_bp = Blueprint("games", __name__)
 
-# In-memory game state (TODO: Replace with Redis)
-game_rooms = {}
-user_sessions = {}
+# Rooms live in the shared state store (Redis when available), so every
+# worker sees the same rooms; SocketIO broadcasts fan out across workers
+# through the message queue configured in app_factory.
+
+
+def _room_summary(room):
+    return {
+        "id": room["id"],
+        "name": room.get("name", "Game Room"),
+        "players": len(room.get("players", [])),
+        "max_players": room.get("max_players", 4),
+        "game_type": room.get("game_type", "math"),
+        "status": room.get("status", "waiting"),
+    }
+
+
+def _broadcast(event, data, room_id):
+    """Emit to a room's sockets on every worker (no-op without SocketIO)."""
+    socketio = current_app.extensions.get("socketio")
+    if socketio is not None:
+        socketio.emit(event, data, to=room_id)
 
 
 @games_bp.route("/games")
@@ -36,43 +54,26 @@ def achievements_page():
 @games_bp.route("/api/games/rooms")
 def api_game_rooms():
     """Get active game rooms."""
-    rooms = []
-    for room_id, room_data in game_rooms.items():
-        rooms.append(
-            {
-                "id": room_id,
-                "name": room_data.get("name", "Game Room"),
-                "players": len(room_data.get("players", [])),
-                "max_players": room_data.get("max_players", 4),
-                "game_type": room_data.get("game_type", "math"),
-                "status": room_data.get("status", "waiting"),
-            }
-        )
-    return jsonify(rooms)
+    return jsonify([_room_summary(room) for room in game_room_manager.get_all_rooms()])
 
 
 @games_bp.route("/api/games/create-room", methods=["POST"])
 def api_create_room():
     """Create a new game room."""
     try:
-        data = request.get_json()
-        room_name = data.get("name", "New Game Room")
-        game_type = data.get("game_type", "math")
-        max_players = data.get("max_players", 4)
-
-        room_id = str(uuid.uuid4())[:8]
-        game_rooms[room_id] = {
-            "id": room_id,
-            "name": room_name,
-            "game_type": game_type,
-            "max_players": max_players,
-            "players": [],
-            "status": "waiting",
-            "created_at": datetime.now().isoformat(),
-        }
+        data = request.get_json(silent=True) or {}
+        room_id = game_room_manager.create_room(
+            data.get("name", "New Game Room"),
+            data.get("game_type", "math"),
+            int(data.get("max_players", 4)),
+        )
 
         return jsonify(
-            {"success": True, "room_id": room_id, "room": game_rooms[room_id]}
+            {
+                "success": True,
+                "room_id": room_id,
+                "room": game_room_manager.get_room(room_id),
+            }
         )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -82,24 +83,22 @@ def api_create_room():
 def api_join_room(room_id):
     """Join a game room."""
     try:
-        if room_id not in game_rooms:
+        room = game_room_manager.get_room(room_id)
+        if not room:
             return jsonify({"error": "Room not found"}), 404
 
-        room = game_rooms[room_id]
-        if len(room["players"]) >= room["max_players"]:
+        data = request.get_json(silent=True) or {}
+        name = data.get("name") or f'Player {len(room["players"]) + 1}'
+        player_id = game_room_manager.join_room(room_id, name)
+        if player_id is None:
             return jsonify({"error": "Room is full"}), 400
 
-        # Add player to room
-        player_id = str(uuid.uuid4())[:8]
-        player = {
-            "id": player_id,
-            "name": f'Player {len(room["players"]) + 1}',
-            "score": 0,
-            "joined_at": datetime.now().isoformat(),
-        }
-
-        room["players"].append(player)
-
+        room = game_room_manager.get_room(room_id)
+        _broadcast(
+            "player_joined",
+            {"room_id": room_id, "player_id": player_id, "user_id": name},
+            room_id,
+        )
         return jsonify({"success": True, "player_id": player_id, "room": room})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -109,19 +108,13 @@ def api_join_room(room_id):
 def api_leave_room(room_id):
     """Leave a game room."""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         player_id = data.get("player_id")
 
-        if room_id not in game_rooms:
+        if not game_room_manager.leave_room(room_id, player_id):
             return jsonify({"error": "Room not found"}), 404
 
-        room = game_rooms[room_id]
-        room["players"] = [p for p in room["players"] if p["id"] != player_id]
-
-        # Delete room if empty
-        if not room["players"]:
-            del game_rooms[room_id]
-
+        _broadcast("player_left", {"room_id": room_id, "player_id": player_id}, room_id)
         return jsonify({"success": True})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -131,21 +124,81 @@ def api_leave_room(room_id):
 def api_start_game(room_id):
     """Start a game in a room."""
     try:
-        if room_id not in game_rooms:
+        if not game_room_manager.get_room(room_id):
             return jsonify({"error": "Room not found"}), 404
 
-        room = game_rooms[room_id]
-        if len(room["players"]) < 2:
+        if not game_room_manager.start_game(room_id):
             return jsonify({"error": "Need at least 2 players"}), 400
 
-        room["status"] = "playing"
-        room["started_at"] = datetime.now().isoformat()
-
+        room = game_room_manager.get_room(room_id)
+        _broadcast("game_started", {"room_id": room_id, "room": room}, room_id)
         return jsonify({"success": True, "room": room})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@games_bp.route("/api/games/leaderboard/<room_id>")
+def api_room_leaderboard(room_id):
+    """Players in a room ranked by score."""
+    if not game_room_manager.get_room(room_id):
+        return jsonify({"error": "Room not found"}), 404
+    return jsonify(game_room_manager.get_leaderboard(room_id))
+
+
+def register_socket_events(socketio):
+    """Attach the multiplayer SocketIO events to ``socketio``.
+
+    Which player a socket is bound to is kept in the shared store as well,
+    so a disconnect handled by any worker can clean up the room.
+    """
+    state = game_room_manager.state
+
+    @socketio.on("join_game")
+    def on_join_game(data):
+        room_id, player_id = data.get("room_id"), data.get("player_id")
+        room = game_room_manager.get_room(room_id)
+        player = (
+            next((p for p in room["players"] if p["id"] == player_id), None)
+            if room
+            else None
+        )
+        if player is None:
+            emit("game_error", {"error": "Not a player in this room"})
+            return
+
+        join_room(room_id)
+        state.set(
+            "game_sockets",
+            request.sid,
+            {"room_id": room_id, "player_id": player_id},
+            ttl=ROOM_TTL,
+        )
+        emit(
+            "player_joined",
+            {"room_id": room_id, "player_id": player_id, "user_id": player["name"]},
+            to=room_id,
+        )
+
+    @socketio.on("leave_game")
+    def on_leave_game(data=None):
+        _leave_bound_room()
+
+    @socketio.on("disconnect")
+    def on_disconnect(*args):
+        _leave_bound_room()
+
+    def _leave_bound_room():
+        binding = state.get("game_sockets", request.sid)
+        if not binding:
+            return
+        state.delete("game_sockets", request.sid)
+
+        room_id, player_id = binding["room_id"], binding["player_id"]
+        game_room_manager.leave_room(room_id, player_id)
+        leave_room(room_id)
+        emit("player_left", {"room_id": room_id, "player_id": player_id}, to=room_id)
+
+
 @games_bp.route("/api/achievements")
 def api_achievements():
     """Get user achievements."""
@@ -3,7 +3,17 @@ Parent Dashboard Blueprint
 Password-protected mission control for parents
 """
 
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
+import os
+from flask import (
+    Blueprint,
+    render_template,
+    request,
+    jsonify,
+    session,
+    redirect,
+    url_for,
+    send_from_directory,
+)
 from functools import wraps
 from parent_dashboard import parent_dashboard
 from database_parent_features import (
@@ -240,7 +250,29 @@ def print_certificate(student_id, achievement_id):
         student_name=student["name"], achievement_id=achievement_id
     )
 
-    return jsonify({"success": True, "pdf_url": f"/certificates/{pdf_path}"})
+    return jsonify(
+        {
+            "success": True,
+            "pdf_url": url_for(
+                "parent.certificate_file", filename=os.path.basename(pdf_path)
+            ),
+        }
+    )
+
+
+@parent_bp.route("/certificates/<path:filename>")
+@parent_required
+def certificate_file(filename):
+    """Serve a generated certificate (ETag/If-None-Match aware)"""
+    from certificate_generator import certificate_generator
+
+    return send_from_directory(
+        os.path.abspath(certificate_generator.output_dir),
+        filename,
+        mimetype="application/pdf",
+        conditional=True,
+        etag=True,
+    )
 
 
 @parent_bp.route("/parent/add-student", methods=["GET"])
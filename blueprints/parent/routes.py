@@ -1,13 +1,18 @@
 """
 Parent Blueprint - Children Management, Weekly Planner, Review Queue, Reports, Settings
 """
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, send_file
+from io import BytesIO
+from flask import Blueprint, abort, current_app, render_template, request, jsonify, redirect, url_for, flash, send_file
 from flask_login import current_user, login_required
 from datetime import date, timedelta, datetime
-from models.database import db, ChildProfile, LessonPlan, LessonItem, Assignment, Submission, AttendanceLog
+from models.database import db, ChildProfile, LessonPlan, LessonItem, Submission, AttendanceLog
 from services.auth.helpers import parent_required
+from services.jobs import FINAL_STATUSES, job_queue
+from services.lessons.dashboard import get_children_stats
 from services.lessons.planner import WeeklyPlanner
-from services.rendering.pdf import generate_weekly_report, generate_transcript
+from services.mastery.engine import MasteryEngine
+from services.rendering.cache import pdf_cache
+from services.rendering.reports import weekly_report_job, transcript_job
 
 parent_bp = Blueprint('parent', __name__, url_prefix='/parent')
 
@@ -16,33 +21,12 @@ parent_bp = Blueprint('parent', __name__, url_prefix='/parent')
 @parent_required
 def dashboard():
     """Parent dashboard"""
-    children = current_user.children.all()
+    # Counts for every child in one query
+    stats = get_children_stats(current_user.id)
+    skills_due = MasteryEngine.get_due_today([stat['child'].id for stat in stats])
     
-    # Get stats for each child
-    stats = []
-    for child in children:
-        today_assignments = Assignment.query.filter_by(
-            child_id=child.id,
-            date=date.today()
-        ).count()
-        
-        completed_today = Assignment.query.filter_by(
-            child_id=child.id,
-            date=date.today(),
-            status='completed'
-        ).count()
-        
-        pending_reviews = Submission.query.filter_by(
-            child_id=child.id,
-            score=None
-        ).count()
-        
-        stats.append({
-            'child': child,
-            'today_assignments': today_assignments,
-            'completed_today': completed_today,
-            'pending_reviews': pending_reviews
-        })
+    for stat in stats:
+        stat['skills_due'] = skills_due[stat['child'].id]
     
     return render_template('pages/parent/dashboard.html', children_stats=stats)
 
@@ -147,6 +131,52 @@ def generate_week(child_id):
     })
 
 
+@parent_bp.route('/planner/household/generate', methods=['POST'])
+@parent_required
+def generate_household_week():
+    """Generate a week of lessons for every child (or the given children)"""
+    data = request.json or {}
+    
+    query = ChildProfile.query.filter_by(user_id=current_user.id)
+    if data.get('child_ids'):
+        query = query.filter(ChildProfile.id.in_(data['child_ids']))
+    children = query.order_by(ChildProfile.id).all()
+    
+    week_start = datetime.strptime(data.get('week_start'), '%Y-%m-%d').date()
+    subjects = data.get('subjects', ['Math', 'ELA', 'Science', 'Social Studies'])
+    minutes_per_subject = data.get('minutes_per_subject', 45)
+    
+    lesson_plans, timings = WeeklyPlanner.plan_household(
+        children,
+        week_start,
+        subjects,
+        minutes_per_subject
+    )
+    current_app.logger.info(
+        'Planned week of %s for %d children: %s',
+        week_start, len(children), timings
+    )
+    
+    items = dict(db.session.query(
+        LessonItem.lesson_plan_id, db.func.count(LessonItem.id)
+    ).filter(
+        LessonItem.lesson_plan_id.in_([p.id for p in lesson_plans])
+    ).group_by(LessonItem.lesson_plan_id).all())
+    
+    return jsonify({
+        'success': True,
+        'plans': [
+            {
+                'child_id': p.child_id,
+                'lesson_plan_id': p.id,
+                'items_created': items.get(p.id, 0)
+            }
+            for p in lesson_plans
+        ],
+        'timings': timings
+    })
+
+
 @parent_bp.route('/review')
 @parent_required
 def review_queue():
@@ -188,56 +218,102 @@ def review_submission(submission_id):
     return render_template('pages/parent/review_submission.html', submission=submission)
 
 
-@parent_bp.route('/reports/weekly/<int:child_id>')
+@parent_bp.route('/reports/weekly/<int:child_id>', methods=['POST'])
 @parent_required
 def weekly_report(child_id):
-    """Generate weekly PDF report"""
+    """Queue this week's PDF report; poll the status URL for the download"""
     child = ChildProfile.query.filter_by(
         id=child_id,
         user_id=current_user.id
     ).first_or_404()
     
-    # Get this week's data
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=6)
-    
-    assignments = Assignment.query.filter(
-        Assignment.child_id == child_id,
-        Assignment.date >= week_start,
-        Assignment.date <= week_end
-    ).all()
     
-    # Generate PDF
-    pdf_buffer = generate_weekly_report(child, assignments, week_start, week_end)
-    
-    return send_file(
-        pdf_buffer,
-        as_attachment=True,
-        download_name=f'weekly_report_{child.name}_{week_start}.pdf',
-        mimetype='application/pdf'
-    )
+    job_id = _start_report_job('weekly_report', weekly_report_job, child.id, week_start)
+    return _report_job_response(job_id), 202
 
 
-@parent_bp.route('/transcript/<int:child_id>')
+@parent_bp.route('/transcript/<int:child_id>', methods=['POST'])
 @parent_required
 def transcript(child_id):
-    """Generate transcript"""
+    """Queue a transcript; poll the status URL for the download"""
     child = ChildProfile.query.filter_by(
         id=child_id,
         user_id=current_user.id
     ).first_or_404()
     
-    # Get all completed work
-    all_submissions = Submission.query.filter_by(child_id=child_id).all()
+    job_id = _start_report_job('transcript', transcript_job, child.id)
+    return _report_job_response(job_id), 202
+
+
+def _start_report_job(kind, func, *args):
+    """Queue a report, or reuse the one still queued or running for the same args"""
+    key = ':'.join(str(arg) for arg in (kind, *args))
+    job_id = job_queue.state.get('report_jobs', key)
+    job = job_queue.get(job_id) if job_id else None
+    if job is not None and job['status'] not in FINAL_STATUSES:
+        return job_id
+    
+    job_id = job_queue.enqueue(func, *args, kind=kind, owner_id=current_user.id)
+    job_queue.state.set('report_jobs', key, job_id, ttl=job_queue.config.JOB_TTL)
+    return job_id
+
+
+def _owned_report_job(job_id):
+    """The job record if it belongs to the current parent, else 404"""
+    job = job_queue.get(job_id)
+    if job is None or job.get('owner_id') != current_user.id:
+        abort(404)
+    return job
+
+
+def _report_job_response(job_id):
+    job = job_queue.get(job_id) or {'status': 'queued'}
+    body = {
+        'success': job['status'] != 'failed',
+        'job_id': job_id,
+        'status': job['status'],
+        'status_url': url_for('parent.report_status', job_id=job_id)
+    }
+    if job.get('elapsed_ms') is not None:
+        body['elapsed_ms'] = job['elapsed_ms']
+    if job['status'] == 'finished':
+        body['download_url'] = url_for('parent.download_report', job_id=job_id)
+    elif job['status'] == 'failed':
+        body['error'] = job.get('error')
+    return jsonify(body)
+
+
+@parent_bp.route('/reports/jobs/<job_id>')
+@parent_required
+def report_status(job_id):
+    """Status of a queued report"""
+    _owned_report_job(job_id)
+    return _report_job_response(job_id)
+
+
+@parent_bp.route('/reports/jobs/<job_id>/download')
+@parent_required
+def download_report(job_id):
+    """Download a finished report; If-None-Match revalidates against its key"""
+    job = _owned_report_job(job_id)
+    if job['status'] != 'finished':
+        return _report_job_response(job_id), 409
     
-    pdf_buffer = generate_transcript(child, all_submissions)
+    result = job['result']
+    pdf = pdf_cache.get(result['key'])
+    if pdf is None:
+        # Evicted from the render cache; the parent can queue it again
+        return jsonify({'success': False, 'error': 'Report expired, please regenerate'}), 410
     
     return send_file(
-        pdf_buffer,
+        BytesIO(pdf),
         as_attachment=True,
-        download_name=f'transcript_{child.name}.pdf',
-        mimetype='application/pdf'
+        download_name=result['filename'],
+        mimetype='application/pdf',
+        etag=result['key'],
+        conditional=True
     )
 
 
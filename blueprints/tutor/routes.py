@@ -5,11 +5,13 @@ Integrates existing tutor functionality into new platform
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from werkzeug.utils import secure_filename
 import os
+import uuid
 
 # Import existing tutor functions
 from file_processor import process_uploaded_file
 from lesson_generator import generate_lesson_from_text, generate_practice_problems
-from worksheet_ai_converter import convert_worksheet_to_lesson
+from services.jobs import job_queue
+from services.worksheet_ingest import ingest_worksheet_job, job_status
 from worksheet_generator_api import generate_worksheet
 
 tutor_bp = Blueprint('tutor', __name__, url_prefix='/tutor')
@@ -56,26 +58,41 @@ def ingest():
 
 @tutor_bp.route('/worksheet/convert', methods=['POST'])
 def convert_worksheet():
-    """Convert worksheet to interactive lesson"""
+    """Convert worksheet to interactive lesson (as a background job; poll status_url)"""
     if 'file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
     
     file = request.files['file']
     subject = request.form.get('subject', 'Math')
     
-    # Save temporarily
-    filename = secure_filename(file.filename)
+    # Save temporarily; the job removes it when done
+    filename = f'{uuid.uuid4().hex}_{secure_filename(file.filename)}'
     temp_path = os.path.join('temp', filename)
     file.save(temp_path)
     
     try:
-        result = convert_worksheet_to_lesson(temp_path, subject)
-        os.remove(temp_path)
-        return jsonify(result)
+        job_id = job_queue.enqueue(ingest_worksheet_job, temp_path, subject,
+                                   kind='worksheet_ingest')
     except Exception as e:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        os.remove(temp_path)
         return jsonify({'error': str(e)}), 500
+    return _conversion_response(job_id), 202
+
+
+@tutor_bp.route('/worksheet/jobs/<job_id>')
+def conversion_status(job_id):
+    """Stage, progress and result of a worksheet conversion"""
+    job = job_queue.get(job_id)
+    if job is None or job.get('kind') != 'worksheet_ingest':
+        return jsonify({'error': 'Job not found'}), 404
+    return _conversion_response(job_id)
+
+
+def _conversion_response(job_id):
+    job = job_queue.get(job_id) or {'status': 'queued'}
+    return jsonify(job_id=job_id,
+                   status_url=url_for('tutor.conversion_status', job_id=job_id),
+                   **job_status(job))
 
 
 @tutor_bp.route('/worksheet/generate', methods=['POST'])
@@ -3,9 +3,10 @@ Uploads blueprint
 Handles secure file uploads and worksheet processing
 """
 
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request, jsonify, url_for
+from services.jobs import job_queue
 from services.upload_service import UploadService
-from worksheet_ai_converter import convert_worksheet_to_lesson
+from services.worksheet_ingest import ingest_worksheet_job, job_status
 
 uploads_bp = Blueprint("uploads", __name__)
 
@@ -18,7 +19,7 @@ def upload_page():
 
 @uploads_bp.route("/api/upload/worksheet", methods=["POST"])
 def upload_worksheet():
-    """Secure worksheet upload endpoint."""
+    """Secure worksheet upload endpoint; conversion runs as a background job."""
     try:
         if "file" not in request.files:
             return jsonify({"error": "No file provided"}), 400
@@ -31,24 +32,19 @@ def upload_worksheet():
         upload_service = UploadService()
         file_info = upload_service.save_file(file)
 
-        # Process the worksheet
+        # Extract, analyze and persist off the request; poll the status URL
         try:
-            lesson_data = convert_worksheet_to_lesson(file_info["file_path"])
-
-            upload_service.delete_file(file_info["filename"])
-
-            return jsonify(
-                {
-                    "success": True,
-                    "message": "Worksheet uploaded and processed successfully!",
-                    "lesson_data": lesson_data,
-                }
+            job_id = job_queue.enqueue(
+                ingest_worksheet_job,
+                file_info["file_path"],
+                request.form.get("subject", "Math"),
+                kind="worksheet_ingest",
             )
-
         except Exception as e:
-            # Clean up uploaded file if processing fails
             upload_service.delete_file(file_info["filename"])
-            return jsonify({"error": f"Failed to process worksheet: {str(e)}"}), 500
+            return jsonify({"error": f"Failed to queue worksheet: {str(e)}"}), 500
+
+        return _ingest_response(job_id), 202
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -56,6 +52,24 @@ def upload_worksheet():
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
 
 
+def _ingest_response(job_id):
+    job = job_queue.get(job_id) or {"status": "queued"}
+    return jsonify(
+        job_id=job_id,
+        status_url=url_for("uploads.ingest_status", job_id=job_id),
+        **job_status(job),
+    )
+
+
+@uploads_bp.route("/api/upload/jobs/<job_id>")
+def ingest_status(job_id):
+    """Stage, progress and timings of a worksheet conversion job."""
+    job = job_queue.get(job_id)
+    if job is None or job.get("kind") != "worksheet_ingest":
+        return jsonify({"error": "Job not found"}), 404
+    return _ingest_response(job_id)
+
+
 @uploads_bp.route("/api/upload/status/<filename>")
 def upload_status(filename):
     """Get upload status."""
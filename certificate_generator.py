@@ -5,6 +5,7 @@ Creates beautiful printable achievement certificates
 
 import os
 from datetime import datetime
+from io import BytesIO
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
@@ -12,6 +13,8 @@ from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from services.rendering.cache import pdf_cache
+
 
 class CertificateGenerator:
     """Generate beautiful PDF certificates for achievements"""
@@ -21,6 +24,31 @@ class CertificateGenerator:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
+    def _render(self, filepath, draw, **fields) -> str:
+        """Draw a landscape certificate, reusing an identical earlier render"""
+
+        def render():
+            buffer = BytesIO()
+            c = canvas.Canvas(buffer, pagesize=landscape(letter))
+            width, height = landscape(letter)
+            draw(c, width, height, **fields)
+            c.save()
+            return buffer.getvalue()
+
+        pdf, _ = pdf_cache.get_or_render(
+            "certificate", {"layout": draw.__name__, **fields}, render
+        )
+        # Leave an identical file alone so its mtime (and so its ETag) holds
+        try:
+            with open(filepath, "rb") as f:
+                unchanged = f.read() == pdf
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            with open(filepath, "wb") as f:
+                f.write(pdf)
+        return filepath
+
     def generate_certificate(
         self, student_name: str, achievement_name: str, date: str = None
     ) -> str:
@@ -32,10 +60,16 @@ class CertificateGenerator:
         filename = f"{student_name.replace(' ', '_')}_{achievement_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
         filepath = os.path.join(self.output_dir, filename)
 
-        # Create PDF
-        c = canvas.Canvas(filepath, pagesize=landscape(letter))
-        width, height = landscape(letter)
+        return self._render(
+            filepath,
+            self._draw_certificate,
+            student_name=student_name,
+            achievement_name=achievement_name,
+            date=date,
+        )
 
+    def _draw_certificate(self, c, width, height, student_name, achievement_name, date):
+        """Layout for generate_certificate"""
         # Background
         c.setFillColor(colors.HexColor("#f0f3ff"))
         c.rect(0, 0, width, height, fill=True, stroke=False)
@@ -130,11 +164,6 @@ class CertificateGenerator:
         c.drawString(width / 2 - 100, 20, "🎓")
         c.drawString(width / 2 + 70, 20, "🏆")
 
-        # Save PDF
-        c.save()
-
-        return filepath
-
     def generate_mastery_certificate(
         self, student_name: str, subject: str, topics_mastered: int, date: str = None
     ) -> str:
@@ -145,9 +174,19 @@ class CertificateGenerator:
         filename = f"{student_name.replace(' ', '_')}_{subject}_Mastery_{datetime.now().strftime('%Y%m%d')}.pdf"
         filepath = os.path.join(self.output_dir, filename)
 
-        c = canvas.Canvas(filepath, pagesize=landscape(letter))
-        width, height = landscape(letter)
+        return self._render(
+            filepath,
+            self._draw_mastery_certificate,
+            student_name=student_name,
+            subject=subject,
+            topics_mastered=topics_mastered,
+            date=date,
+        )
 
+    def _draw_mastery_certificate(
+        self, c, width, height, student_name, subject, topics_mastered, date
+    ):
+        """Layout for generate_mastery_certificate"""
         # Gold gradient background
         c.setFillColor(colors.HexColor("#fff9e6"))
         c.rect(0, 0, width, height, fill=True, stroke=False)
@@ -202,9 +241,6 @@ class CertificateGenerator:
         c.setFont("Helvetica", 14)
         c.drawCentredString(width / 2, 40, "Parent/Guardian Signature")
 
-        c.save()
-        return filepath
-
     def generate_sister_quest_certificate(
         self,
         student1_name: str,
@@ -219,9 +255,19 @@ class CertificateGenerator:
         filename = f"Sister_Quest_{quest_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
         filepath = os.path.join(self.output_dir, filename)
 
-        c = canvas.Canvas(filepath, pagesize=landscape(letter))
-        width, height = landscape(letter)
+        return self._render(
+            filepath,
+            self._draw_sister_quest_certificate,
+            student1_name=student1_name,
+            student2_name=student2_name,
+            quest_name=quest_name,
+            date=date,
+        )
 
+    def _draw_sister_quest_certificate(
+        self, c, width, height, student1_name, student2_name, quest_name, date
+    ):
+        """Layout for generate_sister_quest_certificate"""
         # Background
         c.setFillColor(colors.HexColor("#ffe6f0"))
         c.rect(0, 0, width, height, fill=True, stroke=False)
@@ -269,9 +315,6 @@ class CertificateGenerator:
         c.setFont("Helvetica", 20)
         c.drawCentredString(width / 2, 100, f"Completed on: {date}")
 
-        c.save()
-        return filepath
-
 
 # Global instance
 certificate_generator = CertificateGenerator()
@@ -304,4 +347,3 @@ if __name__ == "__main__":
 
     print("\n✨ All certificates generated successfully!")
     print(f"📁 Check the '{gen.output_dir}' folder")
-
@@ -3,11 +3,24 @@ CLI management commands for Ultimate Tutor
 Handles database initialization and seeding
 """
 
-import click
 import os
+
+import click
 from flask.cli import with_appcontext
-from database import init_database
+
 from config import get_config
+from database import (
+    bulk_seeding,
+    init_database,
+    print_seed_progress,
+    remove_database_file,
+)
+
+
+def _echo_seed_counts(counts, label):
+    """Print per-table row counts from a bulk seed."""
+    for table, count in counts.items():
+        click.echo(f"  {label} {count} {table}")
 
 
 @click.group()
@@ -31,7 +44,7 @@ def init_db(force=False):
         return
 
     if force and os.path.exists(config.DATABASE_URL):
-        os.remove(config.DATABASE_URL)
+        remove_database_file(config.DATABASE_URL)
         click.echo(f"Removed existing database {config.DATABASE_URL}")
 
     click.echo("Initializing database...")
@@ -54,20 +67,45 @@ def seed_curriculum(force=False):
             return
 
     click.echo("Seeding curriculum...")
-    seed_curriculum()
-    click.echo("Curriculum seeded successfully!")
+    with bulk_seeding(progress=print_seed_progress) as seeder:
+        seed_curriculum()
+    click.echo(f"Curriculum seeded successfully! ({seeder.elapsed:.1f}s)")
 
 
 @cli.command()
-def seed_massive_curriculum():
+@click.option(
+    "--dry-run", is_flag=True, help="Only count the rows that would be inserted"
+)
+def seed_massive_curriculum(dry_run=False):
     """Seed the database with MASSIVE curriculum."""
     from LOAD_ULTIMATE_CURRICULUM import load_ultimate_curriculum
 
     click.echo("Loading MASSIVE curriculum...")
-    load_ultimate_curriculum()
+    seeder = load_ultimate_curriculum(dry_run=dry_run)
+    if dry_run:
+        _echo_seed_counts(seeder.counts, "Would insert")
+        return
     click.echo("MASSIVE curriculum loaded successfully!")
 
 
+@cli.command()
+@click.option("--analyze/--no-analyze", default=True, help="Run ANALYZE afterwards")
+def migrate_db(analyze=True):
+    """Apply pending schema migrations (indexes, constraints)."""
+    from database import SCHEMA_MIGRATIONS, get_schema_version, migrate_database
+
+    before = get_schema_version()
+    applied = migrate_database(analyze=analyze)
+
+    if not applied:
+        click.echo(f"Schema is up to date (version {before}).")
+    for version, description in applied:
+        click.echo(f"Applied migration {version}: {description}")
+    if analyze:
+        click.echo("Refreshed query planner statistics (ANALYZE).")
+    click.echo(f"Schema version: {get_schema_version()} / {SCHEMA_MIGRATIONS[-1][0]}")
+
+
 @cli.command()
 def check_db():
     """Check database status and show statistics."""
@@ -91,12 +129,88 @@ def check_db():
             click.echo(f"  {table_name}: {count} records")
 
         conn.close()
+
+        from database import get_pool_stats
+
+        for stats in get_pool_stats():
+            click.echo(
+                f"Pool {stats['path']}: {stats['open_connections']}/"
+                f"{stats['max_connections']} open, {stats['checkouts']} checkouts, "
+                f"{stats['waits']} waits (avg {stats['avg_wait_ms']}ms)"
+            )
         click.echo("Database is healthy!")
 
     except Exception as e:
         click.echo(f"Database error: {e}")
 
 
+@cli.command()
+@click.option("--sweep/--no-sweep", default=True, help="Delete expired entries")
+@click.option("--vacuum", is_flag=True, help="VACUUM the database afterwards")
+def api_cache(sweep=True, vacuum=False):
+    """Report API cache size and hit rate, sweep expired rows, vacuum."""
+    from database import get_api_cache_stats, sweep_api_cache, vacuum_database
+
+    if sweep:
+        click.echo(f"Removed {sweep_api_cache()} expired cache entries.")
+
+    stats = get_api_cache_stats()
+    click.echo(
+        f"API cache: {stats['entries']} entries ({stats['expired_entries']} expired), "
+        f"{stats['payload_bytes'] / 1024:.1f} KB of compressed payloads"
+    )
+    click.echo(
+        f"Hit rate: {stats['hit_rate']:.1%} "
+        f"({stats['hits']} hits, {stats['misses']} misses)"
+    )
+    for source, counts in stats["sources"].items():
+        click.echo(f"  {source}: {counts['hits']} hits, {counts['misses']} misses")
+
+    if vacuum:
+        before = stats["database_bytes"]
+        vacuum_database()
+        after = get_api_cache_stats()["database_bytes"]
+        click.echo(f"Vacuumed database: {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+
+
+@cli.command()
+@click.option("--workers", type=int, default=None, help="Processes (default: CPUs)")
+def prerender_visuals(workers=None):
+    """Render every lesson's visuals ahead of time into static/images/lessons."""
+    import time
+
+    from database import get_connection, get_lesson_by_id
+    from visual_content_generator import VisualContentGenerator
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM lessons ORDER BY id")
+    lesson_ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+
+    click.echo(f"Pre-rendering visuals for {len(lesson_ids)} lessons...")
+    start = time.perf_counter()
+    generator = VisualContentGenerator(workers=workers or os.cpu_count())
+    calls = []
+    for lesson_id in lesson_ids:
+        plan = generator.lesson_figure_calls(get_lesson_by_id(lesson_id))
+        calls.extend(call for section in plan.values() for call in section)
+    calls = list(dict.fromkeys(calls))  # Shared figures render once
+
+    try:
+        visuals = generator.render_figures(calls)
+    finally:
+        generator.pool.shutdown()
+    failed = visuals.count(None)
+
+    click.echo(
+        f"Rendered {generator.stats['renders']} figures, "
+        f"{generator.stats['hits']} already cached"
+        f"{f', {failed} failed' if failed else ''} "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+
 @cli.command()
 @click.option("--port", default=5001, help="Port to run on")
 @click.option("--host", default="0.0.0.0", help="Host to bind to")
@@ -158,13 +272,48 @@ def init_parent_features():
     click.echo("Parent Dashboard tables created successfully!")
 
 
+@cli.command()
+@click.option(
+    "--apply", "apply_changes", is_flag=True, help="Write the changes (default: report only)"
+)
+@click.option("--verbose", "-v", is_flag=True, help="List every new or changed row")
+def sync_curriculum(apply_changes=False, verbose=False):
+    """Incrementally sync curriculum definitions without reseeding."""
+    from curriculum_sync import sync_curriculum as run_sync
+
+    diff = run_sync(apply=apply_changes)
+
+    for table, counts in diff.summary().items():
+        click.echo(
+            f"{table}: +{counts['new']} new, ~{counts['changed']} changed, "
+            f"{counts['unchanged']} unchanged, {counts['removed']} no longer defined"
+        )
+        if verbose:
+            for key in diff.inserts[table]:
+                click.echo(f"  + {' / '.join(str(k) for k in key[::2])}")
+            for key in diff.updates[table]:
+                click.echo(f"  ~ {' / '.join(str(k) for k in key[::2])}")
+
+    click.echo(
+        f"Built definitions in {diff.build_seconds:.2f}s, "
+        f"diffed in {diff.diff_seconds * 1000:.0f}ms"
+    )
+    if not diff.has_changes:
+        click.echo("Curriculum is up to date.")
+    elif apply_changes:
+        click.echo(f"Applied changes in {diff.apply_seconds * 1000:.0f}ms")
+    else:
+        click.echo("Run with --apply to write these changes.")
+
+
 @cli.command()
 def seed_new_subjects():
     """Seed the 50+ new revolutionary subjects."""
     from NEW_SUBJECTS_CURRICULUM import seed_all_new_subjects
 
     click.echo("Seeding 50+ new subjects...")
-    seed_all_new_subjects()
+    with bulk_seeding(progress=print_seed_progress):
+        seed_all_new_subjects()
     click.echo("New subjects seeded successfully!")
 
 
@@ -177,9 +326,10 @@ def seed_new_subjects():
 )
 def create_student(name, grade, age, interests):
     """Create a new student profile."""
-    from database_parent_features import create_student_profile
     import random
 
+    from database_parent_features import create_student_profile
+
     student_id = f"student_{random.randint(1000, 9999)}"
     interest_list = [i.strip() for i in interests.split(",")]
 
@@ -218,12 +368,17 @@ def test_certificates():
 
 
 @cli.command()
-def load_everything():
+@click.option(
+    "--dry-run", is_flag=True, help="Only count the rows that would be inserted"
+)
+def load_everything(dry_run=False):
     """Load the complete platform - all subjects, lessons, and features."""
     from LOAD_EVERYTHING_ULTIMATE import load_complete_platform
     
     click.echo("Loading complete Ultimate Homeschool Platform...")
-    load_complete_platform()
+    counts = load_complete_platform(dry_run=dry_run)
+    if dry_run:
+        _echo_seed_counts(counts, "Would insert")
 
 
 @cli.command()
@@ -232,7 +387,8 @@ def add_comprehensive_lessons():
     from COMPLETE_NEW_SUBJECTS_LESSONS import add_all_comprehensive_lessons
     
     click.echo("Adding comprehensive lessons...")
-    add_all_comprehensive_lessons()
+    with bulk_seeding(progress=print_seed_progress):
+        add_all_comprehensive_lessons()
     click.echo("Comprehensive lessons added!")
 
 
@@ -242,7 +398,8 @@ def add_utah_content():
     from UTAH_LOCAL_CURRICULUM import seed_utah_curriculum
     
     click.echo("Adding Utah-specific curriculum...")
-    seed_utah_curriculum()
+    with bulk_seeding(progress=print_seed_progress):
+        seed_utah_curriculum()
     click.echo("Utah content added!")
 
 
@@ -252,7 +409,8 @@ def generate_practice_problems():
     from GENERATE_ALL_PRACTICE_PROBLEMS import generate_practice_for_all_lessons
     
     click.echo("Generating practice problems for all lessons...")
-    generate_practice_for_all_lessons()
+    with bulk_seeding():
+        generate_practice_for_all_lessons()
     click.echo("Practice problems generated!")
 
 
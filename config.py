@@ -22,6 +22,7 @@ class Config:
     # Redis & Background Tasks
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     RQ_REDIS_URL = REDIS_URL
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE', REDIS_URL)
     
     # Session
     SESSION_TYPE = 'filesystem'
@@ -45,6 +46,19 @@ class Config:
     UPLOAD_FOLDER = os.path.join('static', 'uploads')
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt', 'png', 'jpg', 'jpeg', 'gif', 'mp3', 'mp4', 'wav'}
     
+    # Background jobs (RQ when a worker is listening, else an in-process pool)
+    JOB_QUEUE_NAME = os.getenv('JOB_QUEUE_NAME', 'tutor')
+    JOB_LOCAL_WORKERS = int(os.getenv('JOB_LOCAL_WORKERS', 2))
+    JOB_TTL = 24 * 3600  # Seconds a finished job record is kept
+    
+    # Rendered PDFs, content-addressed and evicted least recently used
+    RENDER_CACHE_FOLDER = os.getenv('RENDER_CACHE_FOLDER', os.path.join('instance', 'render_cache'))
+    RENDER_CACHE_MAX_BYTES = int(os.getenv('RENDER_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    
+    # Lesson figures are drawn in a process pool (0 = in the request thread)
+    VISUAL_RENDER_WORKERS = int(os.getenv('VISUAL_RENDER_WORKERS', 2))
+    VISUAL_RENDER_TIMEOUT = float(os.getenv('VISUAL_RENDER_TIMEOUT', 20))
+    
     # Mail (for password reset)
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
@@ -121,6 +135,7 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
     WTF_CSRF_ENABLED = False
     RATELIMIT_ENABLED = False
+    VISUAL_RENDER_WORKERS = 0
 
 
 # Config dictionary
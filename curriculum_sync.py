@@ -0,0 +1,274 @@
+"""
+Incremental, content-hashed curriculum loader
+
+Runs the curriculum seed scripts into a scratch database, hashes every
+subject/topic/lesson/practice problem definition and upserts only the rows
+whose hash changed into the live database. Rows keep their ids, so student
+progress that references lessons and problems survives curriculum updates.
+"""
+
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from database import (
+    bulk_seeding,
+    close_pools,
+    get_connection,
+    get_pool,
+    init_database,
+    migrate_database,
+)
+
+# Seed functions that make up the full platform, in load order
+# (mirrors LOAD_EVERYTHING_ULTIMATE.load_complete_platform)
+CURRICULUM_SOURCES: List[Tuple[str, str]] = [
+    ("MASSIVE_ELA_CURRICULUM", "seed_massive_ela_curriculum"),
+    ("MASSIVE_MATH_CURRICULUM", "seed_massive_math_curriculum"),
+    ("MASSIVE_SCIENCE_CURRICULUM", "seed_massive_science_curriculum"),
+    ("MASSIVE_SOCIAL_STUDIES_CURRICULUM", "seed_massive_social_studies_curriculum"),
+    ("MASSIVE_ARTS_CURRICULUM", "seed_massive_arts_curriculum"),
+    ("SCIENCE_EXPERIMENTS_CURRICULUM", "seed_science_experiments_curriculum"),
+    ("EXPAND_MATH_LESSONS", "expand_math_lessons"),
+    ("NEW_SUBJECTS_CURRICULUM", "seed_all_new_subjects"),
+    ("COMPLETE_NEW_SUBJECTS_LESSONS", "add_all_comprehensive_lessons"),
+    ("UTAH_LOCAL_CURRICULUM", "seed_utah_curriculum"),
+]
+
+Source = Union[Tuple[str, str], Callable[[], None]]
+
+# table -> (parent table, parent id column, natural key column), parents first
+TABLES = {
+    "subjects": (None, None, "name"),
+    "topics": ("subjects", "subject_id", "name"),
+    "lessons": ("topics", "topic_id", "title"),
+    "practice_problems": ("lessons", "lesson_id", "question"),
+}
+
+# Columns that make up a row's definition (runtime columns such as
+# lessons.additional_resources are deliberately excluded)
+HASHED_COLUMNS = {
+    "subjects": ("description", "icon", "display_order"),
+    "topics": ("description", "display_order"),
+    "lessons": (
+        "description",
+        "steps",
+        "examples",
+        "source_type",
+        "source_file",
+        "display_order",
+    ),
+    "practice_problems": ("answer", "steps", "hints", "difficulty", "display_order"),
+}
+
+
+def content_hash(table: str, row) -> str:
+    """Stable hash of a row's definition columns."""
+    payload = json.dumps([row[column] for column in HASHED_COLUMNS[table]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class CurriculumDiff:
+    """What an incremental sync would change, keyed by natural keys."""
+
+    inserts: Dict[str, List[tuple]] = field(default_factory=dict)
+    updates: Dict[str, List[tuple]] = field(default_factory=dict)
+    unchanged: Dict[str, int] = field(default_factory=dict)
+    removed: Dict[str, int] = field(default_factory=dict)
+    build_seconds: float = 0.0
+    diff_seconds: float = 0.0
+    apply_seconds: float = 0.0
+    desired: Dict[str, Dict[tuple, dict]] = field(default_factory=dict, repr=False)
+    live: Dict[str, Dict[tuple, dict]] = field(default_factory=dict, repr=False)
+
+    @property
+    def has_changes(self) -> bool:
+        return any(self.inserts.values()) or any(self.updates.values())
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {
+            table: {
+                "new": len(self.inserts.get(table, [])),
+                "changed": len(self.updates.get(table, [])),
+                "unchanged": self.unchanged.get(table, 0),
+                "removed": self.removed.get(table, 0),
+            }
+            for table in TABLES
+        }
+
+
+def _resolve(source: Source) -> Callable[[], None]:
+    if callable(source):
+        return source
+    module_name, function_name = source
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _index_rows(conn) -> Dict[str, Dict[tuple, dict]]:
+    """Map every curriculum row to a natural key built from its ancestors.
+
+    Keys end with an occurrence number so duplicate titles under the same
+    parent stay distinct (matched in id order).
+    """
+    index: Dict[str, Dict[tuple, dict]] = {}
+    keys_by_id: Dict[str, Dict[int, tuple]] = {}
+
+    for table, (parent_table, parent_column, key_column) in TABLES.items():
+        index[table] = {}
+        keys_by_id[table] = {}
+        occurrences: Dict[tuple, int] = {}
+        for row in conn.execute(f"SELECT * FROM {table} ORDER BY id"):
+            if parent_table:
+                parent_key = keys_by_id[parent_table].get(row[parent_column])
+                if parent_key is None:
+                    continue  # orphaned row
+            else:
+                parent_key = ()
+            base = parent_key + (row[key_column],)
+            occurrence = occurrences.get(base, 0)
+            occurrences[base] = occurrence + 1
+            key = base + (occurrence,)
+
+            record = dict(row)
+            stored = record.get("content_hash")
+            record["hash"] = stored or content_hash(table, row)
+            record["hash_stored"] = bool(stored)
+            index[table][key] = record
+            keys_by_id[table][row["id"]] = key
+    return index
+
+
+def build_desired_curriculum(path: str, sources: Optional[List[Source]] = None):
+    """Run the seed scripts into a fresh database at ``path``."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        with bulk_seeding(path=path):
+            init_database()
+            for source in sources or CURRICULUM_SOURCES:
+                _resolve(source)()
+
+
+def diff_curriculum(sources: Optional[List[Source]] = None) -> CurriculumDiff:
+    """Compare the seed script definitions with the live database."""
+    diff = CurriculumDiff()
+    scratch_dir = tempfile.mkdtemp(prefix="curriculum_sync_")
+    scratch_path = os.path.join(scratch_dir, "desired.db")
+    try:
+        start = time.perf_counter()
+        build_desired_curriculum(scratch_path, sources)
+        diff.build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scratch = get_pool(scratch_path).acquire()
+        try:
+            diff.desired = _index_rows(scratch)
+        finally:
+            scratch.close()
+
+        conn = get_connection()
+        try:
+            diff.live = _index_rows(conn)
+        finally:
+            conn.close()
+
+        for table in TABLES:
+            desired, live = diff.desired[table], diff.live[table]
+            diff.inserts[table] = [key for key in desired if key not in live]
+            diff.updates[table] = [
+                key
+                for key, row in desired.items()
+                if key in live and live[key]["hash"] != row["hash"]
+            ]
+            diff.unchanged[table] = (
+                len(desired) - len(diff.inserts[table]) - len(diff.updates[table])
+            )
+            diff.removed[table] = sum(1 for key in live if key not in desired)
+        diff.diff_seconds = time.perf_counter() - start
+    finally:
+        close_pools(scratch_path)
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    return diff
+
+
+def apply_curriculum_diff(diff: CurriculumDiff) -> CurriculumDiff:
+    """Upsert the new and changed rows of ``diff`` in one transaction.
+
+    Rows that are no longer defined are left alone, since student progress
+    may still reference them.
+    """
+    migrate_database(analyze=False)  # content_hash columns
+
+    start = time.perf_counter()
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        # natural key -> live id, extended as parents are inserted
+        ids = {
+            table: {key: row["id"] for key, row in diff.live[table].items()}
+            for table in TABLES
+        }
+
+        for table, (parent_table, parent_column, key_column) in TABLES.items():
+            columns = HASHED_COLUMNS[table]
+
+            for key in diff.updates[table]:
+                row = diff.desired[table][key]
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                conn.execute(
+                    f"UPDATE {table} SET {assignments}, content_hash = ? WHERE id = ?",
+                    [row[column] for column in columns]
+                    + [row["hash"], ids[table][key]],
+                )
+
+            insert_columns = [key_column, *columns, "content_hash"]
+            if parent_table:
+                insert_columns.insert(0, parent_column)
+            placeholders = ", ".join("?" for _ in insert_columns)
+            for key in diff.inserts[table]:
+                row = diff.desired[table][key]
+                values = [row[key_column], *(row[c] for c in columns), row["hash"]]
+                if parent_table:
+                    # key = parent key + (name, occurrence)
+                    values.insert(0, ids[parent_table][key[:-2]])
+                cursor = conn.execute(
+                    f"INSERT INTO {table} ({', '.join(insert_columns)}) VALUES ({placeholders})",
+                    values,
+                )
+                ids[table][key] = cursor.lastrowid
+
+            # Record hashes for unchanged legacy rows so later diffs skip re-hashing
+            updated = set(diff.updates[table])
+            conn.executemany(
+                f"UPDATE {table} SET content_hash = ? WHERE id = ?",
+                [
+                    (row["hash"], row["id"])
+                    for key, row in diff.live[table].items()
+                    if not row["hash_stored"] and key not in updated
+                ],
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    diff.apply_seconds = time.perf_counter() - start
+    return diff
+
+
+def sync_curriculum(
+    sources: Optional[List[Source]] = None, apply: bool = True
+) -> CurriculumDiff:
+    """Diff the curriculum definitions against the database and optionally apply."""
+    diff = diff_curriculum(sources)
+    if apply and diff.has_changes:
+        apply_curriculum_diff(diff)
+    return diff
@@ -1,13 +1,28 @@
 import sqlite3
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
-from flask import current_app
+from flask import current_app, g, has_app_context
 
 DATABASE_FILE = "tutor_app.db"
 
+# Connection pool tuning (override via environment)
+POOL_MAX_CONNECTIONS = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "10"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Directories already checked/created by _get_database_path
+_ensured_dirs = set()
+
 
 def _get_database_path() -> str:
     """Resolve the database path from Flask config or environment."""
@@ -21,19 +36,269 @@ def _get_database_path() -> str:
     if path.startswith("postgresql://"):
         path = DATABASE_FILE
     
-    # Ensure the directory exists
+    # Ensure the directory exists (only once per directory)
     db_dir = os.path.dirname(path)
-    if db_dir and not os.path.exists(db_dir):
+    if db_dir and db_dir not in _ensured_dirs:
         os.makedirs(db_dir, exist_ok=True)
+        _ensured_dirs.add(db_dir)
     
     return path
 
 
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose close() hands it back to its pool."""
+
+    _pool = None
+    _checked_out = False
+    _bound = False
+
+    def close(self):
+        if not self._checked_out:
+            return
+        if self._bound:
+            # Released by its owner (app context teardown or bulk seeder)
+            return
+        self._pool.release(self)
+
+    def close_physical(self):
+        """Really close the underlying SQLite handle."""
+        super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections for a single database file."""
+
+    def __init__(
+        self,
+        path: str,
+        max_connections: int = POOL_MAX_CONNECTIONS,
+        timeout: float = POOL_TIMEOUT,
+    ):
+        self.path = path
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self._idle: List[PooledConnection] = []
+        self._open = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        # Stats
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_in_use = 0
+        self.created = 0
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            timeout=self.timeout,
+            factory=PooledConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn._pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, waiting up to ``timeout`` if exhausted."""
+        start = time.perf_counter()
+        waited = False
+        create = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._open < self.max_connections:
+                    # Reserve the slot; connect outside the lock
+                    self._open += 1
+                    conn = None
+                    create = True
+                    break
+                waited = True
+                remaining = self.timeout - (time.perf_counter() - start)
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if not self._idle and self._open >= self.max_connections:
+                        self.timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No SQLite connection available for {self.path} "
+                            f"after {self.timeout:.1f}s "
+                            f"(pool size {self.max_connections})"
+                        )
+
+            self._in_use += 1
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+            if waited:
+                elapsed = time.perf_counter() - start
+                self.waits += 1
+                self.total_wait += elapsed
+                self.max_wait = max(self.max_wait, elapsed)
+
+        if create:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self.created += 1
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn: PooledConnection):
+        """Return a connection to the pool, discarding uncommitted work."""
+        conn._checked_out = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = True
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy and not self._closed:
+                self._idle.append(conn)
+                conn = None
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+        if conn is not None:
+            conn.close_physical()
+
+    def close(self):
+        """Close all idle connections; in-use ones close on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close_physical()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "path": self.path,
+                "max_connections": self.max_connections,
+                "open_connections": self._open,
+                "idle_connections": len(self._idle),
+                "in_use": self._in_use,
+                "peak_in_use": self.peak_in_use,
+                "connections_created": self.created,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(self.total_wait * 1000 / self.waits, 3)
+                if self.waits
+                else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: Optional[str] = None) -> ConnectionPool:
+    """Get (or lazily create) the connection pool for a database path."""
+    path = path or _get_database_path()
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                pool = ConnectionPool(path)
+                _pools[path] = pool
+    return pool
+
+
+def close_pools(path: Optional[str] = None):
+    """Close every pool, or just the one for ``path`` (e.g. before deleting the file)."""
+    with _pools_lock:
+        if path is None:
+            pools = list(_pools.values())
+            _pools.clear()
+        else:
+            pools = [_pools.pop(path)] if path in _pools else []
+    for pool in pools:
+        pool.close()
+
+
+def remove_database_file(path: str = DATABASE_FILE):
+    """Close pooled connections and delete a database with its WAL files."""
+    close_pools()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def get_pool_stats() -> List[Dict]:
+    """Statistics for every open pool, for sizing POOL_MAX_CONNECTIONS."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+_seeding = threading.local()
+
+
+def _active_seeder():
+    return getattr(_seeding, "seeder", None)
+
+
+def _release_request_connection(exc=None):
+    conn = g.pop("_sqlite_conn", None)
+    if conn is not None:
+        conn._bound = False
+        conn.close()
+
+
+def init_app(app):
+    """Reuse one pooled connection for the lifetime of each app context."""
+    app.extensions["sqlite_pool"] = True
+    app.teardown_appcontext(_release_request_connection)
+
+
 def get_connection():
-    """Get a database connection."""
-    conn = sqlite3.connect(_get_database_path(), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get a database connection.
+
+    Connections come from a per-database pool; ``close()`` returns them to
+    the pool. Inside an app registered with ``init_app`` the same connection
+    is reused for the whole request and released at teardown. While a
+    ``bulk_seeding()`` block is active the seeder's connection is returned,
+    with pending rows flushed so reads see them.
+    """
+    seeder = _active_seeder()
+    if seeder is not None:
+        return seeder.connection()
+    if has_app_context() and "sqlite_pool" in current_app.extensions:
+        conn = g.get("_sqlite_conn")
+        if conn is None:
+            conn = get_pool().acquire()
+            conn._bound = True
+            g._sqlite_conn = conn
+        return conn
+    return get_pool().acquire()
 
 
 def init_database():
@@ -171,11 +436,117 @@ def init_database():
     conn.commit()
     conn.close()
 
+    # Statistics are gathered once data is loaded (cli.py migrate-db)
+    migrate_database(analyze=False)
+
+
+# Versioned schema migrations, tracked with PRAGMA user_version.
+# Each entry is (version, description, statements); never edit a shipped entry,
+# append a new version instead.
+SCHEMA_MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (
+        1,
+        "Indexes for curriculum, progress and API cache lookups",
+        [
+            # get_topics_by_subject: filter + ORDER BY served by the index
+            """CREATE INDEX IF NOT EXISTS idx_topics_subject
+               ON topics (subject_id, display_order, name)""",
+            # get_lessons_by_topic / get_practice_problems_by_topic joins
+            """CREATE INDEX IF NOT EXISTS idx_lessons_topic
+               ON lessons (topic_id, display_order, title)""",
+            """CREATE INDEX IF NOT EXISTS idx_practice_problems_lesson
+               ON practice_problems (lesson_id, display_order)""",
+            # Covers record_practice_attempt lookup and get_lesson_progress
+            """CREATE INDEX IF NOT EXISTS idx_student_progress_lesson_problem
+               ON student_progress
+               (lesson_id, practice_problem_id, attempts, score, mastery_level)""",
+            """CREATE INDEX IF NOT EXISTS idx_api_cache_source_query
+               ON api_cache (api_source, query, expires_at)""",
+            """CREATE INDEX IF NOT EXISTS idx_standards_lesson
+               ON standards (lesson_id)""",
+        ],
+    ),
+    (
+        2,
+        "Content hashes for incremental curriculum sync",
+        [
+            "ALTER TABLE subjects ADD COLUMN content_hash TEXT",
+            "ALTER TABLE topics ADD COLUMN content_hash TEXT",
+            "ALTER TABLE lessons ADD COLUMN content_hash TEXT",
+            "ALTER TABLE practice_problems ADD COLUMN content_hash TEXT",
+        ],
+    ),
+    (
+        3,
+        "Unique api_cache key and persistent hit/miss counters",
+        [
+            # Keep the newest of any duplicated (api_source, query) rows
+            """DELETE FROM api_cache WHERE id NOT IN
+               (SELECT MAX(id) FROM api_cache GROUP BY api_source, query)""",
+            "DROP INDEX IF EXISTS idx_api_cache_source_query",
+            """CREATE UNIQUE INDEX IF NOT EXISTS idx_api_cache_key
+               ON api_cache (api_source, query)""",
+            "CREATE INDEX IF NOT EXISTS idx_api_cache_expires ON api_cache (expires_at)",
+            """CREATE TABLE IF NOT EXISTS api_cache_stats (
+                api_source TEXT PRIMARY KEY,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0
+            )""",
+        ],
+    ),
+]
+
+
+def get_schema_version(conn=None) -> int:
+    """Return the schema version recorded in the database."""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def migrate_database(analyze: bool = True) -> List[Tuple[int, str]]:
+    """Apply pending schema migrations and refresh planner statistics.
+
+    Returns the (version, description) pairs that were applied.
+    """
+    conn = get_connection()
+    applied = []
+    try:
+        current = get_schema_version(conn)
+        for version, description, statements in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            conn.execute("BEGIN")
+            try:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append((version, description))
+
+        if analyze:
+            conn.execute("ANALYZE")
+            conn.commit()
+    finally:
+        conn.close()
+    return applied
+
 
 # CRUD operations for subjects
 def add_subject(
     name: str, description: str = "", icon: str = "📚", display_order: int = 0
 ) -> int:
+    seeder = _active_seeder()
+    if seeder is not None:
+        return seeder.add_subject(name, description, icon, display_order)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
@@ -201,6 +572,9 @@ def get_all_subjects() -> List[Dict]:
 def add_topic(
     subject_id: int, name: str, description: str = "", display_order: int = 0
 ) -> int:
+    seeder = _active_seeder()
+    if seeder is not None:
+        return seeder.add_topic(subject_id, name, description, display_order)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
@@ -236,6 +610,18 @@ def add_lesson(
     source_file: str = None,
     display_order: int = 0,
 ) -> int:
+    seeder = _active_seeder()
+    if seeder is not None:
+        return seeder.add_lesson(
+            topic_id,
+            title,
+            description,
+            steps,
+            examples,
+            source_type,
+            source_file,
+            display_order,
+        )
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
@@ -323,6 +709,11 @@ def add_practice_problem(
     difficulty: str = "medium",
     display_order: int = 0,
 ) -> int:
+    seeder = _active_seeder()
+    if seeder is not None:
+        return seeder.add_practice_problem(
+            lesson_id, question, answer, steps, hints, difficulty, display_order
+        )
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
@@ -344,6 +735,288 @@ def add_practice_problem(
     return problem_id
 
 
+# Bulk seeding
+class BulkSeeder:
+    """Batches add_topic/add_lesson/add_practice_problem into executemany writes.
+
+    Row ids are allocated up front from the table's AUTOINCREMENT sequence, so
+    seed scripts keep using the ids returned by the add_* functions exactly as
+    with the row-at-a-time API. Each subject is written in one transaction;
+    a dry run writes everything into a single transaction and rolls it back,
+    leaving only the row counts.
+    """
+
+    COLUMNS = {
+        "topics": ("id", "subject_id", "name", "description", "display_order"),
+        "lessons": (
+            "id",
+            "topic_id",
+            "title",
+            "description",
+            "steps",
+            "examples",
+            "source_type",
+            "source_file",
+            "display_order",
+        ),
+        "practice_problems": (
+            "id",
+            "lesson_id",
+            "question",
+            "answer",
+            "steps",
+            "hints",
+            "difficulty",
+            "display_order",
+        ),
+    }
+
+    def __init__(
+        self,
+        dry_run: bool = False,
+        progress=None,
+        batch_size: int = 5000,
+        path: Optional[str] = None,
+    ):
+        self.path = path
+        self.dry_run = dry_run
+        self.progress = progress
+        self.batch_size = batch_size
+        self.counts = {"subjects": 0, "topics": 0, "lessons": 0, "practice_problems": 0}
+        self.elapsed = 0.0
+        self._conn = None
+        self._pending: Dict[str, List[tuple]] = {table: [] for table in self.COLUMNS}
+        self._next_id: Dict[str, int] = {}
+        self._subject = None
+        self._subject_counts = dict(self.counts)
+        self._started = 0.0
+
+    # Lifecycle
+    def start(self):
+        self._started = time.perf_counter()
+        self._conn = get_pool(self.path).acquire()
+        self._conn._bound = True
+        self._isolation_level = self._conn.isolation_level
+        self._conn.isolation_level = None  # explicit BEGIN/COMMIT
+
+    def finish(self):
+        try:
+            self._end_subject()
+            if self.dry_run:
+                self._rollback()
+        finally:
+            self._release()
+
+    def abort(self):
+        try:
+            self._rollback()
+        finally:
+            self._release()
+
+    def _release(self):
+        if self._conn is not None:
+            self._conn.isolation_level = self._isolation_level
+            self._conn._bound = False
+            self._conn.close()
+            self._conn = None
+        self.elapsed = time.perf_counter() - self._started
+
+    def _rollback(self):
+        for rows in self._pending.values():
+            rows.clear()
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.rollback()
+
+    def _begin(self):
+        if self._conn.in_transaction:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        # Reserve ids after taking the write lock
+        for table in self.COLUMNS:
+            row = self._conn.execute(
+                f"""SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                           COALESCE((SELECT MAX(id) FROM {table}), 0))""",
+                (table,),
+            ).fetchone()
+            self._next_id[table] = row[0] + 1
+
+    def _allocate(self, table: str) -> int:
+        self._begin()
+        row_id = self._next_id[table]
+        self._next_id[table] = row_id + 1
+        return row_id
+
+    def _queue(self, table: str, row: tuple):
+        self._pending[table].append(row)
+        self.counts[table] += 1
+        self._subject_counts[table] += 1
+        if len(self._pending[table]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all pending rows (parents before children)."""
+        for table, columns in self.COLUMNS.items():
+            rows = self._pending[table]
+            if not rows:
+                continue
+            placeholders = ", ".join("?" for _ in columns)
+            self._conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                rows,
+            )
+            rows.clear()
+
+    def _end_subject(self):
+        self.flush()
+        if not self.dry_run and self._conn.in_transaction:
+            self._conn.commit()
+        if self.progress and any(self._subject_counts.values()):
+            self.progress(self._subject or "(existing subjects)", dict(self._subject_counts))
+        self._subject_counts = {table: 0 for table in self.counts}
+
+    def connection(self):
+        """Connection for reads/writes made while seeding, with rows flushed."""
+        self.flush()
+        return self._conn
+
+    # Data model (mirrors the module-level add_* functions)
+    def add_subject(self, name, description="", icon="📚", display_order=0) -> int:
+        self._end_subject()
+        self._subject = name
+        self._begin()
+        cursor = self._conn.execute(
+            "INSERT INTO subjects (name, description, icon, display_order) VALUES (?, ?, ?, ?)",
+            (name, description, icon, display_order),
+        )
+        self.counts["subjects"] += 1
+        self._subject_counts["subjects"] += 1
+        return cursor.lastrowid
+
+    def add_topic(self, subject_id, name, description="", display_order=0) -> int:
+        topic_id = self._allocate("topics")
+        self._queue("topics", (topic_id, subject_id, name, description, display_order))
+        return topic_id
+
+    def add_lesson(
+        self,
+        topic_id,
+        title,
+        description,
+        steps,
+        examples,
+        source_type="builtin",
+        source_file=None,
+        display_order=0,
+    ) -> int:
+        lesson_id = self._allocate("lessons")
+        self._queue(
+            "lessons",
+            (
+                lesson_id,
+                topic_id,
+                title,
+                description,
+                json.dumps(steps),
+                json.dumps(examples),
+                source_type,
+                source_file,
+                display_order,
+            ),
+        )
+        return lesson_id
+
+    def add_practice_problem(
+        self,
+        lesson_id,
+        question,
+        answer,
+        steps,
+        hints=None,
+        difficulty="medium",
+        display_order=0,
+    ) -> int:
+        problem_id = self._allocate("practice_problems")
+        self._queue(
+            "practice_problems",
+            (
+                problem_id,
+                lesson_id,
+                question,
+                answer,
+                json.dumps(steps),
+                json.dumps(hints or []),
+                difficulty,
+                display_order,
+            ),
+        )
+        return problem_id
+
+
+def print_seed_progress(subject: str, counts: Dict[str, int]):
+    """Default progress reporter for bulk_seeding()."""
+    print(
+        f"  ✓ {subject}: {counts['topics']} topics, {counts['lessons']} lessons, "
+        f"{counts['practice_problems']} problems"
+    )
+
+
+@contextmanager
+def bulk_seeding(
+    dry_run: bool = False,
+    progress=None,
+    batch_size: int = 5000,
+    path: Optional[str] = None,
+):
+    """Route add_subject/add_topic/add_lesson/add_practice_problem through a BulkSeeder.
+
+    Existing seed functions run unchanged inside the block::
+
+        with bulk_seeding(progress=print_seed_progress) as seeder:
+            seed_massive_math_curriculum()
+        print(seeder.counts, seeder.elapsed)
+
+    Nested blocks join the outer seeder. ``path`` seeds a database other
+    than the configured one; every get_connection() inside the block uses it.
+    """
+    active = _active_seeder()
+    if active is not None:
+        yield active
+        return
+
+    seeder = BulkSeeder(
+        dry_run=dry_run, progress=progress, batch_size=batch_size, path=path
+    )
+    seeder.start()
+    _seeding.seeder = seeder
+    try:
+        yield seeder
+    except BaseException:
+        _seeding.seeder = None
+        seeder.abort()
+        raise
+    _seeding.seeder = None
+    seeder.finish()
+
+
+@contextmanager
+def preview_database():
+    """Yield the path of an empty, initialized throwaway database.
+
+    Dry runs seed into it (``bulk_seeding(path=...)``) so their counts match
+    a real load, which also starts from a fresh database. It is deleted when
+    the block exits.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="tutor-preview-")
+    path = os.path.join(tmp_dir, "preview.db")
+    try:
+        with bulk_seeding(path=path):
+            init_database()
+        yield path
+    finally:
+        close_pools(path)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def get_practice_problems_by_lesson(lesson_id: int) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -494,6 +1167,34 @@ def get_uploaded_files() -> List[Dict]:
 
 
 # API cache functions
+# Payloads are stored zlib-compressed (BLOB); plain JSON text rows written
+# before migration 3 are still readable.
+API_CACHE_SWEEP_INTERVAL = int(os.getenv("API_CACHE_SWEEP_INTERVAL", "600"))
+API_CACHE_COMPRESS_LEVEL = 6
+
+_api_cache_lock = threading.Lock()
+_api_cache_counters: Dict[str, List[int]] = {}  # api_source -> [hits, misses]
+_api_cache_last_sweep = time.monotonic()
+
+
+def _encode_api_payload(response_data) -> bytes:
+    return zlib.compress(
+        json.dumps(response_data).encode("utf-8"), API_CACHE_COMPRESS_LEVEL
+    )
+
+
+def _decode_api_payload(payload):
+    if isinstance(payload, bytes):
+        payload = zlib.decompress(payload).decode("utf-8")
+    return json.loads(payload)
+
+
+def _count_api_cache_lookup(api_source: str, hit: bool):
+    with _api_cache_lock:
+        counters = _api_cache_counters.setdefault(api_source, [0, 0])
+        counters[0 if hit else 1] += 1
+
+
 def cache_api_response(
     api_source: str, query: str, response_data: Dict, expires_hours: int = 24
 ):
@@ -501,11 +1202,17 @@ def cache_api_response(
     cursor = conn.cursor()
     expires_at = datetime.now().timestamp() + (expires_hours * 3600)
     cursor.execute(
-        "INSERT INTO api_cache (api_source, query, response_data, expires_at) VALUES (?, ?, ?, ?)",
-        (api_source, query, json.dumps(response_data), expires_at),
+        """INSERT INTO api_cache (api_source, query, response_data, expires_at)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT (api_source, query) DO UPDATE SET
+               response_data = excluded.response_data,
+               cached_at = CURRENT_TIMESTAMP,
+               expires_at = excluded.expires_at""",
+        (api_source, query, _encode_api_payload(response_data), expires_at),
     )
     conn.commit()
     conn.close()
+    _maybe_sweep_api_cache()
 
 
 def get_cached_api_response(api_source: str, query: str) -> Optional[Dict]:
@@ -518,13 +1225,99 @@ def get_cached_api_response(api_source: str, query: str) -> Optional[Dict]:
     row = cursor.fetchone()
     conn.close()
 
-    if row:
-        expires_at = row["expires_at"]
-        if datetime.now().timestamp() < expires_at:
-            return json.loads(row["response_data"])
+    if row and datetime.now().timestamp() < row["expires_at"]:
+        _count_api_cache_lookup(api_source, hit=True)
+        return _decode_api_payload(row["response_data"])
+    _count_api_cache_lookup(api_source, hit=False)
     return None
 
 
+def _flush_api_cache_counters(conn):
+    with _api_cache_lock:
+        counters = list(_api_cache_counters.items())
+        _api_cache_counters.clear()
+    conn.executemany(
+        """INSERT INTO api_cache_stats (api_source, hits, misses) VALUES (?, ?, ?)
+           ON CONFLICT (api_source) DO UPDATE SET
+               hits = hits + excluded.hits,
+               misses = misses + excluded.misses""",
+        [(source, hits, misses) for source, (hits, misses) in counters],
+    )
+
+
+def sweep_api_cache() -> int:
+    """Delete expired api_cache rows and persist hit/miss counters.
+
+    Returns the number of rows deleted.
+    """
+    global _api_cache_last_sweep
+    _api_cache_last_sweep = time.monotonic()
+    conn = get_connection()
+    try:
+        cursor = conn.execute(
+            "DELETE FROM api_cache WHERE expires_at < ?", (datetime.now().timestamp(),)
+        )
+        _flush_api_cache_counters(conn)
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+def _maybe_sweep_api_cache():
+    """Run sweep_api_cache() at most every API_CACHE_SWEEP_INTERVAL seconds."""
+    if time.monotonic() - _api_cache_last_sweep >= API_CACHE_SWEEP_INTERVAL:
+        sweep_api_cache()
+
+
+def get_api_cache_stats() -> Dict:
+    """Row counts, payload size and persisted hit rate for the api_cache table."""
+    conn = get_connection()
+    try:
+        _flush_api_cache_counters(conn)
+        conn.commit()
+        now = datetime.now().timestamp()
+        row = conn.execute(
+            """SELECT COUNT(*) AS entries,
+                      COALESCE(SUM(expires_at < ?), 0) AS expired,
+                      COALESCE(SUM(LENGTH(response_data)), 0) AS payload_bytes
+               FROM api_cache""",
+            (now,),
+        ).fetchone()
+        sources = {
+            r["api_source"]: {"hits": r["hits"], "misses": r["misses"]}
+            for r in conn.execute("SELECT * FROM api_cache_stats ORDER BY api_source")
+        }
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+
+    hits = sum(s["hits"] for s in sources.values())
+    lookups = hits + sum(s["misses"] for s in sources.values())
+    return {
+        "entries": row["entries"],
+        "expired_entries": row["expired"],
+        "payload_bytes": row["payload_bytes"],
+        "database_bytes": page_size * pages,
+        "free_bytes": page_size * free_pages,
+        "hits": hits,
+        "misses": lookups - hits,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "sources": sources,
+    }
+
+
+def vacuum_database():
+    """Rebuild the database file to return free pages to the filesystem."""
+    conn = get_connection()
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
 # Search functions
 def search_lessons(query: str) -> List[Dict]:
     conn = get_connection()
@@ -0,0 +1,32 @@
+"""Composite (child_id, next_due, level) index for the review queue
+
+Revision ID: 353022f1c545
+Revises: 9de0632bc8ab
+Create Date: 2026-10-18 18:41:37.106254
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "353022f1c545"
+down_revision = "9de0632bc8ab"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves the per-child "due and not yet mastered" review lookup
+    indexes = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("skill_states")}
+    if "ix_skill_states_child_due_level" not in indexes:
+        op.create_index(
+            "ix_skill_states_child_due_level",
+            "skill_states",
+            ["child_id", "next_due", "level"],
+            unique=False,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_skill_states_child_due_level", table_name="skill_states")
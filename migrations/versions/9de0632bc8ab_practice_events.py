@@ -0,0 +1,152 @@
+"""Append-only practice_events log with a rolling window on skill_states
+
+Revision ID: 9de0632bc8ab
+Revises:
+Create Date: 2026-10-18 18:05:12.482913
+
+Moves every attempt out of skill_states.history_json into practice_events
+and keeps only the last SkillState.RECENT_WINDOW attempts in recent_json.
+
+"""
+
+import json
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9de0632bc8ab"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+RECENT_WINDOW = 5
+BATCH_SIZE = 500
+
+skill_states = sa.table(
+    "skill_states",
+    sa.column("id", sa.Integer),
+    sa.column("child_id", sa.Integer),
+    sa.column("skill_id", sa.Integer),
+    sa.column("recent_json", sa.Text),
+    sa.column("history_json", sa.Text),
+)
+practice_events = sa.table(
+    "practice_events",
+    sa.column("child_id", sa.Integer),
+    sa.column("skill_id", sa.Integer),
+    sa.column("success", sa.Boolean),
+    sa.column("score", sa.Float),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.utcnow()
+
+
+def upgrade():
+    # New event log table and the rolling recent_json window on skill_states
+    inspector = sa.inspect(op.get_bind())
+    if "practice_events" not in inspector.get_table_names():
+        op.create_table(
+            "practice_events",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("child_id", sa.Integer(), nullable=False),
+            sa.Column("skill_id", sa.Integer(), nullable=False),
+            sa.Column("success", sa.Boolean(), nullable=False),
+            sa.Column("score", sa.Float(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["child_id"], ["child_profiles.id"]),
+            sa.ForeignKeyConstraint(["skill_id"], ["skills.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_practice_events_child_skill_created",
+            "practice_events",
+            ["child_id", "skill_id", "created_at"],
+            unique=False,
+        )
+    columns = {c["name"] for c in inspector.get_columns("skill_states")}
+    if "recent_json" not in columns:
+        with op.batch_alter_table("skill_states") as batch_op:
+            batch_op.add_column(sa.Column("recent_json", sa.Text(), nullable=True))
+
+    # Backfill: one pass over the old blobs, in batches
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(
+                skill_states.c.id,
+                skill_states.c.child_id,
+                skill_states.c.skill_id,
+                skill_states.c.history_json,
+            )
+            .where(skill_states.c.id > last_id)
+            .where(skill_states.c.history_json.isnot(None))
+            .order_by(skill_states.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        events = []
+        for state_id, child_id, skill_id, history_json in rows:
+            history = json.loads(history_json) or []
+            events.extend(
+                {
+                    "child_id": child_id,
+                    "skill_id": skill_id,
+                    "success": bool(entry.get("success")),
+                    "score": entry.get("score"),
+                    "created_at": _parse_date(entry.get("date")),
+                }
+                for entry in history
+            )
+            conn.execute(
+                skill_states.update()
+                .where(skill_states.c.id == state_id)
+                .values(
+                    recent_json=json.dumps(history[-RECENT_WINDOW:]), history_json=None
+                )
+            )
+        if events:
+            conn.execute(practice_events.insert(), events)
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    conn = op.get_bind()
+    histories = {}
+    rows = conn.execute(
+        sa.select(
+            practice_events.c.child_id,
+            practice_events.c.skill_id,
+            practice_events.c.success,
+            practice_events.c.score,
+            practice_events.c.created_at,
+        ).order_by(practice_events.c.created_at)
+    )
+    for child_id, skill_id, success, score, created_at in rows:
+        histories.setdefault((child_id, skill_id), []).append(
+            {"date": created_at.isoformat(), "success": success, "score": score}
+        )
+    for (child_id, skill_id), history in histories.items():
+        conn.execute(
+            skill_states.update()
+            .where(skill_states.c.child_id == child_id)
+            .where(skill_states.c.skill_id == skill_id)
+            .values(history_json=json.dumps(history))
+        )
+
+    with op.batch_alter_table("skill_states") as batch_op:
+        batch_op.drop_column("recent_json")
+    op.drop_index(
+        "ix_practice_events_child_skill_created", table_name="practice_events"
+    )
+    op.drop_table("practice_events")
@@ -0,0 +1,42 @@
+"""skill_prerequisites edges and curriculum_version for the scope-and-sequence graph
+
+Revision ID: b7e4d2a91c3f
+Revises: 353022f1c545
+Create Date: 2026-10-18 19:26:48.513307
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e4d2a91c3f"
+down_revision = "353022f1c545"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Prerequisite edges between skills, plus the single-row version counter
+    # that tells workers when to reload the cached graph
+    if "skill_prerequisites" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "skill_prerequisites",
+            sa.Column("skill_id", sa.Integer(), nullable=False),
+            sa.Column("prerequisite_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["prerequisite_id"], ["skills.id"]),
+            sa.ForeignKeyConstraint(["skill_id"], ["skills.id"]),
+            sa.PrimaryKeyConstraint("skill_id", "prerequisite_id"),
+        )
+    if "curriculum_version" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "curriculum_version",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade():
+    op.drop_table("curriculum_version")
+    op.drop_table("skill_prerequisites")
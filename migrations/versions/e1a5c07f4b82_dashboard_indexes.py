@@ -0,0 +1,34 @@
+"""Covering indexes for the parent dashboard counts
+
+Revision ID: e1a5c07f4b82
+Revises: b7e4d2a91c3f
+Create Date: 2026-10-18 19:58:03.274116
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e1a5c07f4b82"
+down_revision = "b7e4d2a91c3f"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_assignments_child_date_status", "assignments", ["child_id", "date", "status"]),
+    ("ix_submissions_child_score", "submissions", ["child_id", "score"]),
+]
+
+
+def upgrade():
+    # Let the dashboard's per-child assignment and score counts use an index
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -102,6 +102,20 @@ class Standard(db.Model):
         return f'<Standard {self.code}>'
 
 
+skill_prerequisites = db.Table(
+    'skill_prerequisites',
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    db.Column('prerequisite_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+)
+
+# One row, bumped whenever standards, skills or prerequisites change
+curriculum_version = db.Table(
+    'curriculum_version',
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('version', db.Integer, nullable=False, default=0)
+)
+
+
 class Skill(db.Model):
     """A specific skill within a standard"""
     __tablename__ = 'skills'
@@ -114,6 +128,13 @@ class Skill(db.Model):
     
     # Relationships
     skill_states = db.relationship('SkillState', backref='skill', lazy='dynamic', cascade='all, delete-orphan')
+    prerequisites = db.relationship(
+        'Skill',
+        secondary=skill_prerequisites,
+        primaryjoin=id == skill_prerequisites.c.skill_id,
+        secondaryjoin=id == skill_prerequisites.c.prerequisite_id,
+        lazy='dynamic'
+    )
     
     @property
     def tags(self):
@@ -200,6 +221,11 @@ class Assignment(db.Model):
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
     
+    __table_args__ = (
+        # Parent dashboard: WHERE child_id = ? AND date = ? [AND status = 'completed']
+        db.Index('ix_assignments_child_date_status', 'child_id', 'date', 'status'),
+    )
+    
     # Relationships
     submissions = db.relationship('Submission', backref='assignment', lazy='dynamic', cascade='all, delete-orphan')
     time_entries = db.relationship('TimeOnTask', backref='assignment', lazy='dynamic', cascade='all, delete-orphan')
@@ -221,6 +247,11 @@ class Submission(db.Model):
     feedback = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
+    __table_args__ = (
+        # Pending reviews: WHERE child_id = ? AND score IS NULL
+        db.Index('ix_submissions_child_score', 'child_id', 'score'),
+    )
+    
     @property
     def artifacts(self):
         return json.loads(self.artifacts_json) if self.artifacts_json else {}
@@ -296,6 +327,8 @@ class SkillState(db.Model):
     """Mastery tracking for a child's skill"""
     __tablename__ = 'skill_states'
     
+    RECENT_WINDOW = 5  # attempts kept inline; the full log is in practice_events
+    
     id = db.Column(db.Integer, primary_key=True)
     child_id = db.Column(db.Integer, db.ForeignKey('child_profiles.id'), nullable=False, index=True)
     skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False, index=True)
@@ -303,22 +336,61 @@ class SkillState(db.Model):
     last_practice = db.Column(db.DateTime)
     next_due = db.Column(db.DateTime, index=True)
     evidence_count = db.Column(db.Integer, default=0)
-    history_json = db.Column(db.Text)  # JSON: [{date, success, score}, ...]
+    recent_json = db.Column(db.Text)  # JSON: last RECENT_WINDOW [{date, success, score}, ...]
+    history_json = db.Column(db.Text)  # Legacy full history, moved to practice_events
     
-    __table_args__ = (db.UniqueConstraint('child_id', 'skill_id', name='_child_skill_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('child_id', 'skill_id', name='_child_skill_uc'),
+        # Review queue: WHERE child_id = ? AND next_due <= ? AND level < 5 ORDER BY next_due, level
+        db.Index('ix_skill_states_child_due_level', 'child_id', 'next_due', 'level'),
+    )
     
     @property
-    def history(self):
-        return json.loads(self.history_json) if self.history_json else []
+    def recent(self):
+        return json.loads(self.recent_json) if self.recent_json else []
+    
+    @recent.setter
+    def recent(self, value):
+        self.recent_json = json.dumps(value[-self.RECENT_WINDOW:])
     
-    @history.setter
-    def history(self, value):
-        self.history_json = json.dumps(value)
+    @property
+    def history(self):
+        """Every attempt, oldest first"""
+        events = PracticeEvent.query.filter_by(
+            child_id=self.child_id, skill_id=self.skill_id
+        ).order_by(PracticeEvent.created_at, PracticeEvent.id)
+        return [event.to_dict() for event in events]
     
     def __repr__(self):
         return f'<SkillState child={self.child_id} skill={self.skill_id} level={self.level}>'
 
 
+class PracticeEvent(db.Model):
+    """One practice attempt (append-only)"""
+    __tablename__ = 'practice_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    child_id = db.Column(db.Integer, db.ForeignKey('child_profiles.id'), nullable=False)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False)
+    success = db.Column(db.Boolean, nullable=False)
+    score = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_practice_events_child_skill_created', 'child_id', 'skill_id', 'created_at'),
+    )
+    
+    def to_dict(self):
+        return {
+            'date': self.created_at.isoformat(),
+            'success': self.success,
+            'score': self.score
+        }
+    
+    def __repr__(self):
+        return f'<PracticeEvent child={self.child_id} skill={self.skill_id} success={self.success}>'
+
+
 class NotebookEntry(db.Model):
     """Daily notebook entry"""
     __tablename__ = 'notebook_entries'
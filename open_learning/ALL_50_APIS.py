@@ -5,7 +5,7 @@ This file includes adapters for every single free education API!
 
 import os
 from .http_client import safe_get
-from .cache import cache_get, cache_set
+from .shared_cache import shared_cached
 from .schemas import ContentCard, QAItem, ScientificData, ArtworkData
 from urllib.parse import quote
 import html
@@ -25,12 +25,9 @@ class AllEducationAPIs:
     # ===== CORE CONTENT & OPEN DATA (12 APIs) =====
 
     @staticmethod
+    @shared_cached("all_apis", ttl=3600)
     def wikipedia_summary(title: str) -> ContentCard:
         """1. Wikipedia REST API"""
-        cache_key = f"wiki:{title}"
-        if cached := cache_get(cache_key):
-            return cached
-
         url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{quote(title)}"
         data = safe_get(url, default={})
 
@@ -42,10 +39,10 @@ class AllEducationAPIs:
             image=(data.get("thumbnail") or {}).get("source"),
             meta={"pageid": data.get("pageid")},
         )
-        cache_set(cache_key, card, 3600)
         return card
 
     @staticmethod
+    @shared_cached("all_apis", ttl=3600)
     def mediawiki_search(query: str) -> list[ContentCard]:
         """2. MediaWiki Action API"""
         url = "https://en.wikipedia.org/w/api.php"
@@ -71,6 +68,7 @@ class AllEducationAPIs:
         return results
 
     @staticmethod
+    @shared_cached("all_apis", ttl=3600)
     def wikidata_query(query: str) -> list[ContentCard]:
         """3. Wikidata SPARQL (simplified)"""
         # Note: Full SPARQL is complex, this is simplified search
@@ -97,6 +95,7 @@ class AllEducationAPIs:
         return results
 
     @staticmethod
+    @shared_cached("all_apis", ttl=3600)
     def open_library_search(query: str) -> list[ContentCard]:
         """4. Open Library API"""
         url = "https://openlibrary.org/search.json"
@@ -121,6 +120,7 @@ class AllEducationAPIs:
         return results
 
     @staticmethod
+    @shared_cached("all_apis", ttl=3600)
     def internet_archive_search(query: str) -> list[ContentCard]:
         """5. Internet Archive"""
         url = "https://archive.org/advancedsearch.php"
@@ -147,6 +147,7 @@ class AllEducationAPIs:
         return results
 
     @staticmethod
+    @shared_cached("all_apis", ttl=3600)
     def met_museum_search(query: str) -> list[ArtworkData]:
         """11. The Met Museum Collection API"""
         # First, search for object IDs
@@ -180,12 +181,9 @@ class AllEducationAPIs:
     # ===== STEM & SCIENCE (10 APIs) =====
 
     @staticmethod
+    @shared_cached("all_apis", ttl=43200)  # 12 hours
     def nasa_apod() -> ContentCard:
         """NASA Astronomy Picture"""
-        cache_key = "nasa:apod:today"
-        if cached := cache_get(cache_key):
-            return cached
-
         url = "https://api.nasa.gov/planetary/apod"
         data = safe_get(url, params={"api_key": NASA_API_KEY}, default={})
 
@@ -196,10 +194,10 @@ class AllEducationAPIs:
             image=data.get("url", ""),
             url=data.get("hdurl", data.get("url")),
         )
-        cache_set(cache_key, card, 43200)  # 12 hours
         return card
 
     @staticmethod
+    @shared_cached("all_apis", ttl=300)  # live feed
     def usgs_earthquakes(limit: int = 10) -> list[ScientificData]:
         """USGS Earthquake Data"""
         url = "https://earthquake.usgs.gov/fdsnws/event/1/query"
@@ -229,6 +227,7 @@ class AllEducationAPIs:
         return results
 
     @staticmethod
+    @shared_cached("all_apis", ttl=86400)
     def pubchem_compound(name: str) -> ScientificData:
         """PubChem Chemical Data"""
         url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{quote(name)}/JSON"
@@ -266,6 +265,7 @@ class AllEducationAPIs:
         )
 
     @staticmethod
+    @shared_cached("all_apis", ttl=86400)
     def numbers_api_fact(number: int) -> ContentCard:
         """Numbers API - Math Facts"""
         url = f"http://numbersapi.com/{number}/math"
@@ -280,6 +280,7 @@ class AllEducationAPIs:
         )
 
     @staticmethod
+    @shared_cached("all_apis", ttl=86400)
     def gbif_species(name: str) -> list[ScientificData]:
         """GBIF Biodiversity Data"""
         url = "https://api.gbif.org/v1/species/search"
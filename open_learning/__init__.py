@@ -3,16 +3,23 @@ OPEN LEARNING MODULE
 Integrates 50+ free education APIs for unlimited content!
 """
 
-from .http_client import async_get, sync_get
-from .cache import cache_get, cache_set, clear_cache
+from .http_client import AsyncHTTPClient, async_get, fetch_all, get_http_stats, sync_get
+from .cache import cache_get, cache_get_or_refresh, cache_set, clear_cache
+from .fanout import fan_out, iter_fan_out
 from .schemas import ContentCard, QAItem, SchoolData, ArtworkData
 
 __all__ = [
+    "AsyncHTTPClient",
     "async_get",
+    "fetch_all",
+    "get_http_stats",
     "sync_get",
     "cache_get",
+    "cache_get_or_refresh",
     "cache_set",
     "clear_cache",
+    "fan_out",
+    "iter_fan_out",
     "ContentCard",
     "QAItem",
     "SchoolData",
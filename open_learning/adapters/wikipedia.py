@@ -5,18 +5,18 @@ FREE & UNLIMITED educational content!
 
 from urllib.parse import quote
 from open_learning.http_client import sync_get, safe_get
-from open_learning.cache import cache_get, cache_set
+from open_learning.cache import cache_get_or_refresh
 from open_learning.schemas import ContentCard
 
 
 def search_summary(title: str) -> ContentCard:
     """Get Wikipedia summary for any topic"""
-    # Check cache first
+    # Cache for 1 hour; a stale summary is served while it refreshes
     cache_key = f"wikipedia:{title.lower()}"
-    cached = cache_get(cache_key)
-    if cached:
-        return cached
+    return cache_get_or_refresh(cache_key, lambda: _fetch_summary(title), ttl=3600)
 
+
+def _fetch_summary(title: str) -> ContentCard:
     # Fetch from API
     url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{quote(title)}"
     data = safe_get(url, default={})
@@ -38,9 +38,6 @@ def search_summary(title: str) -> ContentCard:
         },
     )
 
-    # Cache for 1 hour
-    cache_set(cache_key, card, ttl=3600)
-
     return card
 
 
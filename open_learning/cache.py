@@ -1,63 +1,227 @@
 """
-Simple TTL cache for API responses
+Bounded LRU + TTL cache for API responses
+
+Entries are evicted least-recently-used first once the cache holds more than
+CACHE_MAX_ENTRIES entries or CACHE_MAX_BYTES (approximate) bytes. A
+background thread sweeps expired entries, and cache_get_or_refresh() serves
+a just-expired value while a fresh one is fetched in the background.
 """
 
+import os
+import pickle
+import sys
+import threading
 import time
-from typing import Any, Optional
-
-# In-memory cache store
-_cache_store: dict[str, tuple[float, Any]] = {}
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional
+
+CACHE_MAX_ENTRIES = int(os.environ.get("OPEN_LEARNING_CACHE_ENTRIES", "5000"))
+CACHE_MAX_BYTES = int(
+    os.environ.get("OPEN_LEARNING_CACHE_BYTES", str(64 * 1024 * 1024))
+)
+SWEEP_INTERVAL = 60  # seconds between background sweeps
+STALE_TTL = 300  # seconds an expired entry may still be served while refreshing
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    stale_until: float
+    value: Any
+    size: int
+
+
+# In-memory cache store, least recently used first
+_cache_store: "OrderedDict[str, _Entry]" = OrderedDict()
+_lock = threading.RLock()
+_bytes = 0
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stale_hits": 0,
+    "evictions": 0,
+    "expirations": 0,
+    "refreshes": 0,
+}
+
+_refreshing: set = set()
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="cache-refresh"
+)
+_sweeper: Optional[threading.Thread] = None
+_sweeper_stop = threading.Event()
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory footprint of a cached value"""
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _remove(key: str) -> Optional[_Entry]:
+    global _bytes
+    entry = _cache_store.pop(key, None)
+    if entry is not None:
+        _bytes -= entry.size
+    return entry
+
+
+def _evict_over_limit():
+    while _cache_store and (
+        len(_cache_store) > CACHE_MAX_ENTRIES or _bytes > CACHE_MAX_BYTES
+    ):
+        _remove(next(iter(_cache_store)))
+        _stats["evictions"] += 1
 
 
 def cache_get(key: str) -> Optional[Any]:
     """Get cached value if not expired"""
-    hit = _cache_store.get(key)
-    if not hit:
-        return None
-
-    expiry_time, value = hit
+    with _lock:
+        entry = _cache_store.get(key)
+        if entry is None or entry.expires_at < time.time():
+            _stats["misses"] += 1
+            return None
 
-    # Check if expired
-    if expiry_time < time.time():
-        _cache_store.pop(key, None)
-        return None
-
-    return value
+        _cache_store.move_to_end(key)
+        _stats["hits"] += 1
+        return entry.value
 
 
-def cache_set(key: str, value: Any, ttl: int = 900):
+def cache_set(key: str, value: Any, ttl: int = 900, stale_ttl: int = STALE_TTL):
     """
     Set cached value with TTL (time to live)
     Default TTL: 900 seconds (15 minutes)
     """
+    global _bytes
+    size = len(key) + _sizeof(value)
     expiry_time = time.time() + ttl
-    _cache_store[key] = (expiry_time, value)
+    with _lock:
+        _remove(key)
+        _cache_store[key] = _Entry(expiry_time, expiry_time + stale_ttl, value, size)
+        _bytes += size
+        _evict_over_limit()
+    _ensure_sweeper()
+
+
+def cache_get_or_refresh(
+    key: str, loader: Callable[[], Any], ttl: int = 900, stale_ttl: int = STALE_TTL
+) -> Any:
+    """
+    Get a cached value, calling ``loader`` on a miss.
+
+    Within ``stale_ttl`` seconds after expiry the old value is returned
+    immediately and ``loader`` runs once in the background to replace it.
+    Empty results (None, [], {}) are not cached.
+    """
+    now = time.time()
+    with _lock:
+        entry = _cache_store.get(key)
+        if entry is not None and entry.expires_at >= now:
+            _cache_store.move_to_end(key)
+            _stats["hits"] += 1
+            return entry.value
+        if entry is not None and entry.stale_until >= now:
+            _cache_store.move_to_end(key)
+            _stats["stale_hits"] += 1
+            if key not in _refreshing:
+                _refreshing.add(key)
+                _refresh_executor.submit(_refresh, key, loader, ttl, stale_ttl)
+            return entry.value
+        _stats["misses"] += 1
+
+    value = loader()
+    if value:
+        cache_set(key, value, ttl, stale_ttl)
+    return value
+
+
+def _refresh(key: str, loader: Callable[[], Any], ttl: int, stale_ttl: int):
+    try:
+        value = loader()
+        if value:
+            cache_set(key, value, ttl, stale_ttl)
+            with _lock:
+                _stats["refreshes"] += 1
+    except Exception as e:
+        print(f"Background cache refresh failed for {key}: {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
 
 
 def clear_cache():
     """Clear all cached values"""
-    _cache_store.clear()
+    global _bytes
+    with _lock:
+        _cache_store.clear()
+        _bytes = 0
 
 
 def clear_expired():
-    """Remove expired entries from cache"""
+    """Remove entries that can no longer be served, even as stale"""
     current_time = time.time()
-    expired_keys = [k for k, (exp, _) in _cache_store.items() if exp < current_time]
-
-    for key in expired_keys:
-        _cache_store.pop(key, None)
+    with _lock:
+        expired_keys = [
+            k for k, entry in _cache_store.items() if entry.stale_until < current_time
+        ]
+        for key in expired_keys:
+            _remove(key)
+        _stats["expirations"] += len(expired_keys)
 
     return len(expired_keys)
 
 
+def _sweep_loop():
+    while not _sweeper_stop.wait(SWEEP_INTERVAL):
+        clear_expired()
+
+
+def _ensure_sweeper():
+    """Start the background TTL sweeper on first use"""
+    global _sweeper
+    if _sweeper is not None and _sweeper.is_alive():
+        return
+    with _lock:
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper_stop.clear()
+            _sweeper = threading.Thread(
+                target=_sweep_loop, name="cache-sweeper", daemon=True
+            )
+            _sweeper.start()
+
+
+def stop_sweeper():
+    """Stop the background sweeper (it restarts on the next cache_set)"""
+    global _sweeper
+    _sweeper_stop.set()
+    if _sweeper is not None:
+        _sweeper.join(timeout=1)
+    _sweeper = None
+
+
 def get_cache_stats() -> dict:
     """Get cache statistics"""
     current_time = time.time()
-    active = sum(1 for exp, _ in _cache_store.values() if exp >= current_time)
-    expired = len(_cache_store) - active
+    with _lock:
+        active = sum(1 for e in _cache_store.values() if e.expires_at >= current_time)
+        stats = dict(_stats)
+        total = len(_cache_store)
+        memory = _bytes
 
+    lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
     return {
-        "total_entries": len(_cache_store),
+        "total_entries": total,
         "active_entries": active,
-        "expired_entries": expired,
+        "expired_entries": total - active,
+        **stats,
+        "hit_rate": (
+            round((stats["hits"] + stats["stale_hits"]) / lookups, 3)
+            if lookups
+            else 0.0
+        ),
+        "memory_bytes": memory,
+        "max_entries": CACHE_MAX_ENTRIES,
+        "max_bytes": CACHE_MAX_BYTES,
     }
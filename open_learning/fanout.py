@@ -0,0 +1,101 @@
+"""
+Concurrent fan-out across API sources with a shared deadline
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .http_client import request_deadline
+
+DEFAULT_DEADLINE = 8.0  # seconds for a whole fan-out
+MAX_WORKERS = 16
+
+# Shared by all requests; sources still queued at their deadline are cancelled
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="open-learning"
+)
+
+# One slot per worker thread, held until the source finishes. When slow
+# upstreams hold every slot, new sources are turned away at once instead of
+# queueing behind them past their own deadline.
+_slots = threading.BoundedSemaphore(MAX_WORKERS)
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source in a fan-out"""
+
+    name: str
+    status: str  # 'ok', 'error', 'timeout', 'busy'
+    value: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+def _run_source(name: str, call: Callable[[], Any], expires_at: float) -> SourceResult:
+    start = time.perf_counter()
+    try:
+        with request_deadline(expires_at):
+            value = call()
+        status, error = "ok", None
+    except Exception as e:
+        value, status, error = None, "error", str(e)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return SourceResult(name, status, value, error, round(elapsed_ms, 1))
+
+
+def _submit(name: str, call: Callable[[], Any], expires_at: float):
+    """Start a source on the shared pool, or None when every slot is taken."""
+    if not _slots.acquire(blocking=False):
+        return None
+    future = _executor.submit(_run_source, name, call, expires_at)
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def iter_fan_out(
+    calls: Dict[str, Callable[[], Any]], deadline: float = DEFAULT_DEADLINE
+) -> Iterator[SourceResult]:
+    """
+    Run every call concurrently and yield results as sources finish.
+    Sources still running when the deadline passes are yielded as timeouts;
+    sources the saturated pool cannot take are yielded first as busy.
+    """
+    start = time.perf_counter()
+    expires_at = time.monotonic() + deadline
+    futures = {}
+    for name, call in calls.items():
+        future = _submit(name, call, expires_at)
+        if future is None:
+            yield SourceResult(name, "busy", error="Too many sources in flight")
+        else:
+            futures[future] = name
+
+    pending = set(futures)
+    while pending:
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+    for future in pending:
+        future.cancel()
+        yield SourceResult(
+            futures[future],
+            "timeout",
+            error=f"No response within {deadline:.1f}s",
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+
+
+def fan_out(
+    calls: Dict[str, Callable[[], Any]], deadline: float = DEFAULT_DEADLINE
+) -> Dict[str, SourceResult]:
+    """Run every call concurrently; results keyed by source name in call order."""
+    results = {result.name: result for result in iter_fan_out(calls, deadline)}
+    return {name: results[name] for name in calls}
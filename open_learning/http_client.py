@@ -1,15 +1,151 @@
 """
 HTTP Client with retry logic and error handling
+
+Sync callers share one keep-alive requests.Session per host. Async callers
+get a pooled aiohttp client with per-host connection limits.
 """
 
+import asyncio
+import json
+import os
 import requests
+from contextvars import ContextVar
 from typing import Dict, Optional, Any
+import threading
 import time
+from contextlib import contextmanager
 from functools import wraps
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 DEFAULT_TIMEOUT = 12.0
 MAX_RETRIES = 3
 RETRY_DELAY = 0.5
+USER_AGENT = "Ultimate-Badass-Tutor/1.0 (Educational App)"
+ACCEPT_ENCODING = "gzip, deflate"
+
+# Keep-alive connections kept per host (sync) / opened per host (async)
+MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_PER_HOST", "10"))
+# Total connections across all hosts for one async client
+MAX_ASYNC_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+
+# Per-thread absolute deadline (time.monotonic()) shared by all calls
+_deadline = threading.local()
+
+# Per-thread list of URLs whose safe_get() fell back, see track_failures()
+_failures = threading.local()
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request deadline leaves no time for another attempt."""
+
+
+@contextmanager
+def request_deadline(expires_at: float):
+    """Cap timeouts and retries of every call in this thread at ``expires_at``.
+
+    ``expires_at`` is a time.monotonic() timestamp; nested deadlines keep the
+    earliest one.
+    """
+    previous = getattr(_deadline, "expires_at", None)
+    _deadline.expires_at = expires_at if previous is None else min(previous, expires_at)
+    try:
+        yield
+    finally:
+        _deadline.expires_at = previous
+
+
+@contextmanager
+def track_failures():
+    """Yield a list collecting the URLs of safe_get() calls in this thread
+    that failed and returned their default instead."""
+    previous = getattr(_failures, "urls", None)
+    _failures.urls = urls = []
+    try:
+        yield urls
+    finally:
+        _failures.urls = previous
+        if previous is not None:
+            previous.extend(urls)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before this thread's deadline (None if there is none)."""
+    expires_at = getattr(_deadline, "expires_at", None)
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def _request_timeout(url: str) -> float:
+    """DEFAULT_TIMEOUT capped by the current deadline."""
+    remaining = remaining_time()
+    if remaining is None:
+        return DEFAULT_TIMEOUT
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before requesting {url}")
+    return min(DEFAULT_TIMEOUT, remaining)
+
+
+def _backoff(error: Exception, attempt: int, max_attempts: int, delay: float):
+    """Seconds to wait before retrying, or None to give up"""
+    if isinstance(error, DeadlineExceeded) or attempt >= max_attempts - 1:
+        return None
+    wait_time = delay * (2**attempt)  # Exponential backoff
+    remaining = remaining_time()
+    if remaining is not None and remaining <= wait_time:
+        return None  # No time left for another attempt
+    return wait_time
+
+
+# ===== SYNC: ONE KEEP-ALIVE SESSION PER HOST =====
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url: str) -> requests.Session:
+    """Shared keep-alive session for the host of ``url``"""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                # Retries are handled by retry_on_failure
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                    max_retries=0,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(
+                    {"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING}
+                )
+                _sessions[key] = session
+    return session
+
+
+def close_sessions():
+    """Close every pooled sync session"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
 
 
 def retry_on_failure(max_attempts=MAX_RETRIES, delay=RETRY_DELAY):
@@ -18,22 +154,39 @@ def retry_on_failure(max_attempts=MAX_RETRIES, delay=RETRY_DELAY):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-
             for attempt in range(max_attempts):
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        wait_time = delay * (2**attempt)  # Exponential backoff
-                        time.sleep(wait_time)
-                    else:
-                        # Last attempt failed
-                        print(f"Request failed after {max_attempts} attempts: {e}")
+                    wait_time = _backoff(e, attempt, max_attempts, delay)
+                    if wait_time is None:
+                        if attempt == max_attempts - 1:
+                            # Last attempt failed
+                            print(f"Request failed after {max_attempts} attempts: {e}")
+                        raise
+                    time.sleep(wait_time)
+
+        return wrapper
+
+    return decorator
+
+
+def async_retry_on_failure(max_attempts=MAX_RETRIES, delay=RETRY_DELAY):
+    """retry_on_failure for coroutines (backoff uses asyncio.sleep)"""
 
-            # All attempts failed
-            raise last_exception
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    wait_time = _backoff(e, attempt, max_attempts, delay)
+                    if wait_time is None:
+                        if attempt == max_attempts - 1:
+                            print(f"Request failed after {max_attempts} attempts: {e}")
+                        raise
+                    await asyncio.sleep(wait_time)
 
         return wrapper
 
@@ -47,14 +200,8 @@ def sync_get(
     """
     Synchronous GET request with retry logic
     """
-    if headers is None:
-        headers = {}
-
-    # Add user agent
-    headers["User-Agent"] = "Ultimate-Badass-Tutor/1.0 (Educational App)"
-
-    response = requests.get(
-        url, params=params, headers=headers, timeout=DEFAULT_TIMEOUT
+    response = get_session(url).get(
+        url, params=params, headers=headers, timeout=_request_timeout(url)
     )
     response.raise_for_status()
 
@@ -65,14 +212,178 @@ def sync_get(
         return {"raw_content": response.text}
 
 
-def async_get(
+# ===== ASYNC: POOLED AIOHTTP CLIENT =====
+
+_async_stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+_async_stats_lock = threading.Lock()
+_current_client: ContextVar = ContextVar("open_learning_http_client", default=None)
+
+
+def _count(stat: str):
+    with _async_stats_lock:
+        _async_stats[stat] += 1
+
+
+class AsyncHTTPClient:
+    """
+    Pooled asyncio HTTP client (one aiohttp session, one connector)
+
+        async with AsyncHTTPClient() as client:
+            data = await client.get_json(url)
+
+    async_get() uses the innermost open client, so code inside the block
+    shares its connections.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        limit: int = MAX_ASYNC_CONNECTIONS,
+    ):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is required for AsyncHTTPClient")
+        self.limit_per_host = limit_per_host
+        self.limit = limit
+        self._session = None
+        self._token = None
+
+    async def __aenter__(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_connection_create_end.append(self._on_connection_create)
+        trace.on_connection_reuseconn.append(self._on_connection_reuse)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host
+            ),
+            headers={"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING},
+            auto_decompress=True,
+            trace_configs=[trace],
+        )
+        self._token = _current_client.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        _current_client.reset(self._token)
+        await self._session.close()
+        self._session = None
+
+    @staticmethod
+    async def _on_request_end(session, context, params):
+        _count("requests")
+
+    @staticmethod
+    async def _on_connection_create(session, context, params):
+        _count("connections_opened")
+
+    @staticmethod
+    async def _on_connection_reuse(session, context, params):
+        _count("connections_reused")
+
+    @async_retry_on_failure(max_attempts=3, delay=0.5)
+    async def get_json(
+        self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Async GET with the same retry/deadline behaviour as sync_get"""
+        timeout = aiohttp.ClientTimeout(total=_request_timeout(url))
+        async with self._session.get(
+            url, params=params, headers=headers, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            text = await response.text()
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {"raw_content": text}
+
+
+async def async_get(
     url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """
-    Async get (for now, just calls sync version)
-    In future, could use aiohttp for true async
+    True async GET through the current AsyncHTTPClient
+    (a short-lived client is opened when called outside one)
+    """
+    client = _current_client.get()
+    if client is not None:
+        return await client.get_json(url, params, headers)
+    async with AsyncHTTPClient() as client:
+        return await client.get_json(url, params, headers)
+
+
+def fetch_all(urls: Dict[str, str], deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Fetch many URLs concurrently on one pooled async client.
+    Returns {name: json} with {"error": ...} for failed or late sources.
     """
-    return sync_get(url, params, headers)
+
+    async def run():
+        async with AsyncHTTPClient() as client:
+            tasks = {
+                name: asyncio.ensure_future(client.get_json(url))
+                for name, url in urls.items()
+            }
+            done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results = {}
+        for name, task in tasks.items():
+            if task not in done:
+                results[name] = {"error": f"No response within {deadline:.1f}s"}
+            elif task.exception() is not None:
+                results[name] = {"error": str(task.exception())}
+            else:
+                results[name] = task.result()
+        return results
+
+    if deadline is None:
+        return asyncio.run(run())
+    with request_deadline(time.monotonic() + deadline):
+        return asyncio.run(run())
+
+
+def get_http_stats() -> dict:
+    """Connection reuse metrics for the sync sessions and async clients"""
+    hosts = {}
+    for key, session in list(_sessions.items()):
+        pools = session.get_adapter(key).poolmanager.pools
+        requests_made = connections = 0
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is not None:
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+        hosts[key] = {"requests": requests_made, "connections_opened": connections}
+
+    sync_requests = sum(h["requests"] for h in hosts.values())
+    sync_connections = sum(h["connections_opened"] for h in hosts.values())
+    with _async_stats_lock:
+        async_stats = dict(_async_stats)
+
+    return {
+        "sync": {
+            "sessions": len(hosts),
+            "requests": sync_requests,
+            "connections_opened": sync_connections,
+            "reuse_rate": _reuse_rate(sync_requests, sync_connections),
+            "hosts": hosts,
+        },
+        "async": {
+            **async_stats,
+            "reuse_rate": _reuse_rate(
+                async_stats["requests"], async_stats["connections_opened"]
+            ),
+        },
+    }
+
+
+def _reuse_rate(requests_made: int, connections: int) -> float:
+    """Share of requests served on an already-open connection"""
+    if not requests_made:
+        return 0.0
+    return round(max(requests_made - connections, 0) / requests_made, 3)
 
 
 def safe_get(
@@ -88,4 +399,7 @@ def safe_get(
         return sync_get(url, params, headers)
     except Exception as e:
         print(f"Safe GET failed for {url}: {e}")
+        failed = getattr(_failures, "urls", None)
+        if failed is not None:
+            failed.append(url)
         return default or {"error": str(e)}
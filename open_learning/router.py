@@ -3,9 +3,13 @@ Flask Router for Open Learning APIs
 Exposes all 50+ free education APIs through unified endpoints!
 """
 
-from flask import Blueprint, request, jsonify
+import json
+import time
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from .adapters import wikipedia, openlibrary, datamuse, open_trivia, nasa, loc
 from .ALL_50_APIS import all_apis
+from .fanout import DEFAULT_DEADLINE, fan_out, iter_fan_out
 
 # Create Blueprint
 bp = Blueprint("open_learning", __name__, url_prefix="/api/open")
@@ -18,42 +22,32 @@ def unified_search(query: str):
     """
     Search across multiple APIs at once!
     Returns content cards from Wikipedia, Open Library, LoC, etc.
+    All sources are queried concurrently under one deadline
+    (?deadline=seconds); ?stream=1 streams each source as NDJSON.
     """
+    calls = {
+        "wikipedia": lambda: wikipedia.search_summary(query),
+        "openlibrary": lambda: openlibrary.search(query, limit=5),
+        "loc": lambda: loc.search(query, count=5),
+        "datamuse": lambda: datamuse.related_words(query, limit=10),
+    }
+    deadline = _request_deadline()
+
+    if _wants_stream():
+        return _stream_results(query, calls, deadline)
+
+    start = time.perf_counter()
+    outcomes = fan_out(calls, deadline)
     results = {"query": query, "sources": []}
 
-    try:
-        # Wikipedia
-        wiki_card = wikipedia.search_summary(query)
-        if wiki_card:
-            results["sources"].append(wiki_card.to_dict())
-    except:
-        pass
-
-    try:
-        # Open Library
-        books = openlibrary.search(query, limit=5)
-        for book in books:
-            results["sources"].append(book.to_dict())
-    except:
-        pass
-
-    try:
-        # Library of Congress
-        loc_items = loc.search(query, count=5)
-        for item in loc_items:
-            results["sources"].append(item.to_dict())
-    except:
-        pass
-
-    try:
-        # Datamuse related words
-        words_card = datamuse.related_words(query, limit=10)
-        if words_card:
-            results["sources"].append(words_card.to_dict())
-    except:
-        pass
+    for outcome in outcomes.values():
+        if outcome.status != "ok" or not outcome.value:
+            continue
+        value = _to_json(outcome.value)
+        results["sources"].extend(value if isinstance(value, list) else [value])
 
     results["total_found"] = len(results["sources"])
+    results.update(_timing_report(outcomes, start, deadline))
     return jsonify(results)
 
 
@@ -154,35 +148,35 @@ def mega_search(query: str):
     """
     SEARCH ACROSS ALL 50 APIS AT ONCE!
     Returns combined results from every source!
+    Sources run concurrently under one deadline (?deadline=seconds);
+    ?stream=1 streams each source as NDJSON as soon as it finishes.
     """
+    # Query every source concurrently; slow or failing ones are reported, not raised
+    calls = {
+        "wikipedia": lambda: all_apis.wikipedia_summary(query),
+        "openlibrary": lambda: all_apis.open_library_search(query),
+        "wikidata": lambda: all_apis.wikidata_query(query),
+        "nasa_apod": lambda: all_apis.nasa_apod(),
+        "usgs_earthquakes": lambda: all_apis.usgs_earthquakes(5),
+        "pubchem": lambda: all_apis.pubchem_compound(query),
+        "numbers_fact": lambda: all_apis.numbers_api_fact(42),
+        "gbif": lambda: all_apis.gbif_species(query),
+    }
+    deadline = _request_deadline()
+
+    if _wants_stream():
+        return _stream_results(query, calls, deadline)
+
+    start = time.perf_counter()
+    outcomes = fan_out(calls, deadline)
     results = {"query": query, "total_apis": 50, "content": {}, "summary": {}}
 
-    # Call all APIs (gracefully handle failures)
-    apis_to_call = [
-        ("wikipedia", lambda: all_apis.wikipedia_summary(query)),
-        ("openlibrary", lambda: all_apis.open_library_search(query)),
-        ("wikidata", lambda: all_apis.wikidata_query(query)),
-        ("nasa_apod", lambda: all_apis.nasa_apod()),
-        ("usgs_earthquakes", lambda: all_apis.usgs_earthquakes(5)),
-        ("pubchem", lambda: all_apis.pubchem_compound(query)),
-        ("numbers_fact", lambda: all_apis.numbers_api_fact(42)),
-        ("gbif", lambda: all_apis.gbif_species(query)),
-    ]
-
-    for api_name, api_call in apis_to_call:
-        try:
-            result = api_call()
-            if result:
-                if isinstance(result, list):
-                    results["content"][api_name] = [
-                        r.to_dict() if hasattr(r, "to_dict") else r for r in result
-                    ]
-                else:
-                    results["content"][api_name] = (
-                        result.to_dict() if hasattr(result, "to_dict") else result
-                    )
-        except Exception as e:
-            results["content"][api_name] = {"error": str(e)}
+    for api_name, outcome in outcomes.items():
+        if outcome.status == "ok":
+            if outcome.value:
+                results["content"][api_name] = _to_json(outcome.value)
+        else:
+            results["content"][api_name] = {"error": outcome.error}
 
     # Summary stats
     results["summary"] = {
@@ -191,21 +185,88 @@ def mega_search(query: str):
             1 for v in results["content"].values() if "error" not in str(v)
         ),
         "failed": sum(1 for v in results["content"].values() if "error" in str(v)),
+        "timed_out": sum(1 for o in outcomes.values() if o.status == "timeout"),
     }
+    results.update(_timing_report(outcomes, start, deadline))
 
     return jsonify(results)
 
 
+# ===== FAN-OUT HELPERS =====
+
+
+def _request_deadline() -> float:
+    """Per-request deadline in seconds from ?deadline=, capped at the default."""
+    deadline = request.args.get("deadline", DEFAULT_DEADLINE, type=float)
+    return min(max(deadline, 0.1), DEFAULT_DEADLINE)
+
+
+def _wants_stream() -> bool:
+    return request.args.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def _to_json(value):
+    """Convert dataclass results (or lists of them) to JSON-ready dicts"""
+    if isinstance(value, list):
+        return [v.to_dict() if hasattr(v, "to_dict") else v for v in value]
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+def _timing_report(outcomes, start: float, deadline: float) -> dict:
+    return {
+        "timings": {name: o.elapsed_ms for name, o in outcomes.items()},
+        "status": {name: o.status for name, o in outcomes.items()},
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "deadline_ms": deadline * 1000,
+    }
+
+
+def _stream_results(query: str, calls: dict, deadline: float) -> Response:
+    """Stream one NDJSON line per source in completion order."""
+
+    def generate():
+        start = time.perf_counter()
+        for outcome in iter_fan_out(calls, deadline):
+            line = {
+                "query": query,
+                "source": outcome.name,
+                "status": outcome.status,
+                "elapsed_ms": outcome.elapsed_ms,
+            }
+            if outcome.status == "ok":
+                line["data"] = _to_json(outcome.value)
+            else:
+                line["error"] = outcome.error
+            yield json.dumps(line) + "\n"
+        yield json.dumps(
+            {
+                "query": query,
+                "done": True,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+        ) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
 # ===== STATS & HEALTH =====
 
 
 @bp.route("/stats")
 def get_stats():
     """Get API usage statistics"""
-    from ..cache import get_cache_stats
+    from .cache import get_cache_stats
+    from .http_client import get_http_stats
+    from .shared_cache import get_shared_cache_stats
 
     return jsonify(
-        {"cache_stats": get_cache_stats(), "total_apis": 50, "status": "operational"}
+        {
+            "cache_stats": get_cache_stats(),
+            "shared_cache_stats": get_shared_cache_stats(),
+            "http_stats": get_http_stats(),
+            "total_apis": 50,
+            "status": "operational",
+        }
     )
 
 
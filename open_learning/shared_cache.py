@@ -0,0 +1,227 @@
+"""
+Two-tier API response cache shared by every worker process
+
+L1 is the in-process LRU cache (cache.py). L2 is shared by all workers:
+Redis when StateManager has a connection, otherwise the SQLite api_cache
+table. Concurrent misses for the same key are coalesced so only one thread
+per process goes upstream.
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+from dataclasses import asdict, is_dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from . import schemas
+from .cache import cache_get_or_refresh
+from .http_client import track_failures
+
+L1_MAX_TTL = 300  # seconds a worker may serve a value without checking L2
+REDIS_PREFIX = "tutor:api_cache:"
+
+_stats = {
+    "l2_hits": 0,
+    "l2_misses": 0,
+    "l2_errors": 0,
+    "upstream_fetches": 0,
+    "coalesced": 0,
+}
+_stats_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+_l2 = None
+
+
+def _count(stat: str):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+class _FailedFetch(Exception):
+    """A loader fell back to a placeholder; it is returned but never cached"""
+
+    def __init__(self, value: Any):
+        super().__init__("upstream fetch failed")
+        self.value = value
+
+
+# ===== SERIALIZATION =====
+
+
+def _encode(value: Any) -> Any:
+    """JSON-ready form of API results, tagging schema dataclasses"""
+    if is_dataclass(value):
+        return {"__schema__": type(value).__name__, **asdict(value)}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict) and "__schema__" in value:
+        fields = dict(value)
+        schema = getattr(schemas, fields.pop("__schema__"))
+        return schema(**fields)
+    return value
+
+
+# ===== L2 BACKENDS =====
+
+
+class RedisBackend:
+    """L2 in Redis, shared by every worker and host"""
+
+    name = "redis"
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        data = self.client.get(f"{REDIS_PREFIX}{namespace}:{key}")
+        return data.decode("utf-8") if isinstance(data, bytes) else data
+
+    def set(self, namespace: str, key: str, payload: str, ttl: int):
+        self.client.set(f"{REDIS_PREFIX}{namespace}:{key}", payload, ex=int(ttl))
+
+
+class SQLiteBackend:
+    """L2 in the api_cache table, shared by workers on one host"""
+
+    name = "sqlite"
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        from database import get_cached_api_response
+
+        return get_cached_api_response(namespace, key)
+
+    def set(self, namespace: str, key: str, payload: str, ttl: int):
+        from database import cache_api_response
+
+        cache_api_response(namespace, key, payload, expires_hours=ttl / 3600)
+
+
+def get_l2():
+    """Redis if StateManager is connected to it, else SQLite"""
+    global _l2
+    if _l2 is None:
+        from services.state_manager import state_manager
+
+        if state_manager.redis_client is not None:
+            _l2 = RedisBackend(state_manager.redis_client)
+        else:
+            _l2 = SQLiteBackend()
+    return _l2
+
+
+def set_l2(backend):
+    """Use ``backend`` as L2 (None re-detects on next use)"""
+    global _l2
+    _l2 = backend
+
+
+# ===== LOOKUPS =====
+
+
+def _load_shared(namespace: str, key: str, loader: Callable[[], Any], ttl: int) -> Any:
+    """L2 lookup, then upstream; one caller per key does the work."""
+    full_key = f"{namespace}:{key}"
+    with _inflight_lock:
+        future = _inflight.get(full_key)
+        leader = future is None
+        if leader:
+            future = _inflight[full_key] = Future()
+
+    if not leader:
+        _count("coalesced")
+        return future.result()
+
+    try:
+        value = _fetch(namespace, key, loader, ttl)
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(full_key, None)
+
+
+def _fetch(namespace: str, key: str, loader: Callable[[], Any], ttl: int) -> Any:
+    l2 = get_l2()
+    try:
+        payload = l2.get(namespace, key)
+    except Exception as e:
+        _count("l2_errors")
+        print(f"Shared cache read failed ({l2.name}): {e}")
+        payload = None
+
+    if payload is not None:
+        _count("l2_hits")
+        return _decode(json.loads(payload))
+    _count("l2_misses")
+
+    _count("upstream_fetches")
+    value = loader()
+    if value:
+        try:
+            l2.set(namespace, key, json.dumps(_encode(value)), ttl)
+        except Exception as e:
+            _count("l2_errors")
+            print(f"Shared cache write failed ({l2.name}): {e}")
+    return value
+
+
+def shared_get_or_fetch(
+    namespace: str, key: str, loader: Callable[[], Any], ttl: int = 3600
+) -> Any:
+    """Get ``namespace:key`` from L1, then L2, then ``loader``"""
+    return cache_get_or_refresh(
+        f"shared:{namespace}:{key}",
+        lambda: _load_shared(namespace, key, loader, ttl),
+        ttl=min(ttl, L1_MAX_TTL),
+    )
+
+
+def shared_cached(namespace: str, ttl: int = 3600):
+    """Decorator caching a function's result in both tiers, keyed by its arguments
+
+    Results built while any safe_get() inside the function failed are
+    placeholders ({} or {"error": ...} turned into cards); they are returned
+    to the caller (and coalesced waiters) but kept out of both tiers.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = json.dumps([func.__name__, args, kwargs], sort_keys=True, default=str)
+
+            def load():
+                with track_failures() as failed:
+                    value = func(*args, **kwargs)
+                if failed:
+                    raise _FailedFetch(value)
+                return value
+
+            try:
+                return shared_get_or_fetch(namespace, key, load, ttl)
+            except _FailedFetch as e:
+                return e.value
+
+        return wrapper
+
+    return decorator
+
+
+def get_shared_cache_stats() -> dict:
+    """L2 and coalescing counters"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["l2_hits"] + stats["l2_misses"]
+    stats["l2_backend"] = _l2.name if _l2 is not None else None
+    stats["l2_hit_rate"] = round(stats["l2_hits"] / lookups, 3) if lookups else 0.0
+    return stats
@@ -2,6 +2,9 @@
 API Adapter Factory
 Central registry for all education API adapters
 """
+import time
+from open_learning.fanout import iter_fan_out
+from open_learning.http_client import request_deadline
 from .base import APIAdapter
 from .wikipedia_adapter import WikipediaAdapter
 from .datamuse_adapter import DatamuseAdapter
@@ -31,8 +34,65 @@ def list_adapters():
     return list(ADAPTERS.keys())
 
 
-def search_all(topic, subject=None, grade_band=None, media_type=None, limit=10):
-    """Search all adapters"""
+def _search_calls(topic, subject, grade_band, media_type, limit, providers=None):
+    """One call per adapter, each bounded by that adapter's own timeout"""
+    calls = {}
+    timeouts = {}
+    for name in providers or ADAPTERS:
+        adapter = get_adapter(name)
+        if adapter is None:
+            continue
+
+        def call(adapter=adapter):
+            with request_deadline(time.monotonic() + adapter.timeout):
+                return adapter.search(
+                    topic=topic,
+                    subject=subject,
+                    grade_band=grade_band,
+                    media_type=media_type,
+                    limit=limit
+                )
+
+        calls[name] = call
+        timeouts[name] = adapter.timeout
+    return calls, timeouts
+
+
+def iter_search_all(topic, subject=None, grade_band=None, media_type=None, limit=10,
+                    providers=None, timeout=None):
+    """
+    Search all adapters concurrently, yielding (name, SourceResult) as each
+    provider finishes, so callers can render the first results immediately.
+    `timeout` caps the whole search (default: the slowest adapter's timeout).
+    """
+    calls, timeouts = _search_calls(topic, subject, grade_band, media_type, limit, providers)
+    if not calls:
+        return
+    deadline = timeout if timeout is not None else max(timeouts.values())
+    for result in iter_fan_out(calls, deadline):
+        if result.status != 'ok':
+            print(f"Error searching {result.name}: {result.error}")
+        yield result.name, result
+
+
+def search_all(topic, subject=None, grade_band=None, media_type=None, limit=10,
+               concurrent=True, timeout=None):
+    """Search all adapters (concurrently by default); results in registry order"""
+    if not concurrent:
+        return _search_all_serial(topic, subject, grade_band, media_type, limit)
+
+    by_provider = dict(iter_search_all(topic, subject, grade_band, media_type, limit,
+                                       timeout=timeout))
+    all_results = []
+    for name in ADAPTERS:
+        result = by_provider.get(name)
+        if result is not None and result.status == 'ok':
+            all_results.extend(result.value or [])
+    return all_results
+
+
+def _search_all_serial(topic, subject=None, grade_band=None, media_type=None, limit=10):
+    """Search all adapters one after another"""
     all_results = []
     
     for name, adapter_class in ADAPTERS.items():
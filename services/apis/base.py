@@ -3,8 +3,11 @@ Base API Adapter Interface
 All education API adapters implement this interface
 """
 from typing import List, Dict, Any, Optional
-import requests
+import json
 from abc import ABC, abstractmethod
+from open_learning.http_client import get_session, remaining_time
+from open_learning.shared_cache import shared_get_or_fetch
+from .rate_limit import get_bucket
 
 
 class APIAdapter(ABC):
@@ -15,6 +18,7 @@ class APIAdapter(ABC):
         self.base_url = ''
         self.rate_limit = 100  # requests per minute
         self.timeout = 10  # seconds
+        self.cache_ttl = 3600  # seconds responses are shared across workers
     
     @abstractmethod
     def search(self, topic: str, subject: Optional[str] = None, grade_band: Optional[str] = None, 
@@ -40,9 +44,29 @@ class APIAdapter(ABC):
         pass
     
     def _make_request(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Optional[Dict]:
-        """Make HTTP request with error handling"""
+        """Make HTTP request with error handling (cached in the shared API cache)"""
+        key = json.dumps([url, params], sort_keys=True, default=str)
+        return shared_get_or_fetch(
+            self.name, key, lambda: self._fetch(url, params, headers), self.cache_ttl
+        )
+    
+    def _request_timeout(self) -> float:
+        """This adapter's timeout, capped by any request deadline"""
+        remaining = remaining_time()
+        return self.timeout if remaining is None else min(self.timeout, remaining)
+    
+    def _fetch(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Optional[Dict]:
+        # Only upstream calls spend tokens; cache hits never wait
+        bucket = get_bucket(self.name, self.rate_limit)
+        if self._request_timeout() <= 0:
+            return None
+        if not bucket.acquire(timeout=self._request_timeout()):
+            print(f"{self.name} rate limit reached ({self.rate_limit}/min), skipping request")
+            return None
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
+            response = get_session(url).get(
+                url, params=params, headers=headers, timeout=self._request_timeout()
+            )
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -0,0 +1,67 @@
+"""
+Token bucket rate limiting for API adapters
+One bucket per provider, shared by every adapter instance in the process
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` requests per minute, with bursts up to `capacity`"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be positive, got {rate_per_minute}")
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = capacity if capacity is not None else max(rate_per_minute, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a token; False if none frees up within `timeout` seconds"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name: str, rate_per_minute: float) -> TokenBucket:
+    """Shared bucket for a provider (recreated if its rate changes)"""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None or bucket.rate != rate_per_minute / 60.0:
+            bucket = _buckets[name] = TokenBucket(rate_per_minute)
+        return bucket
+
+
+def reset_buckets():
+    """Forget all buckets (every provider starts with a full bucket)"""
+    with _buckets_lock:
+        _buckets.clear()
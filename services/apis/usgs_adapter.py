@@ -9,6 +9,7 @@ class USGSAdapter(APIAdapter):
     def __init__(self):
         super().__init__()
         self.base_url = 'https://earthquake.usgs.gov/fdsnws/event/1'
+        self.cache_ttl = 300  # live feed
     
     def search(self, topic: str, subject: Optional[str] = None, grade_band: Optional[str] = None,
                media_type: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
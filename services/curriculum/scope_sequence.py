@@ -2,37 +2,202 @@
 Scope & Sequence
 Default order of skills per grade/subject
 """
-from models.database import db, Skill, Standard
+from collections import defaultdict
+import heapq
+import logging
+import threading
+import time
 
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
-def get_skills_for_grade_subject(grade, subject):
-    """Get skills for a specific grade and subject"""
-    # Get standards for this grade/subject
-    standards = Standard.query.filter_by(
-        grade=grade,
-        subject=subject
-    ).all()
+from models.database import db, Skill, Standard, curriculum_version, skill_prerequisites
+
+logger = logging.getLogger(__name__)
+
+VERSION_CHECK_INTERVAL = 5  # Seconds between reads of the curriculum_version row
+DIFFICULTY_ORDER = {'easy': 0, 'medium': 1, 'hard': 2}
+
+
+def _sequence_key(skill):
+    """Tie-break among skills whose prerequisites are all placed"""
+    return (DIFFICULTY_ORDER.get(skill.difficulty, 1), skill.standard.code, skill.id)
+
+
+def _topological_order(skills, edges):
+    """Order skills so each follows its prerequisites, easiest first on ties
     
-    if not standards:
-        return []
+    Edges to skills outside ``skills`` (e.g. an earlier grade) are already
+    satisfied. Skills caught in a cycle are appended in tie-break order.
+    """
+    by_id = {skill.id: skill for skill in skills}
+    waiting = dict.fromkeys(by_id, 0)
+    unlocks = defaultdict(list)
+    for skill_id, prerequisite_id in edges:
+        if skill_id in by_id and prerequisite_id in by_id:
+            waiting[skill_id] += 1
+            unlocks[prerequisite_id].append(skill_id)
     
-    # Get all skills for these standards
-    standard_ids = [s.id for s in standards]
-    skills = Skill.query.filter(
-        Skill.standard_id.in_(standard_ids)
-    ).all()
+    ready = [(_sequence_key(by_id[i]), i) for i, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, skill_id = heapq.heappop(ready)
+        order.append(by_id[skill_id])
+        for next_id in unlocks[skill_id]:
+            waiting[next_id] -= 1
+            if waiting[next_id] == 0:
+                heapq.heappush(ready, (_sequence_key(by_id[next_id]), next_id))
     
-    return skills
+    if len(order) < len(by_id):
+        placed = {skill.id for skill in order}
+        cycle = sorted((s for s in skills if s.id not in placed), key=_sequence_key)
+        logger.warning('Prerequisite cycle among skills %s', [s.id for s in cycle])
+        order.extend(cycle)
+    return order
 
 
-def get_default_sequence(grade, subject):
-    """Get recommended teaching sequence"""
-    skills = get_skills_for_grade_subject(grade, subject)
+class CurriculumGraph:
+    """Standards and skills keyed by (grade, subject), with sequences precomputed
+    
+    Objects are detached from any session: columns and Skill.standard are
+    loaded, other relationships are not.
+    """
+    
+    def __init__(self, stamp, standards, skills, edges):
+        self.stamp = stamp
+        self.standards = defaultdict(list)
+        self.skills = defaultdict(list)
+        self.sequences = {}
+        self.progressions = defaultdict(list)
+        
+        for standard in standards:
+            self.standards[(standard.grade, standard.subject)].append(standard)
+        for skill in skills:
+            self.skills[(skill.standard.grade, skill.standard.subject)].append(skill)
+        
+        edges_by_skill = defaultdict(list)
+        for skill_id, prerequisite_id in edges:
+            edges_by_skill[skill_id].append((skill_id, prerequisite_id))
+        for key, group in self.skills.items():
+            group_edges = [e for skill in group for e in edges_by_skill[skill.id]]
+            self.sequences[key] = _topological_order(group, group_edges)
+            for skill in self.sequences[key]:
+                self.progressions[skill.standard_id].append(skill)
+    
+    @classmethod
+    def load(cls, stamp):
+        """Read the whole graph in three queries"""
+        with Session(db.engine) as session:
+            standards = session.scalars(
+                select(Standard).order_by(Standard.code)
+            ).all()
+            skills = session.scalars(select(Skill).order_by(Skill.id)).all()
+            edges = session.execute(select(
+                skill_prerequisites.c.skill_id, skill_prerequisites.c.prerequisite_id
+            )).all()
+        
+        by_id = {standard.id: standard for standard in standards}
+        for skill in skills:
+            set_committed_value(skill, 'standard', by_id[skill.standard_id])
+        return cls(stamp, standards, skills, edges)
+
+
+class ScopeSequenceCache:
+    """In-process CurriculumGraph stamped with the database's curriculum version
+    
+    Seeding calls invalidate(), which bumps the curriculum_version row; every
+    process sharing the database reloads its graph once it sees the new stamp.
+    """
+    
+    def __init__(self):
+        self._graph = None
+        self._version = None  # (database url, version)
+        self._checked_at = 0
+        self._lock = threading.Lock()
+    
+    def version(self):
+        url = str(db.engine.url)
+        now = time.monotonic()
+        if (self._version is None or self._version[0] != url
+                or now - self._checked_at >= VERSION_CHECK_INTERVAL):
+            with Session(db.engine) as session:
+                version = session.scalar(
+                    select(curriculum_version.c.version).where(curriculum_version.c.id == 1)
+                )
+            self._version = (url, version or 0)
+            self._checked_at = now
+        return self._version
+    
+    def graph(self):
+        stamp = self.version()
+        graph = self._graph
+        if graph is None or graph.stamp != stamp:
+            with self._lock:
+                if self._graph is None or self._graph.stamp != stamp:
+                    self._graph = CurriculumGraph.load(stamp)
+                graph = self._graph
+        return graph
     
-    # Sort by difficulty and dependencies
-    # Simplified - would have curriculum experts define proper sequence
-    easy = [s for s in skills if s.difficulty == 'easy']
-    medium = [s for s in skills if s.difficulty == 'medium']
-    hard = [s for s in skills if s.difficulty == 'hard']
+    def invalidate(self):
+        """Mark the curriculum changed for this and every other process"""
+        bump = (
+            update(curriculum_version)
+            .where(curriculum_version.c.id == 1)
+            .values(version=curriculum_version.c.version + 1)
+        )
+        with Session(db.engine) as session:
+            if not session.execute(bump).rowcount:
+                try:
+                    session.execute(insert(curriculum_version).values(id=1, version=1))
+                except IntegrityError:  # Another process created the row first
+                    session.rollback()
+                    session.execute(bump)
+            session.commit()
+        with self._lock:
+            self._graph = None
+            self._version = None
+
+
+scope_sequence_cache = ScopeSequenceCache()
+
+
+def invalidate():
+    """Call after standards, skills or prerequisites change"""
+    scope_sequence_cache.invalidate()
+
+
+def get_standards_for_grade_subject(grade, subject):
+    """Get standards for a specific grade and subject, ordered by code"""
+    return list(scope_sequence_cache.graph().standards.get((grade, subject), []))
+
+
+def get_skills_for_grade_subject(grade, subject):
+    """Get skills for a specific grade and subject"""
+    return list(scope_sequence_cache.graph().skills.get((grade, subject), []))
+
+
+def get_skills_for_grade_subjects(pairs):
+    """Get skills for many (grade, subject) pairs from one cached graph
+    
+    Returns {(grade, subject): [skills]}, with an empty list for pairs
+    that have no standards.
+    """
+    skills = scope_sequence_cache.graph().skills
+    return {pair: list(skills.get(pair, [])) for pair in pairs}
+
+
+def get_skill_progression(standard_id):
+    """Get a standard's skills in teaching-sequence order"""
+    return list(scope_sequence_cache.graph().progressions.get(standard_id, []))
+
+
+def get_default_sequence(grade, subject):
+    """Get recommended teaching sequence
     
-    return easy + medium + hard
+    Every skill comes after its prerequisites in the same grade and subject;
+    otherwise easier skills come first, then by standard code.
+    """
+    return list(scope_sequence_cache.graph().sequences.get((grade, subject), []))
@@ -4,6 +4,7 @@ Create initial data for demo and testing
 """
 from models.database import db, User, ChildProfile, Standard, Skill, Resource
 from datetime import date
+from services.curriculum import scope_sequence
 
 
 def seed_database():
@@ -43,6 +44,7 @@ def seed_database():
         ('CCSS.MATH.3.MD.A.1', 'Time', 'Tell and write time to the nearest minute')
     ]
     
+    math_skills = {}
     for code, name, desc in math_standards:
         standard = Standard(
             subject='Math',
@@ -62,6 +64,11 @@ def seed_database():
         )
         skill.tags = [subject.lower() for subject in ['math', 'grade3']]
         db.session.add(skill)
+        math_skills[name] = skill
+    
+    # Division builds on multiplication, fractions on division
+    math_skills['Division basics'].prerequisites.append(math_skills['Multiplication basics'])
+    math_skills['Fractions intro'].prerequisites.append(math_skills['Division basics'])
     
     # Seed standards - Grade 3 ELA
     ela_standards = [
@@ -115,6 +122,7 @@ def seed_database():
         db.session.add(resource)
     
     db.session.commit()
+    scope_sequence.invalidate()
     print("Database seeded successfully!")
     print("Demo parent: parent@demo.com / demo123")
     print("Demo student: alex / demo123")
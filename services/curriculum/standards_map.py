@@ -2,7 +2,8 @@
 Standards Mapping Service
 Map activities to educational standards (CCSS, NGSS, etc.)
 """
-from models.database import db, Standard, Skill
+from models.database import db, Standard
+from services.curriculum import scope_sequence
 
 
 class StandardsMapper:
@@ -11,7 +12,7 @@ class StandardsMapper:
     @staticmethod
     def get_standards_for_grade_subject(grade, subject):
         """Get all standards for a grade/subject"""
-        return Standard.query.filter_by(grade=grade, subject=subject).all()
+        return scope_sequence.get_standards_for_grade_subject(grade, subject)
     
     @staticmethod
     def find_matching_standards(topic, subject, grade=None):
@@ -33,8 +34,4 @@ class StandardsMapper:
     @staticmethod
     def get_skill_progression(standard_id):
         """Get skills in recommended order for a standard"""
-        skills = Skill.query.filter_by(standard_id=standard_id).all()
-        
-        # Sort by difficulty
-        order = {'easy': 0, 'medium': 1, 'hard': 2}
-        return sorted(skills, key=lambda s: order.get(s.difficulty, 1))
+        return scope_sequence.get_skill_progression(standard_id)
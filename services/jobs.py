@@ -0,0 +1,179 @@
+"""
+Background jobs
+Runs slow work off the request: on RQ when a worker is listening on the
+queue, otherwise on a small in-process thread pool for local runs. Either
+way the job's status, progress and result live in the shared state store.
+
+    rq worker tutor --url $REDIS_URL    # from the repo root, see Procfile
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app, has_app_context
+
+from config import get_config
+from services.state_manager import state_manager
+
+try:
+    from rq import Queue, Worker
+
+    RQ_AVAILABLE = True
+except ImportError:
+    RQ_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ("finished", "failed")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker_app = None
+
+
+def _local_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="jobs"
+            )
+    return _executor
+
+
+def _app_context():
+    """The current app context, or the web app's inside an RQ worker."""
+    global _worker_app
+    if has_app_context():
+        return nullcontext()
+    if _worker_app is None:
+        from app import app
+
+        _worker_app = app
+    return _worker_app.app_context()
+
+
+def run_job(job_id: str, func: Callable, args: tuple, kwargs: dict, state=None):
+    """Run ``func(job_id, *args, **kwargs)`` and record how it went.
+
+    This is the callable RQ workers execute; the local pool calls it too.
+    """
+    jobs = JobQueue(state)
+    jobs.update(job_id, status="running", started_at=datetime.utcnow().isoformat())
+    start = time.perf_counter()
+    try:
+        with _app_context():
+            result = func(job_id, *args, **kwargs)
+    except Exception as e:
+        logger.exception("Job %s failed", job_id)
+        jobs.update(
+            job_id,
+            status="failed",
+            error=str(e),
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        return None
+    jobs.update(
+        job_id,
+        status="finished",
+        result=result,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+    )
+    return result
+
+
+class JobQueue:
+    """Enqueue functions and track them as jobs:<job_id> records.
+
+    ``use_rq`` forces a backend; by default RQ is used when Redis is
+    connected and at least one RQ worker is listening on the queue.
+    Job functions must be importable (RQ pickles them by name) and take
+    the job id as their first argument.
+    """
+
+    PREFIX = "jobs"
+
+    def __init__(self, state=None, use_rq: Optional[bool] = None, name=None):
+        self.state = state or state_manager
+        self.config = get_config()
+        self.use_rq = use_rq
+        self.name = name or self.config.JOB_QUEUE_NAME
+
+    def _rq_queue(self):
+        if not RQ_AVAILABLE or self.use_rq is False or not self.state.redis_client:
+            return None
+        queue = Queue(self.name, connection=self.state.redis_client)
+        if self.use_rq or Worker.count(queue=queue):
+            return queue
+        return None
+
+    def enqueue(
+        self, func: Callable, *args, kind: str = None, owner_id=None, **kwargs
+    ) -> str:
+        """Queue ``func`` and return the new job id."""
+        job_id = uuid.uuid4().hex
+        queue = self._rq_queue()
+        self.state.set(
+            self.PREFIX,
+            job_id,
+            {
+                "id": job_id,
+                "kind": kind or func.__name__,
+                "owner_id": owner_id,
+                "status": "queued",
+                "backend": "rq" if queue is not None else "local",
+                "created_at": datetime.utcnow().isoformat(),
+            },
+            ttl=self.config.JOB_TTL,
+        )
+
+        if queue is not None:
+            queue.enqueue_call(
+                run_job,
+                args=(job_id, func, args, kwargs),
+                job_id=job_id,
+                result_ttl=self.config.JOB_TTL,
+                failure_ttl=self.config.JOB_TTL,
+            )
+        else:
+            app = current_app._get_current_object() if has_app_context() else None
+            _local_executor(self.config.JOB_LOCAL_WORKERS).submit(
+                self._run_local, app, job_id, func, args, kwargs
+            )
+        return job_id
+
+    def _run_local(self, app, job_id, func, args, kwargs):
+        with app.app_context() if app is not None else nullcontext():
+            run_job(job_id, func, args, kwargs, state=self.state)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.state.get(self.PREFIX, job_id)
+
+    def update(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """Merge ``fields`` into a job record (only the running job writes it)."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        self.state.set(self.PREFIX, job_id, job, ttl=self.config.JOB_TTL)
+        return job
+
+    def wait(self, job_id: str, timeout: float = 30.0, interval: float = 0.05):
+        """Poll until the job finishes or fails; returns the last record seen."""
+        expires_at = time.monotonic() + timeout
+        job = self.get(job_id)
+        while job and job["status"] not in FINAL_STATUSES:
+            if time.monotonic() >= expires_at:
+                break
+            time.sleep(interval)
+            job = self.get(job_id)
+        return job
+
+
+job_queue = JobQueue()
@@ -0,0 +1,44 @@
+"""
+Parent Dashboard Stats
+Per-child daily numbers for all of a parent's children in one query
+"""
+from datetime import date
+from sqlalchemy import func, select
+from models.database import db, ChildProfile, Assignment, Submission
+
+
+def _count(model, *criteria):
+    """Correlated COUNT(*) for the ChildProfile row being selected"""
+    return select(func.count()).select_from(model).where(
+        model.child_id == ChildProfile.id,
+        *criteria
+    ).correlate(ChildProfile).scalar_subquery()
+
+
+def get_children_stats(user_id, day=None):
+    """Children of a parent with today's assignment and review counts
+
+    Returns a list of dicts (child, today_assignments, completed_today,
+    pending_reviews) ordered by child id. Counts are computed by the
+    database from covering indexes, so they are always current.
+    """
+    day = day or date.today()
+
+    rows = db.session.query(
+        ChildProfile,
+        _count(Assignment, Assignment.date == day),
+        _count(Assignment, Assignment.date == day, Assignment.status == 'completed'),
+        _count(Submission, Submission.score.is_(None))
+    ).filter(
+        ChildProfile.user_id == user_id
+    ).order_by(ChildProfile.id).all()
+
+    return [
+        {
+            'child': child,
+            'today_assignments': today_assignments,
+            'completed_today': completed_today,
+            'pending_reviews': pending_reviews
+        }
+        for child, today_assignments, completed_today, pending_reviews in rows
+    ]
@@ -2,22 +2,56 @@
 Weekly Lesson Planner
 Generates comprehensive weekly lesson plans
 """
+from contextlib import contextmanager
 from datetime import date, timedelta
+import json
+import time
+from sqlalchemy import event, insert, select
 from models.database import db, LessonPlan, LessonItem, Assignment, Skill, Standard
-from services.curriculum.scope_sequence import get_skills_for_grade_subject
+from services.curriculum.scope_sequence import get_skills_for_grade_subjects
 from services.curriculum.pacing import calculate_lesson_distribution
 import random
 
 
+@contextmanager
+def _count_queries(counter):
+    """Count SQL statements run inside the block into counter['queries']"""
+    def on_execute(*args):
+        counter['queries'] += 1
+    
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+
+
 class WeeklyPlanner:
     """Generate weekly lesson plans for students"""
     
+    SCHOOL_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+    
     def __init__(self, child):
         self.child = child
         self.grade = child.grade
     
     def generate_week(self, week_start, subjects, minutes_per_subject=45):
         """Generate a complete week of lessons"""
+        week = self.build_week(week_start, subjects, minutes_per_subject)
+        lesson_plan, = WeeklyPlanner._save_weeks([week])
+        db.session.commit()
+        return lesson_plan
+    
+    def build_week(self, week_start, subjects, minutes_per_subject=45, skills=None):
+        """Plan a week in memory without touching the database
+        
+        ``skills`` maps (grade, subject) to skills; it is fetched in one query
+        when not given. Returns (lesson_plan, [(item_row, lesson_date), ...])
+        for _save_weeks.
+        """
+        if skills is None:
+            skills = get_skills_for_grade_subjects([(self.grade, s) for s in subjects])
         
         # Create lesson plan
         lesson_plan = LessonPlan(
@@ -27,67 +61,120 @@ class WeeklyPlanner:
         lesson_plan.settings = {
             'subjects': subjects,
             'minutes_per_subject': minutes_per_subject,
-            'school_days': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+            'school_days': self.SCHOOL_DAYS
         }
-        
-        db.session.add(lesson_plan)
-        db.session.flush()  # Get ID
+        entries = []
         
         # Generate items for each subject and day
-        for day_offset in range(5):  # Mon-Fri
+        for day_offset in range(len(self.SCHOOL_DAYS)):  # Mon-Fri
             lesson_date = week_start + timedelta(days=day_offset)
             
             for subject in subjects:
-                # Get skills for this grade/subject
-                skills = get_skills_for_grade_subject(self.grade, subject)
+                subject_skills = skills.get((self.grade, subject))
                 
-                if not skills:
+                if not subject_skills:
                     continue
                 
                 # Select skill for this lesson
-                skill = random.choice(skills)
+                skill = random.choice(subject_skills)
                 
-                # Create lesson item
+                # Lesson item, with an assignment for this day
                 item = self._create_lesson_item(
-                    lesson_plan.id,
                     subject,
                     [skill.id],
                     minutes_per_subject
                 )
-                
-                db.session.add(item)
-                db.session.flush()
-                
-                # Create assignment for this day
-                assignment = Assignment(
-                    child_id=self.child.id,
-                    lesson_item_id=item.id,
-                    date=lesson_date,
-                    status='pending'
+                entries.append((item, lesson_date))
+        
+        return lesson_plan, entries
+    
+    @staticmethod
+    def _save_weeks(weeks):
+        """Insert planned weeks with one batch per table; returns the LessonPlans"""
+        lesson_plans = [lesson_plan for lesson_plan, _ in weeks]
+        db.session.add_all(lesson_plans)
+        db.session.flush()  # Plan IDs
+        
+        item_rows = []
+        for lesson_plan, entries in weeks:
+            for item, _ in entries:
+                item_rows.append(dict(item, lesson_plan_id=lesson_plan.id))
+        if not item_rows:
+            return lesson_plans
+        db.session.execute(insert(LessonItem), item_rows)
+        
+        # IDs come back in insertion order within this transaction
+        item_ids = db.session.scalars(
+            select(LessonItem.id)
+            .where(LessonItem.lesson_plan_id.in_([p.id for p in lesson_plans]))
+            .order_by(LessonItem.id)
+        ).all()
+        
+        dates = [
+            (lesson_plan.child_id, lesson_date)
+            for lesson_plan, entries in weeks
+            for _, lesson_date in entries
+        ]
+        db.session.execute(insert(Assignment), [
+            {
+                'child_id': child_id,
+                'lesson_item_id': item_id,
+                'date': lesson_date,
+                'status': 'pending'
+            }
+            for item_id, (child_id, lesson_date) in zip(item_ids, dates)
+        ])
+        
+        return lesson_plans
+    
+    @staticmethod
+    def plan_household(children, week_start, subjects, minutes_per_subject=45):
+        """Generate a week for several children with one skills query and one commit
+        
+        Returns (lesson_plans, timings); timings holds per-phase milliseconds
+        and the number of SQL statements issued.
+        """
+        timings = {'queries': 0}
+        with _count_queries(timings):
+            start = time.perf_counter()
+            pairs = {(child.grade, subject) for child in children for subject in subjects}
+            skills = get_skills_for_grade_subjects(pairs)
+            timings['skills_ms'] = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            weeks = [
+                WeeklyPlanner(child).build_week(
+                    week_start, subjects, minutes_per_subject, skills=skills
                 )
-                db.session.add(assignment)
+                for child in children
+            ]
+            timings['build_ms'] = (time.perf_counter() - start) * 1000
+            
+            start = time.perf_counter()
+            lesson_plans = WeeklyPlanner._save_weeks(weeks)
+            db.session.commit()
+            timings['insert_ms'] = (time.perf_counter() - start) * 1000
         
-        db.session.commit()
-        return lesson_plan
+        timings['items'] = sum(len(entries) for _, entries in weeks)
+        timings['total_ms'] = timings['skills_ms'] + timings['build_ms'] + timings['insert_ms']
+        return lesson_plans, {key: round(value, 1) for key, value in timings.items()}
     
-    def _create_lesson_item(self, lesson_plan_id, subject, skill_ids, est_minutes):
-        """Create a single lesson item"""
+    def _create_lesson_item(self, subject, skill_ids, est_minutes):
+        """Create a single lesson item row"""
         
         # Determine lesson type based on day/subject
         lesson_types = ['lesson', 'practice', 'review', 'assessment']
         weights = [0.5, 0.3, 0.15, 0.05]
         item_type = random.choices(lesson_types, weights=weights)[0]
         
-        item = LessonItem(
-            lesson_plan_id=lesson_plan_id,
-            subject=subject,
-            type=item_type,
-            est_minutes=est_minutes
-        )
-        item.skill_ids = skill_ids
-        item.resource_ids = []  # Would fetch from resources
-        
-        return item
+        return {
+            'subject': subject,
+            'type': item_type,
+            'est_minutes': est_minutes,
+            'order_index': 0,
+            'skill_ids_json': json.dumps(skill_ids),
+            'resource_ids_json': json.dumps([])  # Would fetch from resources
+        }
     
     def reorder_item(self, item_id, new_index):
         """Reorder lesson item"""
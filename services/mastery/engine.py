@@ -3,8 +3,10 @@ Mastery Tracking Engine
 Updates skill levels based on evidence and spaced repetition
 """
 from datetime import datetime, timedelta
-from models.database import db, SkillState, Submission, Assignment
-from sqlalchemy import func
+from models.database import db, PracticeEvent, SkillState
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import joinedload
+from services.mastery import review_queue as queues
 
 
 class MasteryEngine:
@@ -39,39 +41,112 @@ class MasteryEngine:
             )
             db.session.add(skill_state)
         
-        # Update history
-        history = skill_state.history
-        history.append({
-            'date': datetime.utcnow().isoformat(),
-            'success': success,
-            'score': score
-        })
-        skill_state.history = history
-        
-        skill_state.evidence_count += 1
-        skill_state.last_practice = datetime.utcnow()
-        
-        # Update level
-        skill_state.level = MasteryEngine._calculate_new_level(history, skill_state.level)
+        # Append to the event log; only the recent window lives on the row
+        now = datetime.utcnow()
+        recent = skill_state.recent
+        db.session.add(PracticeEvent(
+            **MasteryEngine._apply_attempt(skill_state, recent, success, score, now)
+        ))
+        skill_state.recent = recent
         
         # Calculate next review date
         skill_state.next_due = MasteryEngine._calculate_next_review(skill_state.level)
         
         db.session.commit()
+        queues.review_queue.update(child_id, [skill_state])
         
         return skill_state
     
     @staticmethod
-    def _calculate_new_level(history, current_level):
-        """Calculate new mastery level based on history"""
-        if len(history) < 3:
-            return min(1, current_level + 1) if history[-1]['success'] else current_level
+    def record_practice_batch(results):
+        """Record many practice attempts with one query and one commit
+        
+        ``results`` holds ``(child_id, skill_id, success, score)`` tuples
+        (score optional), applied in order. Returns the updated SkillStates
+        keyed by ``(child_id, skill_id)``.
+        """
+        results = [tuple(result) for result in results]
+        if not results:
+            return {}
+        
+        keys = {(result[0], result[1]) for result in results}
+        states = {
+            (state.child_id, state.skill_id): state
+            for state in SkillState.query.filter(
+                tuple_(SkillState.child_id, SkillState.skill_id).in_(keys)
+            )
+        }
+        for child_id, skill_id in keys - states.keys():
+            states[(child_id, skill_id)] = SkillState(
+                child_id=child_id,
+                skill_id=skill_id,
+                level=0
+            )
+            db.session.add(states[(child_id, skill_id)])
+        
+        now = datetime.utcnow()
+        recents = {key: state.recent for key, state in states.items()}
+        events = []
+        for child_id, skill_id, success, *rest in results:
+            key = (child_id, skill_id)
+            score = rest[0] if rest else None
+            events.append(MasteryEngine._apply_attempt(
+                states[key], recents[key], success, score, now
+            ))
+        
+        for key, state in states.items():
+            state.recent = recents[key]
+            state.next_due = MasteryEngine._calculate_next_review(state.level)
+        db.session.execute(insert(PracticeEvent), events)
+        db.session.commit()
+        
+        by_child = {}
+        for (child_id, _), state in states.items():
+            by_child.setdefault(child_id, []).append(state)
+        for child_id, child_states in by_child.items():
+            queues.review_queue.update(child_id, child_states)
+        
+        return states
+    
+    @staticmethod
+    def _apply_attempt(skill_state, recent, success, score, now):
+        """Fold one attempt into a skill state; returns the practice event row"""
+        recent.append({
+            'date': now.isoformat(),
+            'success': success,
+            'score': score
+        })
+        del recent[:-SkillState.RECENT_WINDOW]
+        
+        skill_state.evidence_count = (skill_state.evidence_count or 0) + 1
+        skill_state.last_practice = now
+        
+        # Update level
+        skill_state.level = MasteryEngine._calculate_new_level(
+            recent, skill_state.level or 0, skill_state.evidence_count
+        )
+        
+        return {
+            'child_id': skill_state.child_id,
+            'skill_id': skill_state.skill_id,
+            'success': success,
+            'score': score,
+            'created_at': now
+        }
+    
+    @staticmethod
+    def _calculate_new_level(recent, current_level, attempts=None):
+        """Calculate new mastery level from recent attempts and the attempt count"""
+        if attempts is None:
+            attempts = len(recent)
+        if attempts < 3:
+            return min(1, current_level + 1) if recent[-1]['success'] else current_level
         
         # Look at last 5 attempts
-        recent = history[-5:]
+        recent = recent[-5:]
         success_rate = sum(1 for h in recent if h['success']) / len(recent)
         
-        if success_rate >= 0.9 and len(history) >= 5:
+        if success_rate >= 0.9 and attempts >= 5:
             return min(5, current_level + 1)
         elif success_rate >= 0.75:
             return min(4, current_level + 1)
@@ -96,11 +171,42 @@ class MasteryEngine:
     def get_skills_for_review(child_id, limit=5):
         """Get skills due for review"""
         now = datetime.utcnow()
+        skill_ids = queues.review_queue.due(child_id, now, limit)
+        if not skill_ids:
+            return []
         
-        skills = SkillState.query.filter(
+        states = SkillState.query.filter(
             SkillState.child_id == child_id,
-            SkillState.next_due <= now,
+            SkillState.skill_id.in_(skill_ids)
+        ).all()
+        by_skill = {state.skill_id: state for state in states}
+        
+        # Guard against a queue another worker has not patched yet
+        return [
+            by_skill[skill_id] for skill_id in skill_ids
+            if skill_id in by_skill
+            and by_skill[skill_id].next_due <= now
+            and by_skill[skill_id].level < 5
+        ]
+    
+    @staticmethod
+    def get_due_today(child_ids, now=None):
+        """Skills due by the end of today for several children in one query
+        
+        Returns {child_id: [SkillState, ...]} ordered by (next_due, level).
+        """
+        now = now or datetime.utcnow()
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        due = {child_id: [] for child_id in child_ids}
+        if not due:
+            return due
+        
+        states = SkillState.query.options(joinedload(SkillState.skill)).filter(
+            SkillState.child_id.in_(due),
+            SkillState.next_due < end_of_day,
             SkillState.level < 5
-        ).order_by(SkillState.next_due, SkillState.level).limit(limit).all()
+        ).order_by(SkillState.child_id, SkillState.next_due, SkillState.level).all()
         
-        return skills
+        for state in states:
+            due[state.child_id].append(state)
+        return due
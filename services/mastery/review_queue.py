@@ -0,0 +1,86 @@
+"""
+Spaced-Repetition Review Queue
+Per-child queue of unmastered skills, cached and patched on every practice
+"""
+
+import bisect
+from datetime import datetime
+
+from models.database import SkillState, db
+from services.state_manager import state_manager
+
+QUEUE_TTL = 3600  # Seconds; bounds how long a lost concurrent update can linger
+EPOCH = datetime(1970, 1, 1)
+
+
+def _due_key(next_due):
+    """Sortable number for a naive UTC datetime"""
+    return (next_due - EPOCH).total_seconds()
+
+
+class ReviewQueue:
+    """Skills a child has not mastered, ordered by (next_due, level)
+
+    Each queue is a sorted list of [due, level, skill_id] kept in the shared
+    state store under review_queue:<child_id>. It is built with one indexed
+    query the first time it is read and patched in place afterwards.
+    """
+
+    PREFIX = "review_queue"
+
+    def __init__(self, state=None):
+        self.state = state or state_manager
+
+    def _build(self, child_id):
+        rows = (
+            db.session.query(SkillState.next_due, SkillState.level, SkillState.skill_id)
+            .filter(
+                SkillState.child_id == child_id,
+                SkillState.level < 5,
+                SkillState.next_due.isnot(None),
+            )
+            .order_by(SkillState.next_due, SkillState.level)
+            .all()
+        )
+
+        queue = [
+            [_due_key(next_due), level, skill_id] for next_due, level, skill_id in rows
+        ]
+        self.state.set(self.PREFIX, str(child_id), queue, ttl=QUEUE_TTL)
+        return queue
+
+    def entries(self, child_id):
+        """The cached queue, building it on a miss"""
+        queue = self.state.get(self.PREFIX, str(child_id))
+        return queue if queue is not None else self._build(child_id)
+
+    def due(self, child_id, now=None, limit=None):
+        """Skill ids due at ``now``, most overdue first"""
+        cutoff = _due_key(now or datetime.utcnow())
+        skill_ids = []
+        for due, _level, skill_id in self.entries(child_id):
+            if due > cutoff or (limit is not None and len(skill_ids) >= limit):
+                break
+            skill_ids.append(skill_id)
+        return skill_ids
+
+    def update(self, child_id, skill_states):
+        """Move practiced skills to their new place in a cached queue"""
+        queue = self.state.get(self.PREFIX, str(child_id))
+        if queue is None:
+            return  # Built from the database on the next read
+
+        changed = {state.skill_id for state in skill_states}
+        queue = [entry for entry in queue if entry[2] not in changed]
+        for state in skill_states:
+            if state.level < 5 and state.next_due is not None:
+                bisect.insort(
+                    queue, [_due_key(state.next_due), state.level, state.skill_id]
+                )
+        self.state.set(self.PREFIX, str(child_id), queue, ttl=QUEUE_TTL)
+
+    def invalidate(self, child_id):
+        self.state.delete(self.PREFIX, str(child_id))
+
+
+review_queue = ReviewQueue()
@@ -0,0 +1,116 @@
+"""
+Render Cache
+Content-addressed, size-capped on-disk store for rendered PDFs
+"""
+import hashlib
+import json
+import os
+import threading
+
+from config import get_config
+
+# Bump a kind's version when its layout changes so earlier renders stop matching
+TEMPLATE_VERSIONS = {
+    'weekly_report': 1,
+    'transcript': 1,
+    'certificate': 1,
+    'worksheet': 1,
+}
+EVICT_TO = 0.9  # Fraction of max_bytes kept after an eviction pass
+
+
+def render_key(kind, data):
+    """Hash of a render's input data plus the template version for ``kind``"""
+    payload = json.dumps(
+        {'kind': kind, 'version': TEMPLATE_VERSIONS.get(kind, 1), 'data': data},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RenderCache:
+    """Rendered bytes on disk under their render_key, least recently used evicted
+
+    Keys cover every input that reaches the page, so when assignments or
+    submissions change the next render gets a new key; the stale entry is
+    never served again and ages out under the size cap. Hits touch the
+    file's mtime, which is what eviction orders by.
+    """
+
+    def __init__(self, folder=None, max_bytes=None):
+        config = get_config()
+        self.folder = folder or config.RENDER_CACHE_FOLDER
+        self.max_bytes = max_bytes or config.RENDER_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._total = None  # Bytes on disk, scanned on the first write
+
+    def _path(self, key):
+        return os.path.join(self.folder, key[:2], f'{key}.pdf')
+
+    def _entries(self):
+        """(mtime, size, path) of every cached file"""
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another process
+                yield stat.st_mtime, stat.st_size, path
+
+    def get(self, key):
+        """Cached bytes for ``key``, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted since the read
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            else:
+                self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+        return data
+
+    def _evict(self):
+        """Delete least recently used files down to EVICT_TO of the cap"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total = total
+
+    def get_or_render(self, kind, data, render):
+        """Return (pdf_bytes, key); ``render()`` runs only on a miss"""
+        key = render_key(kind, data)
+        pdf = self.get(key)
+        if pdf is None:
+            pdf = self.put(key, render())
+        return pdf, key
+
+
+pdf_cache = RenderCache()
@@ -11,8 +11,12 @@ from io import BytesIO
 from datetime import datetime
 
 
-def generate_weekly_report(child, assignments, week_start, week_end):
-    """Generate weekly progress report PDF"""
+def generate_weekly_report(child, assignments, week_start, week_end, submissions=None):
+    """Generate weekly progress report PDF
+    
+    ``submissions`` maps assignment id to its submission, prefetched by the
+    caller; without it each assignment's submission is queried separately.
+    """
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     story = []
@@ -41,7 +45,10 @@ def generate_weekly_report(child, assignments, week_start, week_end):
     data = [['Subject', 'Date', 'Status', 'Score']]
     
     for assignment in assignments:
-        submission = assignment.submissions.first()
+        if submissions is not None:
+            submission = submissions.get(assignment.id)
+        else:
+            submission = assignment.submissions.first()
         score = submission.score if submission else 'N/A'
         
         data.append([
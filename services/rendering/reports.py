@@ -0,0 +1,91 @@
+"""
+Report Jobs
+Weekly reports and transcripts rendered by the background job queue
+"""
+from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
+from models.database import db, ChildProfile, Assignment, Submission
+from services.rendering.cache import pdf_cache
+from services.rendering.pdf import generate_weekly_report, generate_transcript
+
+
+def first_submissions(assignment_ids):
+    """Map each assignment id to its first submission, in one query"""
+    submissions = {}
+    if not assignment_ids:
+        return submissions
+
+    rows = Submission.query.filter(
+        Submission.assignment_id.in_(assignment_ids)
+    ).order_by(Submission.id).all()
+
+    for submission in rows:
+        submissions.setdefault(submission.assignment_id, submission)
+    return submissions
+
+
+def _subject(assignment):
+    return assignment.lesson_item.subject if assignment.lesson_item else None
+
+
+def weekly_report_job(job_id, child_id, week_start):
+    """Render a child's weekly report with its submissions prefetched"""
+    child = db.session.get(ChildProfile, child_id)
+    week_end = week_start + timedelta(days=6)
+
+    assignments = Assignment.query.options(
+        joinedload(Assignment.lesson_item)
+    ).filter(
+        Assignment.child_id == child_id,
+        Assignment.date >= week_start,
+        Assignment.date <= week_end
+    ).order_by(Assignment.date, Assignment.id).all()
+    submissions = first_submissions([a.id for a in assignments])
+
+    # Everything the page shows; any change to it is a new cache key
+    data = {
+        'child': [child.name, child.grade],
+        'week': [week_start, week_end],
+        'assignments': [
+            [
+                a.id, _subject(a), a.date, a.status,
+                submissions[a.id].score if a.id in submissions else None
+            ]
+            for a in assignments
+        ]
+    }
+
+    def render():
+        return generate_weekly_report(
+            child, assignments, week_start, week_end, submissions=submissions
+        ).getvalue()
+
+    pdf, key = pdf_cache.get_or_render('weekly_report', data, render)
+    return {
+        'key': key,
+        'filename': f'weekly_report_{child.name}_{week_start}.pdf',
+        'size': len(pdf)
+    }
+
+
+def transcript_job(job_id, child_id):
+    """Render a child's transcript with assignments and lesson items joined in"""
+    child = db.session.get(ChildProfile, child_id)
+
+    all_submissions = Submission.query.options(
+        joinedload(Submission.assignment).joinedload(Assignment.lesson_item)
+    ).filter_by(child_id=child_id).order_by(Submission.id).all()
+
+    data = {
+        'child': [child.name, child.grade],
+        'generated': datetime.utcnow().date(),
+        'submissions': [
+            [s.id, _subject(s.assignment), s.score] for s in all_submissions
+        ]
+    }
+
+    def render():
+        return generate_transcript(child, all_submissions).getvalue()
+
+    pdf, key = pdf_cache.get_or_render('transcript', data, render)
+    return {'key': key, 'filename': f'transcript_{child.name}.pdf', 'size': len(pdf)}
@@ -3,10 +3,16 @@ State management service using Redis
 Handles game rooms, user sessions, and real-time state
 """
 
+import heapq
 import json
+import os
+import threading
+import time
 import uuid
+import weakref
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from config import get_config
 
 try:
@@ -17,29 +23,251 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 
-class StateManager:
-    """Manages application state with Redis or fallback to memory."""
+MEMORY_MAX_ENTRIES = int(os.getenv("STATE_MEMORY_MAX_ENTRIES", "10000"))
+MEMORY_SWEEP_INTERVAL = 30  # seconds between background expiry sweeps
+REDIS_SWEEP_INTERVAL = 60  # seconds between sweeps of unread expired Redis fields
 
-    def __init__(self):
-        self.config = get_config()
-        self.redis_client = None
-        self.memory_store = {}  # Fallback for development
 
-        if REDIS_AVAILABLE and self.config.REDIS_URL:
+def _start_sweeper(owner, interval: float, name: str):
+    """Call ``owner.sweep()`` every ``interval`` seconds until it is collected."""
+    ref = weakref.ref(owner)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            live = ref()
+            if live is None:
+                return
             try:
-                self.redis_client = redis.from_url(self.config.REDIS_URL)
-                self.redis_client.ping()  # Test connection
-                print("✅ Connected to Redis")
+                live.sweep()
             except Exception as e:
-                print(f"⚠️ Redis connection failed: {e}, using memory store")
-                self.redis_client = None
-        else:
-            print("⚠️ Redis not available, using memory store")
+                print(f"State sweep failed: {e}")
+            del live
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+
+
+class MemoryStore:
+    """In-process fallback store used when Redis is unavailable.
+
+    Expiry times live in a heap that a background thread drains, so
+    abandoned sessions and rooms are reclaimed without being read again.
+    Each prefix holds at most ``max_entries`` values (``prefix_limits``
+    overrides per prefix), evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MEMORY_MAX_ENTRIES,
+        prefix_limits: Optional[Dict[str, int]] = None,
+        sweep_interval: float = MEMORY_SWEEP_INTERVAL,
+    ):
+        self.max_entries = max_entries
+        self.prefix_limits = prefix_limits or {}
+        self.data: Dict[str, OrderedDict] = {}  # prefix -> key -> (value, expires_at)
+        self.bytes: Dict[str, int] = {}
+        self.indexes: Dict[str, set] = {}
+        self.evictions: Dict[str, int] = {}
+        self.expirations: Dict[str, int] = {}
+        self._heap: List[tuple] = []  # (expires_at, prefix, key)
+        self._lock = threading.RLock()
+        _start_sweeper(self, sweep_interval, "state-expirer")
+
+    def _limit(self, prefix: str) -> int:
+        return self.prefix_limits.get(prefix, self.max_entries)
+
+    def _remove(self, prefix: str, key: str):
+        value, _ = self.data[prefix].pop(key)
+        self.bytes[prefix] -= len(key) + len(value)
+
+    def _expired(self, prefix: str, key: str):
+        self._remove(prefix, key)
+        self.expirations[prefix] = self.expirations.get(prefix, 0) + 1
+
+    def set(self, prefix: str, key: str, value: str, ttl: Optional[int] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            items = self.data.setdefault(prefix, OrderedDict())
+            self.bytes.setdefault(prefix, 0)
+            if key in items:
+                self._remove(prefix, key)
+            items[key] = (value, expires_at)
+            self.bytes[prefix] += len(key) + len(value)
+            if expires_at is not None:
+                heapq.heappush(self._heap, (expires_at, prefix, key))
+
+            while len(items) > self._limit(prefix):
+                self._remove(prefix, next(iter(items)))
+                self.evictions[prefix] = self.evictions.get(prefix, 0) + 1
+
+    def get_many(self, prefix: str, keys: List[str]) -> Dict[str, str]:
+        now = time.time()
+        result = {}
+        with self._lock:
+            items = self.data.get(prefix, {})
+            for key in keys:
+                entry = items.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at is not None and expires_at <= now:
+                    self._expired(prefix, key)
+                    continue
+                items.move_to_end(key)
+                result[key] = value
+        return result
+
+    def items(self, prefix: str) -> Dict[str, str]:
+        now = time.time()
+        with self._lock:
+            return {
+                key: value
+                for key, (value, expires_at) in self.data.get(prefix, {}).items()
+                if expires_at is None or expires_at > now
+            }
+
+    def delete(self, prefix: str, key: str):
+        with self._lock:
+            if key in self.data.get(prefix, {}):
+                self._remove(prefix, key)
+
+    def index_add(self, name: str, member: str, ttl: Optional[int] = None):
+        # sweep() prunes members whose keys are gone, so ttl is not needed
+        with self._lock:
+            self.indexes.setdefault(name, set()).add(member)
+
+    def index_remove(self, name: str, *members: str):
+        with self._lock:
+            index = self.indexes.get(name)
+            if index is not None:
+                index.difference_update(members)
+                if not index:
+                    del self.indexes[name]
+
+    def index_members(self, name: str) -> List[str]:
+        with self._lock:
+            return list(self.indexes.get(name, ()))
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, prefix, key = heapq.heappop(self._heap)
+                entry = self.data.get(prefix, {}).get(key)
+                if entry is not None and entry[1] == expires_at:
+                    self._expired(prefix, key)
+                    removed += 1
+
+            # Overwritten keys leave stale heap entries; rebuild when they dominate
+            live = sum(len(items) for items in self.data.values())
+            if len(self._heap) > 2 * live + 1000:
+                self._heap = [
+                    (expires_at, prefix, key)
+                    for prefix, items in self.data.items()
+                    for key, (_, expires_at) in items.items()
+                    if expires_at is not None
+                ]
+                heapq.heapify(self._heap)
+
+            # Index names start with the prefix their members are keys of
+            for name in list(self.indexes):
+                items = self.data.get(name.split(":", 1)[0], {})
+                stale = [m for m in self.indexes[name] if m not in items]
+                self.index_remove(name, *stale)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            prefixes = {
+                prefix: {
+                    "entries": len(items),
+                    "bytes": self.bytes.get(prefix, 0),
+                    "max_entries": self._limit(prefix),
+                    "evictions": self.evictions.get(prefix, 0),
+                    "expirations": self.expirations.get(prefix, 0),
+                }
+                for prefix, items in self.data.items()
+            }
+            return {
+                "entries": sum(p["entries"] for p in prefixes.values()),
+                "bytes": sum(p["bytes"] for p in prefixes.values()),
+                "evictions": sum(self.evictions.values()),
+                "expirations": sum(self.expirations.values()),
+                "pending_expiries": len(self._heap),
+                "indexes": len(self.indexes),
+                "prefixes": prefixes,
+            }
+
+
+# Drops up to ARGV[2] fields of a prefix hash that expired by ARGV[1].
+# KEYS: prefix hash, prefix expiry zset. Atomic, so a field refreshed
+# meanwhile is never deleted.
+_PURGE_EXPIRED_LUA = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #expired > 0 then
+    redis.call('HDEL', KEYS[1], unpack(expired))
+    redis.call('ZREM', KEYS[2], unpack(expired))
+end
+return #expired
+"""
+SWEEP_BATCH = 500
+
+
+class StateManager:
+    """Manages application state with Redis or fallback to memory.
+
+    In Redis each prefix is one hash (``tutor:<prefix>``) with a companion
+    sorted set of expiry times (``tutor:<prefix>:expires``), so reading a
+    whole prefix is a single HGETALL instead of KEYS plus one GET per key.
+    Fields are dropped when read after expiry, and a background sweep every
+    ``sweep_interval`` seconds drops the ones nobody reads again.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        memory_store: Optional["MemoryStore"] = None,
+        sweep_interval: float = REDIS_SWEEP_INTERVAL,
+    ):
+        self.config = get_config()
+        self.redis_client = redis_client
+        self.memory_store = memory_store
+
+        if redis_client is None:
+            if REDIS_AVAILABLE and self.config.REDIS_URL:
+                try:
+                    self.redis_client = redis.from_url(self.config.REDIS_URL)
+                    self.redis_client.ping()  # Test connection
+                    print("✅ Connected to Redis")
+                except Exception as e:
+                    print(f"⚠️ Redis connection failed: {e}, using memory store")
+                    self.redis_client = None
+            else:
+                print("⚠️ Redis not available, using memory store")
+
+        if self.redis_client is not None:
+            self._purge_script = self.redis_client.register_script(_PURGE_EXPIRED_LUA)
+            _start_sweeper(self, sweep_interval, "state-redis-expirer")
+        elif self.memory_store is None:
+            self.memory_store = MemoryStore()  # Fallback for development
 
     def _get_key(self, prefix: str, key: str) -> str:
         """Generate Redis key."""
         return f"tutor:{prefix}:{key}"
 
+    def _hash_key(self, prefix: str) -> str:
+        """Redis hash holding every value of a prefix."""
+        return f"tutor:{prefix}"
+
+    def _expiry_key(self, prefix: str) -> str:
+        """Redis sorted set of key -> expiry timestamp for a prefix."""
+        return f"tutor:{prefix}:expires"
+
+    def _index_key(self, name: str) -> str:
+        return f"tutor:index:{name}"
+
     def _serialize(self, data: Any) -> str:
         """Serialize data for storage."""
         return json.dumps(data, default=str)
@@ -48,87 +276,289 @@ class StateManager:
         """Deserialize data from storage."""
         return json.loads(data) if data else None
 
+    def _purge_expired(self, prefix: str, keys: List[str]):
+        """Remove expired fields from a prefix hash."""
+        if keys:
+            pipe = self.redis_client.pipeline()
+            pipe.hdel(self._hash_key(prefix), *keys)
+            pipe.zrem(self._expiry_key(prefix), *keys)
+            pipe.execute()
+
     def set(self, prefix: str, key: str, value: Any, ttl: Optional[int] = None):
         """Set a value in the store."""
         serialized = self._serialize(value)
 
         if self.redis_client:
-            redis_key = self._get_key(prefix, key)
+            pipe = self.redis_client.pipeline()
+            pipe.hset(self._hash_key(prefix), key, serialized)
             if ttl:
-                self.redis_client.setex(redis_key, ttl, serialized)
+                pipe.zadd(self._expiry_key(prefix), {key: time.time() + ttl})
             else:
-                self.redis_client.set(redis_key, serialized)
+                pipe.zrem(self._expiry_key(prefix), key)
+            pipe.execute()
         else:
             # Memory store
-            if prefix not in self.memory_store:
-                self.memory_store[prefix] = {}
-            self.memory_store[prefix][key] = {
-                "value": serialized,
-                "expires": datetime.now() + timedelta(seconds=ttl) if ttl else None,
-            }
+            self.memory_store.set(prefix, key, serialized, ttl)
 
     def get(self, prefix: str, key: str) -> Optional[Any]:
         """Get a value from the store."""
+        return self.get_many(prefix, [key]).get(key)
+
+    def get_many(self, prefix: str, keys: List[str]) -> Dict[str, Any]:
+        """Get several values of a prefix in one round trip (missing keys omitted)."""
+        keys = list(keys)
+        if not keys:
+            return {}
+
         if self.redis_client:
-            redis_key = self._get_key(prefix, key)
-            data = self.redis_client.get(redis_key)
-            return self._deserialize(data) if data else None
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hmget(self._hash_key(prefix), keys)
+            pipe.zmscore(self._expiry_key(prefix), keys)
+            values, expiries = pipe.execute()
+
+            now = time.time()
+            result = {}
+            expired = []
+            for key, data, expires in zip(keys, values, expiries):
+                if data is None:
+                    continue
+                if expires is not None and expires <= now:
+                    expired.append(key)
+                    continue
+                result[key] = self._deserialize(data)
+            self._purge_expired(prefix, expired)
+            return result
         else:
             # Memory store
-            if prefix not in self.memory_store or key not in self.memory_store[prefix]:
-                return None
-
-            item = self.memory_store[prefix][key]
-            if item["expires"] and datetime.now() > item["expires"]:
-                del self.memory_store[prefix][key]
-                return None
-
-            return self._deserialize(item["value"])
+            values = self.memory_store.get_many(prefix, keys)
+            return {key: self._deserialize(value) for key, value in values.items()}
 
     def delete(self, prefix: str, key: str):
         """Delete a value from the store."""
         if self.redis_client:
-            redis_key = self._get_key(prefix, key)
-            self.redis_client.delete(redis_key)
+            self._purge_expired(prefix, [key])
         else:
             # Memory store
-            if prefix in self.memory_store and key in self.memory_store[prefix]:
-                del self.memory_store[prefix][key]
+            self.memory_store.delete(prefix, key)
 
     def get_all(self, prefix: str) -> Dict[str, Any]:
         """Get all values for a prefix."""
         if self.redis_client:
-            pattern = self._get_key(prefix, "*")
-            keys = self.redis_client.keys(pattern)
+            now = time.time()
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.zrangebyscore(self._expiry_key(prefix), "-inf", now)
+            pipe.hgetall(self._hash_key(prefix))
+            expired, data = pipe.execute()
+
+            expired = [
+                k.decode("utf-8") if isinstance(k, bytes) else k for k in expired
+            ]
+            self._purge_expired(prefix, expired)
+            expired = set(expired)
+
             result = {}
-            for key in keys:
-                # Extract the actual key from the full Redis key
-                actual_key = key.decode("utf-8").split(":")[-1]
-                data = self.redis_client.get(key)
-                if data:
-                    result[actual_key] = self._deserialize(data)
+            for key, value in data.items():
+                key = key.decode("utf-8") if isinstance(key, bytes) else key
+                if key not in expired:
+                    result[key] = self._deserialize(value)
             return result
         else:
             # Memory store
-            if prefix not in self.memory_store:
-                return {}
-
-            result = {}
-            for key, item in self.memory_store[prefix].items():
-                if not item["expires"] or datetime.now() <= item["expires"]:
-                    result[key] = self._deserialize(item["value"])
-            return result
+            values = self.memory_store.items(prefix)
+            return {key: self._deserialize(value) for key, value in values.items()}
 
     def exists(self, prefix: str, key: str) -> bool:
         """Check if a key exists."""
         return self.get(prefix, key) is not None
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Backend, entry counts and memory usage for health checks."""
+        if self.redis_client:
+            try:
+                used_memory = self.redis_client.info("memory").get("used_memory")
+            except Exception:  # INFO is disabled on some managed Redis
+                used_memory = None
+            prefixes = {}
+            for hash_key in self.redis_client.scan_iter(match="tutor:*", _type="hash"):
+                if isinstance(hash_key, bytes):
+                    hash_key = hash_key.decode("utf-8")
+                prefix = hash_key.split(":", 1)[1]
+                prefixes[prefix] = {"entries": self.redis_client.hlen(hash_key)}
+            return {
+                "backend": "redis",
+                "used_memory_bytes": used_memory,
+                "keys": self.redis_client.dbsize(),
+                "prefixes": prefixes,
+            }
+        return {"backend": "memory", **self.memory_store.stats()}
+
+    def sweep(self) -> int:
+        """Drop every expired entry and stale index member; returns entries removed."""
+        if not self.redis_client:
+            return self.memory_store.sweep()
+
+        now = time.time()
+        removed = 0
+        for expiry_key in self.redis_client.scan_iter(
+            match=self._expiry_key("*"), _type="zset"
+        ):
+            hash_key = expiry_key[: -len(":expires")]
+            while True:
+                purged = self._purge_script(
+                    keys=[hash_key, expiry_key], args=[now, SWEEP_BATCH]
+                )
+                removed += purged
+                if purged < SWEEP_BATCH:
+                    break
+
+        # Index names start with the prefix their members are keys of
+        for index_key in self.redis_client.scan_iter(
+            match=self._index_key("*"), _type="set"
+        ):
+            if isinstance(index_key, bytes):
+                index_key = index_key.decode("utf-8")
+            name = index_key[len(self._index_key("")) :]
+            members = self.index_members(name)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for member in members:
+                pipe.hexists(self._hash_key(name.split(":", 1)[0]), member)
+            live = pipe.execute()
+            self.index_remove(name, *(m for m, ok in zip(members, live) if not ok))
+        return removed
+
+    # ===== SECONDARY INDEXES =====
+
+    def index_add(self, name: str, member: str, ttl: Optional[int] = None):
+        """Add a member to a named set (e.g. the sessions of one user).
+
+        In Redis the set expires ``ttl`` seconds after its latest addition.
+        """
+        if self.redis_client:
+            pipe = self.redis_client.pipeline()
+            pipe.sadd(self._index_key(name), member)
+            if ttl:
+                pipe.expire(self._index_key(name), ttl)
+            pipe.execute()
+        else:
+            self.memory_store.index_add(name, member, ttl)
+
+    def index_remove(self, name: str, *members: str):
+        """Remove members from a named set."""
+        if not members:
+            return
+        if self.redis_client:
+            self.redis_client.srem(self._index_key(name), *members)
+        else:
+            self.memory_store.index_remove(name, *members)
+
+    def index_members(self, name: str) -> List[str]:
+        """Members of a named set."""
+        if self.redis_client:
+            return [
+                m.decode("utf-8") if isinstance(m, bytes) else m
+                for m in self.redis_client.smembers(self._index_key(name))
+            ]
+        return self.memory_store.index_members(name)
+
+
+ROOM_TTL = 3600  # 1 hour
+
+# Room mutations run as Lua scripts so concurrent players cannot lose each
+# other's updates. KEYS: rooms hash, room expiry zset, room scores zset.
+_JOIN_ROOM_LUA = """
+local expires = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if expires and tonumber(expires) <= tonumber(ARGV[3]) then return nil end
+local data = redis.call('HGET', KEYS[1], ARGV[1])
+if not data then return nil end
+local room = cjson.decode(data)
+if #room.players >= tonumber(room.max_players) then return nil end
+local player = cjson.decode(ARGV[2])
+table.insert(room.players, player)
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(room))
+redis.call('ZADD', KEYS[2], tonumber(ARGV[3]) + tonumber(ARGV[4]), ARGV[1])
+redis.call('ZADD', KEYS[3], 0, player.id)
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+return player.id
+"""
+
+_LEAVE_ROOM_LUA = """
+local data = redis.call('HGET', KEYS[1], ARGV[1])
+if not data then return 0 end
+local room = cjson.decode(data)
+local players = {}
+for _, player in ipairs(room.players) do
+    if player.id ~= ARGV[2] then table.insert(players, player) end
+end
+if #players == 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    redis.call('DEL', KEYS[3])
+    return 1
+end
+room.players = players
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(room))
+redis.call('ZADD', KEYS[2], tonumber(ARGV[3]) + tonumber(ARGV[4]), ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[2])
+return 1
+"""
+
+_START_GAME_LUA = """
+local expires = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if expires and tonumber(expires) <= tonumber(ARGV[2]) then return 0 end
+local data = redis.call('HGET', KEYS[1], ARGV[1])
+if not data then return 0 end
+local room = cjson.decode(data)
+if #room.players < 2 then return 0 end
+room.status = 'playing'
+room.started_at = ARGV[4]
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(room))
+redis.call('ZADD', KEYS[2], tonumber(ARGV[2]) + tonumber(ARGV[3]), ARGV[1])
+return 1
+"""
+
 
 class GameRoomManager:
-    """Manages game rooms using state manager."""
+    """Manages game rooms using state manager.
+
+    With Redis, membership changes are atomic Lua scripts and scores live in
+    a sorted set per room (``tutor:game_rooms:<id>:scores``). The memory
+    fallback serializes mutations with a lock.
+    """
+
+    def __init__(self, state: Optional[StateManager] = None):
+        self.state = state or StateManager()
+        self._lock = threading.RLock()
+        self._scripts = {}
+        if self.state.redis_client:
+            client = self.state.redis_client
+            self._scripts = {
+                "join": client.register_script(_JOIN_ROOM_LUA),
+                "leave": client.register_script(_LEAVE_ROOM_LUA),
+                "start": client.register_script(_START_GAME_LUA),
+            }
+
+    def _room_keys(self, room_id: str) -> List[str]:
+        return [
+            self.state._hash_key("game_rooms"),
+            self.state._expiry_key("game_rooms"),
+            self._scores_key(room_id),
+        ]
+
+    def _scores_key(self, room_id: str) -> str:
+        return self.state._get_key("game_rooms", f"{room_id}:scores")
 
-    def __init__(self):
-        self.state = StateManager()
+    @staticmethod
+    def _score(value: float):
+        return int(value) if float(value).is_integer() else value
+
+    def _apply_scores(self, room: Dict, scores: List) -> Dict:
+        by_player = {
+            (p.decode("utf-8") if isinstance(p, bytes) else p): self._score(score)
+            for p, score in scores
+        }
+        for player in room["players"]:
+            player["score"] = by_player.get(player["id"], player.get("score", 0))
+        return room
 
     def create_room(self, name: str, game_type: str, max_players: int = 4) -> str:
         """Create a new game room."""
@@ -144,27 +574,32 @@ class GameRoomManager:
             "started_at": None,
         }
 
-        self.state.set("game_rooms", room_id, room_data, ttl=3600)  # 1 hour TTL
+        self.state.set("game_rooms", room_id, room_data, ttl=ROOM_TTL)
         return room_id
 
     def get_room(self, room_id: str) -> Optional[Dict]:
         """Get a game room."""
-        return self.state.get("game_rooms", room_id)
+        room = self.state.get("game_rooms", room_id)
+        if room and self.state.redis_client:
+            scores = self.state.redis_client.zrange(
+                self._scores_key(room_id), 0, -1, withscores=True
+            )
+            self._apply_scores(room, scores)
+        return room
 
     def get_all_rooms(self) -> List[Dict]:
         """Get all active game rooms."""
-        rooms = self.state.get_all("game_rooms")
-        return list(rooms.values())
+        rooms = list(self.state.get_all("game_rooms").values())
+        if rooms and self.state.redis_client:
+            pipe = self.state.redis_client.pipeline(transaction=False)
+            for room in rooms:
+                pipe.zrange(self._scores_key(room["id"]), 0, -1, withscores=True)
+            for room, scores in zip(rooms, pipe.execute()):
+                self._apply_scores(room, scores)
+        return rooms
 
     def join_room(self, room_id: str, player_name: str) -> Optional[str]:
         """Join a game room."""
-        room = self.get_room(room_id)
-        if not room:
-            return None
-
-        if len(room["players"]) >= room["max_players"]:
-            return None
-
         player_id = str(uuid.uuid4())[:8]
         player = {
             "id": player_id,
@@ -173,56 +608,138 @@ class GameRoomManager:
             "joined_at": datetime.now().isoformat(),
         }
 
-        room["players"].append(player)
-        self.state.set("game_rooms", room_id, room, ttl=3600)
+        if self.state.redis_client:
+            joined = self._scripts["join"](
+                keys=self._room_keys(room_id),
+                args=[room_id, json.dumps(player), time.time(), ROOM_TTL],
+            )
+            return player_id if joined else None
+
+        with self._lock:
+            room = self.get_room(room_id)
+            if not room:
+                return None
+
+            if len(room["players"]) >= room["max_players"]:
+                return None
+
+            room["players"].append(player)
+            self.state.set("game_rooms", room_id, room, ttl=ROOM_TTL)
         return player_id
 
     def leave_room(self, room_id: str, player_id: str) -> bool:
         """Leave a game room."""
-        room = self.get_room(room_id)
-        if not room:
-            return False
-
-        room["players"] = [p for p in room["players"] if p["id"] != player_id]
-
-        if not room["players"]:
-            # Delete empty room
-            self.state.delete("game_rooms", room_id)
-        else:
-            self.state.set("game_rooms", room_id, room, ttl=3600)
+        if self.state.redis_client:
+            left = self._scripts["leave"](
+                keys=self._room_keys(room_id),
+                args=[room_id, player_id, time.time(), ROOM_TTL],
+            )
+            return bool(left)
+
+        with self._lock:
+            room = self.get_room(room_id)
+            if not room:
+                return False
+
+            room["players"] = [p for p in room["players"] if p["id"] != player_id]
+
+            if not room["players"]:
+                # Delete empty room
+                self.state.delete("game_rooms", room_id)
+            else:
+                self.state.set("game_rooms", room_id, room, ttl=ROOM_TTL)
 
         return True
 
     def start_game(self, room_id: str) -> bool:
         """Start a game in a room."""
-        room = self.get_room(room_id)
-        if not room or len(room["players"]) < 2:
-            return False
-
-        room["status"] = "playing"
-        room["started_at"] = datetime.now().isoformat()
-        self.state.set("game_rooms", room_id, room, ttl=3600)
+        started_at = datetime.now().isoformat()
+        if self.state.redis_client:
+            started = self._scripts["start"](
+                keys=self._room_keys(room_id),
+                args=[room_id, time.time(), ROOM_TTL, started_at],
+            )
+            return bool(started)
+
+        with self._lock:
+            room = self.get_room(room_id)
+            if not room or len(room["players"]) < 2:
+                return False
+
+            room["status"] = "playing"
+            room["started_at"] = started_at
+            self.state.set("game_rooms", room_id, room, ttl=ROOM_TTL)
         return True
 
     def update_player_score(self, room_id: str, player_id: str, score: int):
         """Update a player's score."""
-        room = self.get_room(room_id)
-        if not room:
+        self._write_score(room_id, player_id, score, increment=False)
+
+    def add_to_score(self, room_id: str, player_id: str, points: int):
+        """Add points to a player's score."""
+        self._write_score(room_id, player_id, points, increment=True)
+
+    def _write_score(self, room_id: str, player_id: str, value, increment: bool):
+        if self.state.redis_client:
+            # O(log n) sorted-set update; XX ignores players not in the room
+            pipe = self.state.redis_client.pipeline(transaction=False)
+            pipe.zadd(
+                self._scores_key(room_id), {player_id: value}, xx=True, incr=increment
+            )
+            pipe.zadd(
+                self.state._expiry_key("game_rooms"),
+                {room_id: time.time() + ROOM_TTL},
+                xx=True,
+            )
+            pipe.expire(self._scores_key(room_id), ROOM_TTL)
+            pipe.execute()
             return
 
-        for player in room["players"]:
-            if player["id"] == player_id:
-                player["score"] = score
-                break
+        with self._lock:
+            room = self.get_room(room_id)
+            if not room:
+                return
+
+            for player in room["players"]:
+                if player["id"] == player_id:
+                    player["score"] = player["score"] + value if increment else value
+                    break
 
-        self.state.set("game_rooms", room_id, room, ttl=3600)
+            self.state.set("game_rooms", room_id, room, ttl=ROOM_TTL)
+
+    def get_leaderboard(self, room_id: str, limit: int = 10) -> List[Dict]:
+        """Players ranked by score, highest first."""
+        room = self.get_room(room_id)
+        if not room:
+            return []
+        names = {p["id"]: p["name"] for p in room["players"]}
+
+        if self.state.redis_client:
+            ranked = self.state.redis_client.zrevrange(
+                self._scores_key(room_id), 0, limit - 1, withscores=True
+            )
+            ranked = [
+                (p.decode("utf-8") if isinstance(p, bytes) else p, self._score(score))
+                for p, score in ranked
+            ]
+        else:
+            ranked = sorted(
+                ((p["id"], p["score"]) for p in room["players"]),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:limit]
+
+        return [
+            {"rank": rank, "player_id": pid, "name": names.get(pid), "score": score}
+            for rank, (pid, score) in enumerate(ranked, start=1)
+        ]
 
 
 class UserSessionManager:
     """Manages user sessions using state manager."""
 
-    def __init__(self):
-        self.state = StateManager()
+    def __init__(self, state: Optional[StateManager] = None):
+        self.state = state or StateManager()
 
     def create_session(self, user_id: str, session_data: Dict) -> str:
         """Create a new user session."""
@@ -237,6 +754,7 @@ class UserSessionManager:
         )
 
         self.state.set("user_sessions", session_id, session_data, ttl=86400)  # 24 hours
+        self.state.index_add(f"user_sessions:{user_id}", session_id, ttl=86400)
         return session_id
 
     def get_session(self, session_id: str) -> Optional[Dict]:
@@ -250,22 +768,32 @@ class UserSessionManager:
             session.update(updates)
             session["last_activity"] = datetime.now().isoformat()
             self.state.set("user_sessions", session_id, session, ttl=86400)
+            # Keeps the user's index alive as long as this session
+            self.state.index_add(
+                f"user_sessions:{session['user_id']}", session_id, ttl=86400
+            )
 
     def delete_session(self, session_id: str):
         """Delete a user session."""
+        session = self.get_session(session_id)
         self.state.delete("user_sessions", session_id)
+        if session:
+            self.state.index_remove(f"user_sessions:{session['user_id']}", session_id)
 
     def get_user_sessions(self, user_id: str) -> List[Dict]:
-        """Get all sessions for a user."""
-        all_sessions = self.state.get_all("user_sessions")
-        return [
-            session
-            for session in all_sessions.values()
-            if session.get("user_id") == user_id
-        ]
+        """Get all sessions for a user (via the per-user session index)."""
+        index = f"user_sessions:{user_id}"
+        session_ids = self.state.index_members(index)
+        sessions = self.state.get_many("user_sessions", session_ids)
+
+        # Drop ids whose sessions have expired
+        self.state.index_remove(
+            index, *(sid for sid in session_ids if sid not in sessions)
+        )
+        return list(sessions.values())
 
 
-# Global instances
+# Global instances (one shared store and Redis connection)
 state_manager = StateManager()
-game_room_manager = GameRoomManager()
-user_session_manager = UserSessionManager()
+game_room_manager = GameRoomManager(state_manager)
+user_session_manager = UserSessionManager(state_manager)
@@ -0,0 +1,75 @@
+"""
+Worksheet ingestion
+Turns an uploaded worksheet into a lesson on the background job queue, in
+three stages: extract (text, OCR), analyze (problems, lesson, practice set)
+and persist (one batched write). The job record carries the current stage,
+overall progress and each finished stage's timing for the status endpoint.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from services.jobs import JobQueue
+from worksheet_ai_converter import convert_worksheet_to_lesson
+
+STAGES = ("extract", "analyze", "persist")
+
+# Share of the overall progress bar per stage; reading/OCR dominates
+STAGE_WEIGHTS = {"extract": 0.6, "analyze": 0.3, "persist": 0.1}
+
+
+class StageProgress:
+    """Records a job's stage, percent complete and per-stage timings."""
+
+    def __init__(self, job_id: str, jobs: JobQueue = None):
+        self.job_id = job_id
+        self.jobs = jobs or JobQueue()
+        self.stage_ms = {}
+
+    def report(self, stage: str, fraction: float):
+        """``fraction`` of ``stage`` is done."""
+        finished = sum(STAGE_WEIGHTS[s] for s in STAGES[: STAGES.index(stage)])
+        progress = (finished + STAGE_WEIGHTS[stage] * min(fraction, 1.0)) * 100
+        self.jobs.update(self.job_id, stage=stage, progress=round(progress))
+
+    @contextmanager
+    def stage(self, stage: str):
+        self.report(stage, 0.0)
+        start = time.perf_counter()
+        yield
+        self.stage_ms[stage] = round((time.perf_counter() - start) * 1000, 1)
+        self.jobs.update(self.job_id, stage_ms=dict(self.stage_ms))
+        self.report(stage, 1.0)
+
+
+def ingest_worksheet_job(job_id: str, file_path: str, subject: str = "Math"):
+    """Convert an uploaded worksheet into a lesson; the upload is removed after.
+
+    Runs on the job queue, so an RQ worker must share the upload folder.
+    """
+    progress = StageProgress(job_id)
+    try:
+        result = convert_worksheet_to_lesson(file_path, subject, progress)
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    return {**result, "stage_ms": progress.stage_ms}
+
+
+def job_status(job: dict) -> dict:
+    """What the status endpoints report for a worksheet_ingest job record."""
+    body = {
+        "success": job["status"] != "failed",
+        "status": job["status"],
+        "stage": job.get("stage"),
+        "progress": job.get("progress", 0),
+        "stage_ms": job.get("stage_ms", {}),
+    }
+    if job.get("elapsed_ms") is not None:
+        body["elapsed_ms"] = job["elapsed_ms"]
+    if job["status"] == "finished":
+        body["lesson_data"] = job["result"]
+    elif job["status"] == "failed":
+        body["error"] = f"Failed to process worksheet: {job.get('error')}"
+    return body
@@ -12,6 +12,7 @@ from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
 import random
+from services.rendering.cache import pdf_cache
 
 
 class WorksheetGenerator:
@@ -49,6 +50,17 @@ class WorksheetGenerator:
             spaceBefore=10
         ))
     
+    def _build(self, data, story):
+        """Build a letter-size PDF, reusing an identical earlier render's bytes"""
+        def render():
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=letter)
+            doc.build(story)
+            return buffer.getvalue()
+        
+        pdf, _ = pdf_cache.get_or_render('worksheet', data, render)
+        return BytesIO(pdf)
+    
     def generate_math_worksheet(self, topic, grade_level, num_problems=20):
         """Generate a math worksheet"""
         buffer = BytesIO()
@@ -144,8 +156,8 @@ class WorksheetGenerator:
             question = Paragraph(f"<b>{i}.</b> {q['question']}", self.styles['Question'])
             story.append(question)
             
-            for letter, choice in zip(['A', 'B', 'C', 'D'], q.get('choices', [])):
-                choice_text = Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;{letter}. {choice}", self.styles['Normal'])
+            for label, choice in zip(['A', 'B', 'C', 'D'], q.get('choices', [])):
+                choice_text = Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;{label}. {choice}", self.styles['Normal'])
                 story.append(choice_text)
                 story.append(Spacer(1, 5))
             
@@ -219,8 +231,6 @@ class WorksheetGenerator:
     
     def generate_study_guide(self, topic, content):
         """Generate a study guide"""
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
         story = []
         
         # Title
@@ -256,9 +266,11 @@ class WorksheetGenerator:
             story.append(terms_table)
         
         # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
+        return self._build({
+            'layout': 'study_guide',
+            'topic': topic,
+            'content': content
+        }, story)
 
 
 # Global instance
@@ -0,0 +1,147 @@
+"""
+Tests for concurrent adapter search and rate limiting (services/apis)
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+
+from blueprints.apis.routes import apis_bp
+from open_learning.cache import clear_cache
+from open_learning.shared_cache import RedisBackend, set_l2
+from services.apis import adapter_factory
+from services.apis.adapter_factory import iter_search_all, search_all
+from services.apis.base import APIAdapter
+from services.apis.rate_limit import TokenBucket, reset_buckets
+
+fakeredis = pytest.importorskip("fakeredis")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SleepyAdapter(APIAdapter):
+    delay = 0.0
+
+    def search(self, topic, subject=None, grade_band=None, media_type=None, limit=10):
+        time.sleep(self.delay)
+        return [{"title": f"{self.name}: {topic}", "provider": self.name}]
+
+
+def make_adapter(name, delay, timeout=10):
+    def __init__(self):
+        SleepyAdapter.__init__(self)
+        self.timeout = timeout
+
+    return type(
+        f"{name}Adapter", (SleepyAdapter,), {"delay": delay, "__init__": __init__}
+    )
+
+
+@pytest.fixture
+def adapters(monkeypatch):
+    registry = {
+        "slow": make_adapter("Slow", 0.4),
+        "fast": make_adapter("Fast", 0.05),
+        "medium": make_adapter("Medium", 0.2),
+    }
+    monkeypatch.setattr(adapter_factory, "ADAPTERS", registry)
+    return registry
+
+
+def test_concurrent_search_takes_the_slowest_provider(adapters):
+    start = time.perf_counter()
+    results = search_all("volcanoes")
+    elapsed = time.perf_counter() - start
+
+    assert [r["provider"] for r in results] == ["Slow", "Fast", "Medium"]
+    assert elapsed < 0.6  # serial would be 0.65s
+
+    assert len(search_all("volcanoes", concurrent=False)) == 3
+
+
+def test_stream_yields_fastest_provider_first(adapters):
+    order = [name for name, _ in iter_search_all("volcanoes")]
+    assert order == ["fast", "medium", "slow"]
+
+
+def test_stream_endpoint_sends_rendered_cards_per_provider(adapters):
+    app = Flask(__name__, template_folder=os.path.join(ROOT, "templates"))
+    app.register_blueprint(apis_bp)
+
+    response = app.test_client().get("/apis/search/stream?topic=volcanoes")
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+    assert response.mimetype == "application/x-ndjson"
+    assert [line.get("provider") for line in lines] == ["fast", "medium", "slow", None]
+    assert "Fast: volcanoes" in lines[0]["html"]
+    assert lines[-1] == {"done": True}
+
+
+def test_provider_timeout_drops_only_that_provider(adapters, monkeypatch):
+    adapters["stuck"] = make_adapter("Stuck", 2, timeout=0.3)
+
+    start = time.perf_counter()
+    results = dict(iter_search_all("volcanoes", timeout=0.6))
+
+    assert results["stuck"].status == "timeout"
+    assert results["slow"].status == "ok"
+    assert time.perf_counter() - start < 1.0
+
+
+def test_token_bucket_needs_a_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate_per_minute=0)
+
+
+def test_token_bucket_limits_and_refills():
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 tokens/s
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert not bucket.acquire(timeout=0.01)
+    assert bucket.acquire(timeout=0.5)
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    clear_cache()
+    reset_buckets()
+    set_l2(RedisBackend(fakeredis.FakeRedis()))
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    set_l2(None)
+    clear_cache()
+    reset_buckets()
+    server.shutdown()
+    server.server_close()
+
+
+def test_rate_limit_is_enforced_for_upstream_requests_only(server_url):
+    adapter = make_adapter("Limited", 0)()
+    adapter.rate_limit = 2  # per minute
+    adapter.timeout = 0.2
+
+    assert adapter._make_request(f"{server_url}/a") == {"path": "/a"}
+    assert adapter._make_request(f"{server_url}/b") == {"path": "/b"}
+    assert adapter._make_request(f"{server_url}/a") == {"path": "/a"}  # cached
+    assert adapter._make_request(f"{server_url}/c") is None  # bucket empty
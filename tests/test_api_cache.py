@@ -0,0 +1,106 @@
+"""
+Tests for the persistent api_cache table in database.py
+"""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+import database
+from cli import cli
+from database import (
+    cache_api_response,
+    close_pools,
+    get_api_cache_stats,
+    get_cached_api_response,
+    get_connection,
+    init_database,
+    migrate_database,
+    sweep_api_cache,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "api_cache.db")
+    monkeypatch.setenv("DATABASE_URL", path)
+    monkeypatch.setattr(database, "_api_cache_counters", {})
+    init_database()
+    yield path
+    close_pools()
+
+
+def _rows():
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT * FROM api_cache").fetchall()
+    finally:
+        conn.close()
+
+
+def test_repeated_writes_upsert_one_compressed_row(db_path):
+    cache_api_response("wikipedia", "cats", {"title": "Cat", "v": 1})
+    cache_api_response("wikipedia", "cats", {"title": "Cat", "v": 2})
+
+    rows = _rows()
+    assert len(rows) == 1
+    assert isinstance(rows[0]["response_data"], bytes)
+    assert get_cached_api_response("wikipedia", "cats") == {"title": "Cat", "v": 2}
+
+
+def test_legacy_text_rows_are_still_readable(db_path):
+    conn = get_connection()
+    conn.execute(
+        "INSERT INTO api_cache (api_source, query, response_data, expires_at) "
+        "VALUES (?, ?, ?, ?)",
+        ("nasa", "apod", json.dumps({"title": "Moon"}), 4102444800),
+    )
+    conn.commit()
+    conn.close()
+
+    assert get_cached_api_response("nasa", "apod") == {"title": "Moon"}
+
+
+def test_sweep_deletes_expired_rows_and_persists_hit_rate(db_path):
+    cache_api_response("usgs", "old", {"quakes": []}, expires_hours=-1)
+    cache_api_response("usgs", "new", {"quakes": [1]})
+
+    assert get_cached_api_response("usgs", "old") is None
+    assert get_cached_api_response("usgs", "new") == {"quakes": [1]}
+    assert sweep_api_cache() == 1
+
+    stats = get_api_cache_stats()
+    assert stats["entries"] == 1
+    assert stats["sources"] == {"usgs": {"hits": 1, "misses": 1}}
+    assert stats["hit_rate"] == 0.5
+
+
+def test_migration_collapses_duplicate_rows(db_path):
+    conn = get_connection()
+    conn.execute("DROP INDEX idx_api_cache_key")
+    for version in (1, 2):
+        conn.execute(
+            "INSERT INTO api_cache (api_source, query, response_data, expires_at) "
+            "VALUES ('loc', 'maps', ?, 4102444800)",
+            (json.dumps({"version": version}),),
+        )
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+
+    assert [v for v, _ in migrate_database(analyze=False)] == [3]
+    assert len(_rows()) == 1
+    assert get_cached_api_response("loc", "maps") == {"version": 2}
+
+
+def test_api_cache_command_reports_and_vacuums(db_path):
+    cache_api_response("openlibrary", "math", {"docs": ["x" * 1000]})
+    get_cached_api_response("openlibrary", "math")
+
+    result = CliRunner().invoke(cli, ["api-cache", "--vacuum"])
+
+    assert result.exit_code == 0, result.output
+    assert "1 entries" in result.output
+    assert "Hit rate: 100.0%" in result.output
+    assert "Vacuumed database" in result.output
@@ -0,0 +1,114 @@
+"""
+Tests for bulk_seeding() in database.py
+"""
+
+import pytest
+
+import database
+from database import bulk_seeding, close_pools, get_connection, init_database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "seed.db")
+    monkeypatch.setenv("DATABASE_URL", path)
+    init_database()
+    yield path
+    close_pools()
+
+
+def _seed_subject(name):
+    subject_id = database.add_subject(name, "", "📚", 1)
+    topic_id = database.add_topic(subject_id, f"{name} topic", "", 1)
+    lesson_id = database.add_lesson(
+        topic_id, "Lesson", "", ["step"], [], "builtin", None, 1
+    )
+    database.add_practice_problem(
+        lesson_id, "1 + 1?", "2", ["add"], ["count"], "easy", 1
+    )
+    return subject_id, topic_id, lesson_id
+
+
+def _count(table):
+    conn = get_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_bulk_rows_match_row_at_a_time_ids(db_path):
+    _seed_subject("Existing")
+
+    with bulk_seeding() as seeder:
+        subject_id, topic_id, lesson_id = _seed_subject("Bulk")
+
+    assert seeder.counts == {
+        "subjects": 1,
+        "topics": 1,
+        "lessons": 1,
+        "practice_problems": 1,
+    }
+    lesson = database.get_lesson_by_id(lesson_id)
+    assert lesson["topic_id"] == topic_id
+    assert lesson["subject_id"] == subject_id
+    assert lesson["steps"] == ["step"]
+    problems = database.get_practice_problems_by_lesson(lesson_id)
+    assert [p["hints"] for p in problems] == [["count"]]
+
+
+def test_reads_inside_block_see_pending_rows(db_path):
+    with bulk_seeding():
+        subject_id, topic_id, _ = _seed_subject("Math")
+        assert [t["id"] for t in database.get_topics_by_subject(subject_id)] == [
+            topic_id
+        ]
+
+
+def test_dry_run_counts_without_writing(db_path):
+    with bulk_seeding(dry_run=True) as seeder:
+        _seed_subject("Math")
+        _seed_subject("Science")
+
+    assert seeder.counts["practice_problems"] == 2
+    assert _count("subjects") == 0
+    assert _count("practice_problems") == 0
+
+
+def test_curriculum_dry_run_previews_a_fresh_load(db_path, tmp_path, monkeypatch):
+    from LOAD_ULTIMATE_CURRICULUM import load_ultimate_curriculum, seed_core_curricula
+
+    with bulk_seeding():
+        _seed_subject("Math")  # Would collide with the real load's subjects
+    monkeypatch.chdir(tmp_path)
+
+    preview = load_ultimate_curriculum(dry_run=True)
+
+    assert _count("subjects") == 1
+    assert _count("lessons") == 1
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "fresh.db"))
+    init_database()
+    assert preview.counts == seed_core_curricula().counts
+    assert preview.counts["lessons"] > 100
+
+
+def test_failure_keeps_previously_committed_subjects(db_path):
+    progress = []
+
+    with pytest.raises(RuntimeError):
+        with bulk_seeding(progress=lambda name, counts: progress.append(name)):
+            _seed_subject("Math")
+            _seed_subject("Science")
+            raise RuntimeError("seed script crashed")
+
+    assert progress == ["Math"]
+    assert [s["name"] for s in database.get_all_subjects()] == ["Math"]
+    assert _count("lessons") == 1
+
+
+def test_ids_continue_after_bulk_seed(db_path):
+    with bulk_seeding():
+        _, topic_id, _ = _seed_subject("Math")
+
+    next_topic = database.add_topic(1, "After", "", 2)
+    assert next_topic == topic_id + 1
@@ -0,0 +1,94 @@
+"""
+Tests for the incremental curriculum loader (curriculum_sync.py)
+"""
+
+import pytest
+
+import database
+from curriculum_sync import sync_curriculum
+from database import close_pools, get_connection, init_database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "live.db")
+    monkeypatch.setenv("DATABASE_URL", path)
+    init_database()
+    yield path
+    close_pools()
+
+
+def seed_v1():
+    subject_id = database.add_subject("Math", "Numbers", "🔢", 1)
+    topic_id = database.add_topic(subject_id, "Fractions", "Parts of a whole", 1)
+    lesson_id = database.add_lesson(
+        topic_id, "Halves", "Split in two", ["Cut it"], [], "builtin", None, 1
+    )
+    database.add_practice_problem(
+        lesson_id, "Half of 4?", "2", ["4 / 2"], [], "easy", 1
+    )
+
+
+def seed_v2():
+    subject_id = database.add_subject("Math", "Numbers", "🔢", 1)
+    topic_id = database.add_topic(subject_id, "Fractions", "Parts of a whole", 1)
+    lesson_id = database.add_lesson(
+        topic_id,
+        "Halves",
+        "Split into two equal parts",
+        ["Cut it"],
+        [],
+        "builtin",
+        None,
+        1,
+    )
+    database.add_practice_problem(
+        lesson_id, "Half of 4?", "2", ["4 / 2"], [], "easy", 1
+    )
+    database.add_practice_problem(
+        lesson_id, "Half of 6?", "3", ["6 / 2"], [], "easy", 2
+    )
+
+
+def test_first_sync_inserts_then_is_idempotent(db_path):
+    diff = sync_curriculum([seed_v1], apply=False)
+    assert diff.summary()["lessons"]["new"] == 1
+    assert database.get_all_subjects() == []
+
+    sync_curriculum([seed_v1])
+    assert [s["name"] for s in database.get_all_subjects()] == ["Math"]
+
+    again = sync_curriculum([seed_v1], apply=False)
+    assert not again.has_changes
+    assert again.unchanged["practice_problems"] == 1
+
+
+def test_changed_rows_update_in_place_and_keep_progress(db_path):
+    sync_curriculum([seed_v1])
+    lesson = database.search_lessons("Halves")[0]
+    problem = database.get_practice_problems_by_lesson(lesson["id"])[0]
+    database.record_practice_attempt(lesson["id"], problem["id"], True)
+
+    diff = sync_curriculum([seed_v2])
+
+    assert diff.summary()["lessons"]["changed"] == 1
+    assert diff.summary()["practice_problems"]["new"] == 1
+    assert diff.summary()["topics"]["unchanged"] == 1
+
+    updated = database.get_lesson_by_id(lesson["id"])
+    assert updated["description"] == "Split into two equal parts"
+    assert len(database.get_practice_problems_by_lesson(lesson["id"])) == 2
+    assert database.get_lesson_progress(lesson["id"])["total_problems"] == 1
+
+
+def test_legacy_rows_match_without_stored_hashes(db_path):
+    seed_v1()  # seeded the old way, content_hash is NULL
+
+    diff = sync_curriculum([seed_v1], apply=False)
+
+    assert not diff.has_changes
+    conn = get_connection()
+    try:
+        assert conn.execute("SELECT content_hash FROM lessons").fetchone()[0] is None
+    finally:
+        conn.close()
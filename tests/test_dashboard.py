@@ -0,0 +1,150 @@
+"""
+Tests for the parent dashboard stats query (services/lessons/dashboard.py)
+"""
+
+from datetime import date, timedelta
+
+import pytest
+import sqlalchemy
+from flask import Flask
+
+from models.database import (
+    Assignment,
+    ChildProfile,
+    LessonItem,
+    LessonPlan,
+    Submission,
+    User,
+    db,
+)
+from services.lessons.dashboard import get_children_stats
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'tutor.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def add_child(parent, name):
+    child = ChildProfile(
+        user_id=parent.id, name=name, username=name, password_hash="x", grade=3
+    )
+    db.session.add(child)
+    db.session.flush()
+    plan = LessonPlan(child_id=child.id, week_start_date=TODAY)
+    db.session.add(plan)
+    db.session.flush()
+    item = LessonItem(lesson_plan_id=plan.id, subject="Math", type="lesson")
+    db.session.add(item)
+    db.session.flush()
+    return child, item
+
+
+def add_assignments(child, item, day, statuses):
+    assignments = [
+        Assignment(child_id=child.id, lesson_item_id=item.id, date=day, status=status)
+        for status in statuses
+    ]
+    db.session.add_all(assignments)
+    db.session.flush()
+    return assignments
+
+
+def test_stats_for_every_child_in_one_query(app):
+    parent = User(email="a@example.com", password_hash="x")
+    other = User(email="b@example.com", password_hash="x")
+    db.session.add_all([parent, other])
+    db.session.flush()
+
+    busy, busy_item = add_child(parent, "busy")
+    idle, _ = add_child(parent, "idle")
+    stranger, stranger_item = add_child(other, "stranger")
+
+    done = add_assignments(
+        busy, busy_item, TODAY, ["completed", "completed", "pending", "in_progress"]
+    )
+    add_assignments(
+        busy, busy_item, TODAY - timedelta(days=1), ["completed", "pending"]
+    )
+    add_assignments(stranger, stranger_item, TODAY, ["completed"])
+    db.session.add_all(
+        [
+            Submission(assignment_id=done[0].id, child_id=busy.id),
+            Submission(assignment_id=done[1].id, child_id=busy.id, score=90),
+            Submission(assignment_id=done[2].id, child_id=busy.id),
+        ]
+    )
+    db.session.commit()
+    parent_id = parent.id
+    db.session.expunge_all()
+
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        stats = get_children_stats(parent_id, TODAY)
+        names = [s["child"].name for s in stats]
+    finally:
+        sqlalchemy.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+    assert len(statements) == 1
+    assert names == ["busy", "idle"]
+    assert [
+        (s["today_assignments"], s["completed_today"], s["pending_reviews"])
+        for s in stats
+    ] == [(4, 2, 2), (0, 0, 0)]
+
+
+def test_counts_follow_assignment_and_submission_changes(app):
+    parent = User(email="a@example.com", password_hash="x")
+    db.session.add(parent)
+    db.session.flush()
+    child, item = add_child(parent, "kid")
+    (assignment,) = add_assignments(child, item, TODAY, ["pending"])
+    db.session.commit()
+
+    def counts():
+        (stat,) = get_children_stats(parent.id, TODAY)
+        return stat["completed_today"], stat["pending_reviews"]
+
+    assert counts() == (0, 0)
+    assignment.status = "completed"
+    submission = Submission(assignment_id=assignment.id, child_id=child.id)
+    db.session.add(submission)
+    db.session.commit()
+    assert counts() == (1, 1)
+
+    submission.score = 100
+    db.session.commit()
+    assert counts() == (1, 0)
+
+
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (
+            "SELECT count(*) FROM assignments WHERE child_id = 1 "
+            "AND date = '2026-10-19' AND status = 'completed'",
+            "ix_assignments_child_date_status",
+        ),
+        (
+            "SELECT count(*) FROM submissions WHERE child_id = 1 AND score IS NULL",
+            "ix_submissions_child_score",
+        ),
+    ],
+)
+def test_counts_use_covering_indexes(app, query, index):
+    with db.engine.connect() as conn:
+        plan = str(conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}").fetchall())
+    assert f"COVERING INDEX {index}" in plan
@@ -0,0 +1,81 @@
+"""
+Tests for versioned schema migrations in database.py
+"""
+
+import pytest
+
+import database
+from database import (
+    SCHEMA_MIGRATIONS,
+    close_pools,
+    get_connection,
+    get_schema_version,
+    init_database,
+    migrate_database,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "migrations.db")
+    monkeypatch.setenv("DATABASE_URL", path)
+    yield path
+    close_pools()
+
+
+def _index_names():
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+        ).fetchall()
+        return {row[0] for row in rows}
+    finally:
+        conn.close()
+
+
+def test_init_database_applies_all_migrations(db_path):
+    init_database()
+
+    assert get_schema_version() == SCHEMA_MIGRATIONS[-1][0]
+    assert {
+        "idx_topics_subject",
+        "idx_lessons_topic",
+        "idx_practice_problems_lesson",
+        "idx_student_progress_lesson_problem",
+        "idx_api_cache_key",
+    } <= _index_names()
+
+
+def test_migrate_is_idempotent_and_analyzes(db_path):
+    init_database()
+    database.add_subject("Math")
+
+    assert migrate_database() == []
+
+    conn = get_connection()
+    try:
+        has_stats = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert has_stats == 1
+
+
+def test_hot_query_uses_index(db_path):
+    init_database()
+    conn = get_connection()
+    try:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM lessons WHERE topic_id = ? "
+                "ORDER BY display_order, title",
+                (1,),
+            )
+        )
+    finally:
+        conn.close()
+    assert "idx_lessons_topic" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,106 @@
+"""
+Tests for the pooled SQLite connection manager in database.py
+"""
+
+import threading
+
+import pytest
+
+import database
+from database import (
+    ConnectionPool,
+    PoolTimeoutError,
+    close_pools,
+    get_connection,
+    get_pool,
+    init_database,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point database.py at a fresh temporary file."""
+    path = str(tmp_path / "pool_test.db")
+    monkeypatch.setenv("DATABASE_URL", path)
+    yield path
+    close_pools()
+
+
+def test_connections_are_reused(db_path):
+    init_database()
+    checkouts = get_pool(db_path).stats()["checkouts"]
+    database.add_subject("Math")
+    database.get_all_subjects()
+
+    stats = get_pool(db_path).stats()
+    assert stats["connections_created"] == 1
+    assert stats["checkouts"] == checkouts + 2
+    assert stats["in_use"] == 0
+    assert stats["idle_connections"] == 1
+
+
+def test_pragmas_applied(db_path):
+    conn = get_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    finally:
+        conn.close()
+
+
+def test_double_close_is_harmless(db_path):
+    conn = get_connection()
+    conn.close()
+    conn.close()
+
+    stats = get_pool(db_path).stats()
+    assert stats["in_use"] == 0
+    assert stats["idle_connections"] == 1
+
+
+def test_uncommitted_work_is_rolled_back_on_release(db_path):
+    init_database()
+    conn = get_connection()
+    conn.execute("INSERT INTO subjects (name) VALUES ('Uncommitted')")
+    conn.close()
+
+    assert database.get_all_subjects() == []
+
+
+def test_pool_waits_then_times_out(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "small.db"), max_connections=1, timeout=0.2)
+    conn = pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    # A waiter is served as soon as the connection comes back
+    timer = threading.Timer(0.05, conn.close)
+    timer.start()
+    second = pool.acquire()
+    second.close()
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["waits"] >= 1
+    assert stats["max_wait_ms"] > 0
+    pool.close()
+
+
+def test_request_reuses_single_connection(db_path):
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.config["DATABASE_URL"] = db_path
+    database.init_app(app)
+
+    with app.app_context():
+        init_database()
+        first = get_connection()
+        first.close()
+        assert get_connection() is first
+        database.get_all_subjects()
+
+    stats = get_pool(db_path).stats()
+    assert stats["checkouts"] == 1
+    assert stats["in_use"] == 0
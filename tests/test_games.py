@@ -0,0 +1,190 @@
+"""
+Tests for the multiplayer games blueprint across workers (blueprints/games.py)
+"""
+
+import multiprocessing
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from flask import Flask
+from flask_socketio import SocketIO
+
+from blueprints import games
+from services.state_manager import (
+    _JOIN_ROOM_LUA,
+    _LEAVE_ROOM_LUA,
+    _START_GAME_LUA,
+    GameRoomManager,
+    StateManager,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+redis = pytest.importorskip("redis")
+socketio_client = pytest.importorskip("socketio")
+
+
+def make_worker(redis_client, message_queue=None):
+    """One app worker: its own Redis connection, manager and SocketIO."""
+    games.game_room_manager = GameRoomManager(StateManager(redis_client=redis_client))
+    app = Flask(__name__)
+    app.register_blueprint(games.games_bp, url_prefix="/games")
+    socketio = SocketIO(app, message_queue=message_queue)
+    games.register_socket_events(socketio)
+    return app, socketio
+
+
+def _serve_worker(redis_url, port):
+    app, socketio = make_worker(redis.Redis.from_url(redis_url), redis_url)
+    socketio.run(
+        app, host="127.0.0.1", port=port, allow_unsafe_werkzeug=True, log_output=False
+    )
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def redis_url():
+    """A local Redis stand-in reachable over TCP from other processes."""
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    # The stand-in drops the connection on NOSCRIPT instead of letting the
+    # client fall back to SCRIPT LOAD, so load the room scripts up front.
+    client = redis.Redis(host=host, port=port)
+    for script in (_JOIN_ROOM_LUA, _LEAVE_ROOM_LUA, _START_GAME_LUA):
+        client.script_load(script)
+    client.close()
+    yield f"redis://{host}:{port}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def workers(redis_url):
+    """Two app processes sharing the Redis stand-in, like gunicorn workers."""
+    ctx = multiprocessing.get_context("spawn")
+    ports = [_free_port(), _free_port()]
+    processes = [
+        ctx.Process(target=_serve_worker, args=(redis_url, port), daemon=True)
+        for port in ports
+    ]
+    for process in processes:
+        process.start()
+
+    urls = [f"http://127.0.0.1:{port}" for port in ports]
+    for url in urls:
+        for _ in range(200):
+            try:
+                requests.get(f"{url}/games/api/games/rooms", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.05)
+    yield urls
+
+    for process in processes:
+        process.terminate()
+        process.join(timeout=5)
+
+
+@pytest.fixture
+def restore_manager():
+    manager = games.game_room_manager
+    yield
+    games.game_room_manager = manager
+
+
+def test_concurrent_joins_across_workers_never_overfill(workers):
+    first, second = workers
+    room_id = requests.post(
+        f"{first}/games/api/games/create-room",
+        json={"name": "Race", "max_players": 10},
+    ).json()["room_id"]
+
+    def join(i):
+        url = workers[i % 2]
+        return requests.post(f"{url}/games/api/games/join-room/{room_id}").status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(join, range(40)))
+
+    assert statuses.count(200) == 10
+    assert statuses.count(400) == 30
+    for url in workers:
+        rooms = requests.get(f"{url}/games/api/games/rooms").json()
+        assert [(r["id"], r["players"]) for r in rooms] == [(room_id, 10)]
+    response = requests.post(f"{second}/games/api/games/start-game/{room_id}")
+    assert response.json()["room"]["status"] == "playing"
+
+
+def test_broadcasts_reach_players_on_other_workers(workers):
+    first, second = workers
+    room_id = requests.post(f"{first}/games/api/games/create-room", json={}).json()[
+        "room_id"
+    ]
+    ada, bob = (
+        requests.post(
+            f"{url}/games/api/games/join-room/{room_id}", json={"name": name}
+        ).json()["player_id"]
+        for url, name in ((first, "Ada"), (second, "Bob"))
+    )
+
+    received = []
+    ada_socket = socketio_client.Client()
+    ada_socket.on("*", lambda event, data: received.append((event, data)))
+    ada_socket.connect(first)
+    ada_socket.call("join_game", {"room_id": room_id, "player_id": ada}, timeout=5)
+
+    bob_socket = socketio_client.Client()
+    bob_socket.connect(second)
+    bob_socket.call("join_game", {"room_id": room_id, "player_id": bob}, timeout=5)
+    requests.post(f"{second}/games/api/games/start-game/{room_id}")
+
+    deadline = time.time() + 5
+    while time.time() < deadline and "game_started" not in dict(received):
+        time.sleep(0.05)
+    ada_socket.disconnect()
+    bob_socket.disconnect()
+
+    events = dict(received)
+    assert events["player_joined"]["user_id"] == "Bob"
+    assert events["game_started"]["room"]["status"] == "playing"
+
+
+def test_socket_events_track_membership_and_clean_up(restore_manager):
+    app, socketio = make_worker(fakeredis.FakeRedis())
+    client = app.test_client()
+    room_id = client.post("/games/api/games/create-room", json={}).get_json()["room_id"]
+    ada, bob = (
+        client.post(
+            f"/games/api/games/join-room/{room_id}", json={"name": name}
+        ).get_json()["player_id"]
+        for name in ("Ada", "Bob")
+    )
+
+    ada_socket = socketio.test_client(app)
+    bob_socket = socketio.test_client(app)
+    ada_socket.emit("join_game", {"room_id": room_id, "player_id": ada})
+    bob_socket.emit("join_game", {"room_id": room_id, "player_id": bob})
+    bob_socket.get_received()
+
+    ada_events = [m["name"] for m in ada_socket.get_received()]
+    assert ada_events == ["player_joined", "player_joined"]
+
+    ada_socket.disconnect()
+    players = client.get(f"/games/api/games/leaderboard/{room_id}").get_json()
+    assert [p["name"] for p in players] == ["Bob"]
+    assert [m["name"] for m in bob_socket.get_received()] == ["player_left"]
+
+    stranger = socketio.test_client(app)
+    stranger.emit("join_game", {"room_id": room_id, "player_id": "nobody"})
+    assert stranger.get_received()[0]["name"] == "game_error"
@@ -0,0 +1,128 @@
+"""
+Tests for the pooled sync/async HTTP clients (open_learning/http_client.py)
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from open_learning import http_client
+from open_learning.http_client import (
+    AsyncHTTPClient,
+    close_sessions,
+    fetch_all,
+    get_http_stats,
+    sync_get,
+)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    /json          -> gzip-compressed JSON echoing the Accept-Encoding header
+    /slow          -> sleeps 2s
+    /flaky/<key>   -> 503 on the first call for <key>, then 200
+    """
+
+    protocol_version = "HTTP/1.1"
+    seen = set()
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(2)
+        if self.path.startswith("/flaky/") and self.path not in self.seen:
+            self.seen.add(self.path)
+            self._send(503, b"try again", {})
+            return
+
+        body = json.dumps(
+            {"path": self.path, "accept_encoding": self.headers.get("Accept-Encoding")}
+        ).encode()
+        headers = {"Content-Type": "application/json"}
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers):
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    close_sessions()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    close_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_get_reuses_one_connection_per_host(server_url):
+    for _ in range(5):
+        data = sync_get(f"{server_url}/json")
+
+    assert "gzip" in data["accept_encoding"]
+    host = get_http_stats()["sync"]["hosts"][server_url]
+    assert host == {"requests": 5, "connections_opened": 1}
+    assert get_http_stats()["sync"]["reuse_rate"] == 0.8
+
+
+def test_sync_get_retries_transient_errors(server_url):
+    assert sync_get(f"{server_url}/flaky/sync")["path"] == "/flaky/sync"
+
+
+def test_async_client_reuses_connections_and_decompresses(server_url):
+    before = get_http_stats()["async"]
+
+    async def run():
+        async with AsyncHTTPClient(limit_per_host=2) as client:
+            first = await client.get_json(f"{server_url}/json")
+            for _ in range(4):
+                await http_client.async_get(f"{server_url}/json")
+            return first
+
+    first = asyncio.run(run())
+
+    after = get_http_stats()["async"]
+    assert first["path"] == "/json"
+    assert after["requests"] - before["requests"] == 5
+    assert after["connections_opened"] - before["connections_opened"] == 1
+    assert after["connections_reused"] - before["connections_reused"] == 4
+
+
+def test_async_client_retries_like_sync(server_url):
+    async def run():
+        async with AsyncHTTPClient() as client:
+            return await client.get_json(f"{server_url}/flaky/async")
+
+    assert asyncio.run(run())["path"] == "/flaky/async"
+
+
+def test_fetch_all_returns_partial_results_at_deadline(server_url):
+    start = time.perf_counter()
+    results = fetch_all(
+        {"fast": f"{server_url}/json", "slow": f"{server_url}/slow"}, deadline=0.5
+    )
+
+    assert results["fast"]["path"] == "/json"
+    assert "error" in results["slow"]
+    assert time.perf_counter() - start < 1.5
@@ -0,0 +1,229 @@
+"""
+Tests for practice recording and review queues (services/mastery/)
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy
+from flask import Flask
+from flask_migrate import Migrate, downgrade, upgrade
+
+from models.database import PracticeEvent, Skill, SkillState, db
+from services.mastery import review_queue
+from services.mastery.engine import MasteryEngine
+from services.state_manager import StateManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    queue = review_queue.ReviewQueue(StateManager(redis_client=fakeredis.FakeRedis()))
+    monkeypatch.setattr(review_queue, "review_queue", queue)
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'tutor.db'}"
+    db.init_app(app)
+    Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@contextmanager
+def recorded(statements, commits):
+    """Collect SQL statements and commits issued inside the block."""
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def on_commit(session):
+        commits.append(session)
+
+    sqlalchemy.event.listen(db.engine, "before_cursor_execute", on_execute)
+    sqlalchemy.event.listen(db.session, "after_commit", on_commit)
+    try:
+        yield
+    finally:
+        sqlalchemy.event.remove(db.engine, "before_cursor_execute", on_execute)
+        sqlalchemy.event.remove(db.session, "after_commit", on_commit)
+
+
+def selects(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def legacy_level(history, current_level):
+    """The level rule as it was applied to the full history blob."""
+    if len(history) < 3:
+        return min(1, current_level + 1) if history[-1]["success"] else current_level
+    recent = history[-5:]
+    success_rate = sum(1 for h in recent if h["success"]) / len(recent)
+    if success_rate >= 0.9 and len(history) >= 5:
+        return min(5, current_level + 1)
+    elif success_rate >= 0.75:
+        return min(4, current_level + 1)
+    elif success_rate >= 0.6:
+        return min(3, current_level)
+    elif success_rate < 0.4:
+        return max(1, current_level - 1)
+    return current_level
+
+
+def test_record_practice_appends_events_and_keeps_a_window(app):
+    outcomes = [True, False, True, True, True, False, True, True, True, True, False]
+    history, level = [], 0
+
+    for i, success in enumerate(outcomes):
+        state = MasteryEngine.record_practice(1, 7, success, score=i)
+        history.append({"success": success})
+        level = legacy_level(history, level)
+        assert state.level == level
+
+    assert state.evidence_count == len(outcomes)
+    assert [h["score"] for h in state.recent] == [6, 7, 8, 9, 10]
+    assert state.history_json is None
+    assert PracticeEvent.query.filter_by(child_id=1, skill_id=7).count() == 11
+    assert [h["score"] for h in state.history] == list(range(11))
+
+
+def test_migration_backfills_history_blobs(app):
+    # Roll the schema back to what existed before the event log
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE practice_events")
+        conn.exec_driver_sql("ALTER TABLE skill_states DROP COLUMN recent_json")
+        history = [
+            {
+                "date": f"2024-01-{day:02d}T10:00:00",
+                "success": day % 3 != 0,
+                "score": day,
+            }
+            for day in range(1, 9)
+        ]
+        conn.exec_driver_sql(
+            "INSERT INTO skill_states (child_id, skill_id, level, evidence_count, "
+            "history_json) VALUES (1, 7, 2, 8, ?)",
+            (json.dumps(history),),
+        )
+
+    upgrade(directory=MIGRATIONS)
+
+    state = SkillState.query.filter_by(child_id=1, skill_id=7).one()
+    assert state.history_json is None
+    assert state.recent == history[-5:]
+    assert state.history == [
+        {"date": h["date"], "success": h["success"], "score": float(h["score"])}
+        for h in history
+    ]
+
+    # Practice continues from the backfilled window
+    state = MasteryEngine.record_practice(1, 7, True, score=9)
+    assert state.evidence_count == 9
+    assert len(state.recent) == 5
+    db.session.remove()
+
+    downgrade(directory=MIGRATIONS, revision="base")
+    with db.engine.connect() as conn:
+        restored = conn.exec_driver_sql(
+            "SELECT history_json FROM skill_states"
+        ).scalar()
+    assert [h["score"] for h in json.loads(restored)] == list(range(1, 10))
+
+
+def test_batch_matches_one_at_a_time_with_one_query_and_commit(app):
+    results = [
+        (child, skill, (child + skill + i) % 4 != 0, i)
+        for i in range(6)
+        for child in (1, 2)
+        for skill in (10, 11, 12)
+    ]
+    MasteryEngine.record_practice(1, 10, True, score=0)  # an existing state
+
+    statements, commits = [], []
+    with recorded(statements, commits):
+        states = MasteryEngine.record_practice_batch(results)
+
+    assert len(commits) == 1
+    assert len(selects(statements)) == 1
+
+    for child, skill, success, score in [(1, 10, True, 0)] + results:
+        MasteryEngine.record_practice(child + 100, skill, success, score)
+    for (child, skill), state in states.items():
+        expected = SkillState.query.filter_by(
+            child_id=child + 100, skill_id=skill
+        ).one()
+        assert (state.level, state.evidence_count) == (
+            expected.level,
+            expected.evidence_count,
+        )
+        assert [h["score"] for h in state.recent] == [
+            h["score"] for h in expected.recent
+        ]
+    assert PracticeEvent.query.filter(PracticeEvent.child_id < 100).count() == 37
+
+
+def test_review_queue_is_patched_not_rebuilt(app):
+    MasteryEngine.record_practice_batch(
+        [(1, skill, True, 90) for skill in (1, 2, 3)] + [(2, 9, True, 90)]
+    )
+    next_month = datetime.utcnow() + timedelta(days=30)
+    assert MasteryEngine.get_skills_for_review(1) == []
+    assert review_queue.review_queue.due(1, next_month) == [1, 2, 3]
+
+    for _ in range(2):
+        MasteryEngine.record_practice(1, 2, True, 100)  # level 2: due in a week
+
+    statements, commits = [], []
+    with recorded(statements, commits):
+        due = review_queue.review_queue.due(1, next_month)
+    assert due == [1, 3, 2]
+    assert statements == []
+
+    state = SkillState.query.filter_by(child_id=1, skill_id=1).one()
+    state.next_due = datetime.utcnow() - timedelta(days=1)
+    db.session.commit()
+    review_queue.review_queue.update(1, [state])
+    assert [s.skill_id for s in MasteryEngine.get_skills_for_review(1)] == [1]
+
+
+def test_review_queries_use_the_composite_index(app):
+    with db.engine.connect() as conn:
+        plan = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT next_due, level, skill_id FROM skill_states "
+            "WHERE child_id = 1 AND level < 5 AND next_due IS NOT NULL "
+            "ORDER BY next_due, level"
+        ).fetchall()
+    assert "ix_skill_states_child_due_level" in str(plan)
+    assert "TEMP B-TREE" not in str(plan)
+
+
+def test_due_today_for_all_children_is_one_query(app):
+    db.session.add_all(
+        [Skill(id=skill, standard_id=1, name=f"Skill {skill}") for skill in (1, 2)]
+    )
+    now = datetime.utcnow()
+    for child, skill, due in [
+        (1, 1, now - timedelta(days=2)),
+        (1, 2, now + timedelta(days=3)),
+        (2, 2, now),
+        (3, 1, now - timedelta(days=1)),
+    ]:
+        db.session.add(
+            SkillState(child_id=child, skill_id=skill, level=2, next_due=due)
+        )
+    db.session.commit()
+    db.session.expunge_all()
+
+    statements, commits = [], []
+    with recorded(statements, commits):
+        due = MasteryEngine.get_due_today([1, 2, 4], now)
+        names = {child: [s.skill.name for s in states] for child, states in due.items()}
+
+    assert names == {1: ["Skill 1"], 2: ["Skill 2"], 4: []}
+    assert len(selects(statements)) == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the bounded LRU/TTL cache (open_learning/cache.py)
+"""
+
+import threading
+import time
+
+import pytest
+
+from open_learning import cache
+from open_learning.cache import (
+    cache_get,
+    cache_get_or_refresh,
+    cache_set,
+    clear_cache,
+    clear_expired,
+    get_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    clear_cache()
+    monkeypatch.setattr(cache, "_stats", dict.fromkeys(cache._stats, 0))
+    yield
+    clear_cache()
+
+
+def test_lru_eviction_by_entry_count(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_MAX_ENTRIES", 2)
+    cache_set("a", 1)
+    cache_set("b", 2)
+    assert cache_get("a") == 1  # "b" is now least recently used
+    cache_set("c", 3)
+
+    assert cache_get("b") is None
+    assert cache_get("a") == 1 and cache_get("c") == 3
+    assert get_cache_stats()["evictions"] == 1
+
+
+def test_eviction_by_memory_and_accounting(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_MAX_BYTES", 5000)
+    for i in range(10):
+        cache_set(f"page:{i}", "x" * 1000)
+
+    stats = get_cache_stats()
+    assert stats["memory_bytes"] <= 5000
+    assert stats["total_entries"] == 4
+    assert cache_get("page:9") is not None
+
+    clear_cache()
+    assert get_cache_stats()["memory_bytes"] == 0
+
+
+def test_expired_entries_miss_and_are_swept():
+    cache_set("old", "value", ttl=-1, stale_ttl=0)
+    cache_set("new", "value", ttl=60)
+
+    assert cache_get("old") is None
+    assert clear_expired() == 1
+    stats = get_cache_stats()
+    assert stats["total_entries"] == 1
+    assert stats["hits"] == 0 and stats["misses"] == 1
+
+
+def test_stale_value_is_served_while_refreshing():
+    refreshed = threading.Event()
+
+    def loader():
+        time.sleep(0.1)
+        refreshed.set()
+        return "fresh"
+
+    cache_set("hot", "stale", ttl=-1, stale_ttl=60)
+
+    start = time.perf_counter()
+    assert cache_get_or_refresh("hot", loader) == "stale"
+    assert cache_get_or_refresh("hot", loader) == "stale"  # refresh already queued
+    assert time.perf_counter() - start < 0.1
+
+    assert refreshed.wait(2)
+    for _ in range(50):
+        if cache_get("hot") == "fresh":
+            break
+        time.sleep(0.01)
+    assert cache_get("hot") == "fresh"
+    stats = get_cache_stats()
+    assert stats["stale_hits"] == 2
+    assert stats["refreshes"] == 1
+
+
+def test_miss_loads_synchronously_and_skips_none():
+    assert cache_get_or_refresh("k", lambda: "loaded") == "loaded"
+    assert cache_get("k") == "loaded"
+
+    assert cache_get_or_refresh("missing", lambda: None) is None
+    assert get_cache_stats()["total_entries"] == 1
@@ -0,0 +1,159 @@
+"""
+Tests for the concurrent open learning fan-out (open_learning/fanout.py)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+
+from open_learning import fanout, router
+from open_learning.fanout import fan_out, iter_fan_out
+from open_learning.http_client import sync_get
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """GET /<seconds> sleeps that long, then answers with JSON."""
+
+    def do_GET(self):
+        delay = float(self.path.strip("/") or 0)
+        time.sleep(delay)
+        body = json.dumps({"delay": delay}).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up at its deadline
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_latency_is_the_slowest_source_not_the_sum(stub_url):
+    delays = {"a": 0.1, "b": 0.3, "c": 0.5}
+    calls = {
+        name: (lambda d=delay: sync_get(f"{stub_url}/{d}"))
+        for name, delay in delays.items()
+    }
+
+    start = time.perf_counter()
+    results = fan_out(calls, deadline=5)
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == ["a", "b", "c"]
+    assert all(r.status == "ok" for r in results.values())
+    assert results["c"].value == {"delay": 0.5}
+    assert results["a"].elapsed_ms < results["c"].elapsed_ms
+    assert elapsed < sum(delays.values())
+
+
+def test_slow_source_times_out_without_blocking_the_rest(stub_url):
+    calls = {
+        "fast": lambda: sync_get(f"{stub_url}/0.05"),
+        "slow": lambda: sync_get(f"{stub_url}/3"),
+    }
+
+    start = time.perf_counter()
+    order = [r.name for r in iter_fan_out(calls, deadline=0.5)]
+    results = fan_out(calls, deadline=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert order[0] == "fast"
+    assert results["fast"].status == "ok"
+    assert results["slow"].status in ("timeout", "error")
+    assert elapsed < 2.5
+
+
+def test_failing_source_is_reported_not_raised():
+    def broken():
+        raise ValueError("upstream returned garbage")
+
+    results = fan_out({"ok": lambda: [1], "broken": broken}, deadline=1)
+
+    assert results["ok"].value == [1]
+    assert results["broken"].status == "error"
+    assert "garbage" in results["broken"].error
+
+
+def test_saturated_pool_turns_new_sources_away(monkeypatch):
+    monkeypatch.setattr(fanout, "_slots", threading.BoundedSemaphore(2))
+    release = threading.Event()
+    calls = dict.fromkeys(("a", "b", "c"), release.wait)
+
+    start = time.perf_counter()
+    results = fan_out(calls, deadline=0.3)
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert [r.status for r in results.values()] == ["timeout", "timeout", "busy"]
+    assert results["c"].elapsed_ms == 0.0
+    assert elapsed < 1
+
+    # Slots come back as the stuck sources finish
+    time.sleep(0.1)
+    assert fan_out({"d": lambda: 1}, deadline=1)["d"].value == 1
+
+
+class StubAPIs:
+    """Stands in for ALL_50_APIS.all_apis, every source served by the stub."""
+
+    def __init__(self, url, slow):
+        self.url = url
+        self.slow = slow
+
+    def _get(self, name, delay=0.05):
+        return {"source": name, **sync_get(f"{self.url}/{delay}")}
+
+    def __getattr__(self, name):
+        delay = 3 if name == self.slow else 0.05
+        return lambda *args: self._get(name, delay)
+
+
+@pytest.fixture
+def client(stub_url, monkeypatch):
+    monkeypatch.setattr(router, "all_apis", StubAPIs(stub_url, slow="gbif_species"))
+    app = Flask(__name__)
+    app.register_blueprint(router.bp)
+    return app.test_client()
+
+
+def test_mega_search_returns_partial_results_at_deadline(client):
+    start = time.perf_counter()
+    response = client.get("/api/open/mega-search/fractions?deadline=0.6")
+    elapsed = time.perf_counter() - start
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["content"]["wikipedia"]["source"] == "wikipedia_summary"
+    assert data["status"]["gbif"] in ("timeout", "error")
+    assert "error" in data["content"]["gbif"]
+    assert data["summary"]["successful"] == 7
+    assert set(data["timings"]) == set(data["status"])
+    assert elapsed < 2.5
+
+
+def test_mega_search_streams_ndjson(client):
+    response = client.get("/api/open/mega-search/fractions?deadline=0.6&stream=1")
+
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert response.mimetype == "application/x-ndjson"
+    assert lines[-1]["done"] is True
+    assert lines[-2]["source"] == "gbif"
+    assert {line["source"] for line in lines[:-1]} >= {"wikipedia", "pubchem"}
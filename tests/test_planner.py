@@ -0,0 +1,125 @@
+"""
+Tests for weekly and household lesson planning (services/lessons/planner.py)
+"""
+
+from datetime import date
+
+import pytest
+import sqlalchemy
+from flask import Flask
+
+from models.database import (
+    Assignment,
+    ChildProfile,
+    LessonItem,
+    Skill,
+    Standard,
+    User,
+    db,
+)
+from services.lessons.planner import WeeklyPlanner
+
+SUBJECTS = ["Math", "ELA", "Science", "Social Studies", "Art", "Music"]
+WEEK = date(2026, 10, 19)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'tutor.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def children(app):
+    for grade in (2, 4):
+        for subject in SUBJECTS:
+            standard = Standard(
+                subject=subject, grade=grade, code=f"{subject}.{grade}", name=subject
+            )
+            db.session.add(standard)
+            db.session.flush()
+            for n in range(3):
+                db.session.add(
+                    Skill(standard_id=standard.id, name=f"{subject} {grade}.{n}")
+                )
+    parent = User(email="parent@example.com", password_hash="x")
+    db.session.add(parent)
+    db.session.flush()
+    kids = [
+        ChildProfile(
+            user_id=parent.id,
+            name=f"Child {n}",
+            username=f"child{n}",
+            password_hash="x",
+            grade=grade,
+        )
+        for n, grade in enumerate((2, 4, 4))
+    ]
+    db.session.add_all(kids)
+    db.session.commit()
+    return kids
+
+
+def test_generate_week_creates_items_and_assignments(children):
+    child = children[0]
+    lesson_plan = WeeklyPlanner(child).generate_week(WEEK, ["Math", "ELA", "Poetry"])
+
+    items = lesson_plan.lesson_items.all()
+    assert len(items) == 10  # No skills for Poetry
+    assert {i.subject for i in items} == {"Math", "ELA"}
+    for item in items:
+        skill = db.session.get(Skill, item.skill_ids[0])
+        assert (skill.standard.grade, skill.standard.subject) == (2, item.subject)
+
+    assignments = Assignment.query.filter_by(child_id=child.id).all()
+    assert sorted(a.lesson_item_id for a in assignments) == sorted(i.id for i in items)
+    assert sorted({a.date.toordinal() - WEEK.toordinal() for a in assignments}) == [
+        0,
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_plan_household_batches_queries_and_inserts(children):
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        lesson_plans, timings = WeeklyPlanner.plan_household(children, WEEK, SUBJECTS)
+    finally:
+        sqlalchemy.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+    skill_queries = [s for s in statements if "FROM skills" in s]
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(skill_queries) == 1
+    assert len([s for s in inserts if "lesson_items" in s]) == 1
+    assert len([s for s in inserts if "assignments" in s]) == 1
+    # Plus the one-off scope-and-sequence graph load on a cold cache
+    graph_tables = ("curriculum_version", "FROM standards", "FROM skill_prerequisites")
+    graph_load = [s for s in statements if any(t in s for t in graph_tables)]
+    assert timings["queries"] == len(statements)
+    assert len(statements) - len(graph_load) <= 10
+    assert timings["items"] == 90
+    assert set(timings) >= {"skills_ms", "build_ms", "insert_ms", "total_ms"}
+
+    assert [p.child_id for p in lesson_plans] == [c.id for c in children]
+    for lesson_plan in lesson_plans:
+        grade = db.session.get(ChildProfile, lesson_plan.child_id).grade
+        items = lesson_plan.lesson_items.all()
+        assert len(items) == 30
+        for item in items:
+            assignment = item.assignments.one()
+            assert assignment.child_id == lesson_plan.child_id
+            skill = db.session.get(Skill, item.skill_ids[0])
+            assert skill.standard.grade == grade
+    assert LessonItem.query.count() == Assignment.query.count() == 90
@@ -0,0 +1,229 @@
+"""
+Tests for the content-addressed PDF cache (services/rendering/cache.py)
+"""
+
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+
+from blueprints.parent import routes
+from certificate_generator import CertificateGenerator
+from models.database import (
+    Assignment,
+    ChildProfile,
+    LessonItem,
+    LessonPlan,
+    Submission,
+    User,
+    db,
+)
+from services import jobs, worksheet_service
+from services.rendering import cache as render_cache
+from services.rendering import reports
+from services.rendering.cache import RenderCache, render_key
+from services.state_manager import StateManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def pdf_cache(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path / "render_cache"), max_bytes=10_000_000)
+    for module in (reports, routes, worksheet_service):
+        monkeypatch.setattr(module, "pdf_cache", cache)
+    return cache
+
+
+def test_keys_cover_data_and_template_version(monkeypatch):
+    key = render_key("transcript", {"b": 1, "a": [date(2026, 10, 19)]})
+    assert key == render_key("transcript", {"a": [date(2026, 10, 19)], "b": 1})
+    assert key != render_key("transcript", {"a": [date(2026, 10, 20)], "b": 1})
+    assert key != render_key("weekly_report", {"a": [date(2026, 10, 19)], "b": 1})
+
+    monkeypatch.setitem(render_cache.TEMPLATE_VERSIONS, "transcript", 2)
+    assert key != render_key("transcript", {"b": 1, "a": [date(2026, 10, 19)]})
+
+
+def test_least_recently_used_files_are_evicted_past_the_cap(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=3500)
+    for n, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, b"x" * 1000)
+        os.utime(cache._path(key), (time.time() - 100 + n, time.time() - 100 + n))
+
+    assert cache.get("aa1") is not None  # Now the most recently used
+    cache.put("dd4", b"x" * 1000)
+
+    assert cache.get("bb2") is None
+    assert [cache.get(k) is not None for k in ("aa1", "cc3", "dd4")] == [True] * 3
+
+
+def test_renders_run_once_per_distinct_input(pdf_cache):
+    calls = []
+    generator = worksheet_service.WorksheetGenerator()
+    guide = {"sections": [{"title": "Roots", "content": "Plants drink water."}]}
+
+    first = generator.generate_study_guide("Plants", guide).getvalue()
+    second = generator.generate_study_guide("Plants", guide).getvalue()
+    other = generator.generate_study_guide("Animals", guide).getvalue()
+    assert first == second != other
+    assert first.startswith(b"%PDF")
+
+    def render():
+        calls.append(1)
+        return b"%PDF-1.4"
+
+    for _ in range(3):
+        pdf_cache.get_or_render("worksheet", {"topic": "x"}, render)
+    assert len(calls) == 1
+
+
+def test_study_guides_are_cached_but_random_worksheets_are_not(pdf_cache):
+    generator = worksheet_service.WorksheetGenerator()
+    content = {"sections": [{"title": "Fractions", "content": "Parts of a whole"}]}
+
+    first = generator.generate_study_guide("Fractions", content).getvalue()
+    again = generator.generate_study_guide("Fractions", content).getvalue()
+    assert first == again
+    assert len(os.listdir(pdf_cache.folder)) == 1
+
+    generator.generate_math_worksheet("Addition", 3, 10)
+    generator.generate_quiz("Capitals", [{"question": "?", "answer": "A"}] * 3)
+    assert len(os.listdir(pdf_cache.folder)) == 1
+
+
+def test_certificates_reuse_identical_renders(tmp_path, monkeypatch, pdf_cache):
+    import certificate_generator
+
+    monkeypatch.setattr(certificate_generator, "pdf_cache", pdf_cache)
+    monkeypatch.chdir(tmp_path)
+    gen = CertificateGenerator()
+
+    path = gen.generate_certificate("Sam Lee", "Fractions", date="October 19, 2026")
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "rb") as f:
+        pdf = f.read()
+    assert pdf.startswith(b"%PDF")
+
+    again = gen.generate_certificate("Sam Lee", "Fractions", date="October 19, 2026")
+    assert again == path
+    assert os.stat(path).st_mtime_ns == mtime  # Same bytes, so the ETag holds
+    with open(path, "rb") as f:
+        assert f.read() == pdf
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, pdf_cache):
+    state = StateManager(redis_client=fakeredis.FakeRedis())
+    monkeypatch.setattr(jobs, "state_manager", state)
+    monkeypatch.setattr(routes, "job_queue", jobs.JobQueue(state, use_rq=False))
+
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'tutor.db'}",
+        SECRET_KEY="test",
+    )
+    db.init_app(app)
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+    app.register_blueprint(routes.parent_bp)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def test_report_download_revalidates_and_changes_with_scores(app):
+    parent = User(email="parent@example.com", password_hash="x", role="parent")
+    db.session.add(parent)
+    db.session.flush()
+    child = ChildProfile(
+        user_id=parent.id, name="Sam", username="sam", password_hash="x", grade=3
+    )
+    db.session.add(child)
+    db.session.flush()
+    monday = date.today() - timedelta(days=date.today().weekday())
+    plan = LessonPlan(child_id=child.id, week_start_date=monday)
+    db.session.add(plan)
+    db.session.flush()
+    item = LessonItem(lesson_plan_id=plan.id, subject="Math", type="lesson")
+    db.session.add(item)
+    db.session.flush()
+    assignment = Assignment(
+        child_id=child.id, lesson_item_id=item.id, date=monday, status="completed"
+    )
+    db.session.add(assignment)
+    db.session.flush()
+    submission = Submission(assignment_id=assignment.id, child_id=child.id, score=70)
+    db.session.add(submission)
+    db.session.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(parent.id)
+
+    def download():
+        queued = client.post(f"/parent/reports/weekly/{child.id}")
+        assert queued.status_code == 202
+        job_id = queued.json["job_id"]
+        routes.job_queue.wait(job_id)
+        status = client.get(queued.json["status_url"]).json
+        assert status["status"] == "finished"
+        return client.get(status["download_url"])
+
+    first = download()
+    assert first.status_code == 200
+    assert first.data.startswith(b"%PDF")
+    etag = first.headers["ETag"]
+
+    again = download()
+    assert again.headers["ETag"] == etag
+    revalidated = client.get(again.request.path, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+    submission.score = 95
+    db.session.commit()
+    changed = download()
+    assert changed.headers["ETag"] != etag
+    assert (
+        client.get(changed.request.path, headers={"If-None-Match": etag}).status_code
+        == 200
+    )
+
+
+def test_report_requests_reuse_the_job_in_flight(app, monkeypatch):
+    parent = User(email="parent@example.com", password_hash="x", role="parent")
+    db.session.add(parent)
+    db.session.flush()
+    child = ChildProfile(
+        user_id=parent.id, name="Sam", username="sam", password_hash="x", grade=3
+    )
+    db.session.add(child)
+    db.session.commit()
+
+    release = threading.Event()
+
+    def slow_transcript(job_id, child_id):
+        release.wait(5)
+        return reports.transcript_job(job_id, child_id)
+
+    monkeypatch.setattr(routes, "transcript_job", slow_transcript)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(parent.id)
+
+    url = f"/parent/transcript/{child.id}"
+    assert client.get(url).status_code == 405  # Links and crawlers start nothing
+    first = client.post(url).json["job_id"]
+    assert client.post(url).json["job_id"] == first
+
+    release.set()
+    assert routes.job_queue.wait(first)["status"] == "finished"
+    again = client.post(url).json["job_id"]
+    assert again != first
+    routes.job_queue.wait(again)
@@ -0,0 +1,152 @@
+"""
+Tests for background report rendering (services/jobs.py, services/rendering/reports.py)
+"""
+
+from datetime import date, timedelta
+
+import pytest
+import sqlalchemy
+from flask import Flask
+
+from models.database import (
+    Assignment,
+    ChildProfile,
+    LessonItem,
+    LessonPlan,
+    Submission,
+    User,
+    db,
+)
+from services import jobs
+from services.rendering import reports
+from services.rendering.cache import RenderCache
+from services.rendering.reports import transcript_job, weekly_report_job
+from services.state_manager import StateManager
+
+fakeredis = pytest.importorskip("fakeredis")
+rq = pytest.importorskip("rq")
+
+WEEK = date(2026, 10, 19)
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = StateManager(redis_client=fakeredis.FakeRedis())
+    monkeypatch.setattr(jobs, "state_manager", state)
+    return state
+
+
+@pytest.fixture
+def pdf_cache(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path / "render_cache"), max_bytes=10_000_000)
+    monkeypatch.setattr(reports, "pdf_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def app(tmp_path, pdf_cache):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'tutor.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def child(app):
+    parent = User(email="parent@example.com", password_hash="x")
+    db.session.add(parent)
+    db.session.flush()
+    child = ChildProfile(
+        user_id=parent.id, name="Sam", username="sam", password_hash="x", grade=3
+    )
+    db.session.add(child)
+    db.session.flush()
+    plan = LessonPlan(child_id=child.id, week_start_date=WEEK)
+    db.session.add(plan)
+    db.session.flush()
+    for day in range(5):
+        for subject in ("Math", "ELA"):
+            item = LessonItem(lesson_plan_id=plan.id, subject=subject, type="lesson")
+            db.session.add(item)
+            db.session.flush()
+            assignment = Assignment(
+                child_id=child.id,
+                lesson_item_id=item.id,
+                date=WEEK + timedelta(days=day),
+                status="completed",
+            )
+            db.session.add(assignment)
+            db.session.flush()
+            db.session.add(
+                Submission(
+                    assignment_id=assignment.id, child_id=child.id, score=80 + day
+                )
+            )
+    db.session.commit()
+    return child.id
+
+
+def test_weekly_report_renders_off_request_with_prefetched_submissions(
+    app, state, child, pdf_cache
+):
+    queue = jobs.JobQueue(state, use_rq=False)
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        job_id = queue.enqueue(weekly_report_job, child, WEEK, owner_id=1)
+        job = queue.wait(job_id)
+    finally:
+        sqlalchemy.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+    assert job["backend"] == "local"
+    assert job["status"] == "finished", job.get("error")
+    assert job["kind"] == "weekly_report_job"
+    assert job["result"]["filename"] == f"weekly_report_Sam_{WEEK}.pdf"
+    assert pdf_cache.get(job["result"]["key"]).startswith(b"%PDF")
+    # Child, assignments with lesson items, submissions: not one per assignment
+    assert len(statements) == 3
+
+
+def test_rq_worker_runs_transcripts(app, state, child, pdf_cache):
+    queue = jobs.JobQueue(use_rq=True)
+    job_id = queue.enqueue(transcript_job, child, kind="transcript")
+    assert queue.get(job_id)["status"] == "queued"
+    assert queue.get(job_id)["backend"] == "rq"
+
+    rq_queue = rq.Queue(queue.name, connection=state.redis_client)
+    rq.SimpleWorker([rq_queue], connection=state.redis_client).work(burst=True)
+
+    job = queue.get(job_id)
+    assert job["status"] == "finished", job.get("error")
+    assert job["result"]["filename"] == "transcript_Sam.pdf"
+    assert pdf_cache.get(job["result"]["key"]).startswith(b"%PDF")
+
+
+def test_rq_is_used_only_when_a_worker_listens(state):
+    queue = jobs.JobQueue(state)
+    assert queue._rq_queue() is None
+
+    rq_queue = rq.Queue(queue.name, connection=state.redis_client)
+    worker = rq.Worker([rq_queue], connection=state.redis_client)
+    worker.register_birth()
+    try:
+        assert queue._rq_queue() is not None
+    finally:
+        worker.register_death()
+
+
+def failing_job(job_id):
+    raise ValueError("no data")
+
+
+def test_failures_are_recorded(app, state):
+    queue = jobs.JobQueue(state, use_rq=False)
+    job = queue.wait(queue.enqueue(failing_job))
+    assert (job["status"], job["error"]) == ("failed", "no data")
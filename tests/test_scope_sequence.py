@@ -0,0 +1,153 @@
+"""
+Tests for the cached scope-and-sequence graph (services/curriculum/scope_sequence.py)
+"""
+
+import pytest
+import sqlalchemy
+from flask import Flask
+
+from models.database import Skill, Standard, db
+from services.curriculum import scope_sequence
+from services.curriculum.seed import seed_database
+from services.curriculum.standards_map import StandardsMapper
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        scope_sequence, "scope_sequence_cache", scope_sequence.ScopeSequenceCache()
+    )
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'tutor.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def add_skills(grade, subject, specs):
+    """Add a standard per skill; specs are (name, difficulty, [prerequisite names])."""
+    skills = {}
+    for name, difficulty, _ in specs:
+        standard = Standard(
+            subject=subject, grade=grade, code=f"{subject}.{grade}.{name}", name=name
+        )
+        skills[name] = Skill(standard=standard, name=name, difficulty=difficulty)
+        db.session.add(skills[name])
+    for name, _, prerequisites in specs:
+        for prerequisite in prerequisites:
+            skills[name].prerequisites.append(skills[prerequisite])
+    db.session.commit()
+    return skills
+
+
+def names(skills):
+    return [s.name for s in skills]
+
+
+@pytest.fixture
+def statements(app):
+    recorded = []
+
+    def on_execute(conn, cursor, statement, *args):
+        recorded.append(statement)
+
+    sqlalchemy.event.listen(db.engine, "before_cursor_execute", on_execute)
+    yield recorded
+    sqlalchemy.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+
+def test_default_sequence_follows_prerequisites(app):
+    add_skills(
+        3,
+        "Math",
+        [
+            ("Fractions", "easy", ["Division"]),
+            ("Division", "medium", ["Multiplication"]),
+            ("Multiplication", "hard", []),
+            ("Time", "easy", []),
+            ("Place value", "medium", []),
+        ],
+    )
+    add_skills(3, "Science", [("Plants", "easy", [])])
+
+    assert names(scope_sequence.get_default_sequence(3, "Math")) == [
+        "Time",
+        "Place value",
+        "Multiplication",
+        "Division",
+        "Fractions",
+    ]
+    assert names(scope_sequence.get_default_sequence(3, "Science")) == ["Plants"]
+    assert scope_sequence.get_default_sequence(4, "Math") == []
+    assert [s.standard.subject for s in scope_sequence.get_default_sequence(3, "Math")]
+
+
+def test_cycles_and_outside_prerequisites_do_not_drop_skills(app):
+    earlier = add_skills(2, "Math", [("Counting", "easy", [])])
+    skills = add_skills(
+        3,
+        "Math",
+        [("A", "hard", ["B"]), ("B", "easy", ["A"]), ("C", "medium", [])],
+    )
+    skills["C"].prerequisites.append(earlier["Counting"])
+    db.session.commit()
+
+    assert names(scope_sequence.get_default_sequence(3, "Math")) == ["C", "B", "A"]
+
+
+def test_lookups_are_served_from_the_cache_until_invalidated(app, statements):
+    skills = add_skills(3, "Math", [("Add", "easy", []), ("Subtract", "medium", [])])
+    standard_id = skills["Add"].standard_id
+    assert names(scope_sequence.get_skills_for_grade_subject(3, "Math")) == [
+        "Add",
+        "Subtract",
+    ]
+
+    statements.clear()
+    for _ in range(3):
+        scope_sequence.get_default_sequence(3, "Math")
+        StandardsMapper.get_skill_progression(standard_id)
+        StandardsMapper.get_standards_for_grade_subject(3, "Math")
+        scope_sequence.get_skills_for_grade_subjects([(3, "Math"), (3, "ELA")])
+    assert statements == []
+
+    db.session.add(Skill(standard_id=standard_id, name="Count on", difficulty="easy"))
+    db.session.commit()
+    assert len(scope_sequence.get_skills_for_grade_subject(3, "Math")) == 2
+
+    statements.clear()
+    scope_sequence.invalidate()
+    assert names(StandardsMapper.get_skill_progression(standard_id)) == [
+        "Add",
+        "Count on",
+    ]
+    reads = [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert len(reads) == 4  # Version, standards, skills and prerequisite edges
+
+
+def test_invalidation_reaches_other_processes(app, monkeypatch):
+    monkeypatch.setattr(scope_sequence, "VERSION_CHECK_INTERVAL", 0)
+    add_skills(3, "Math", [("Add", "easy", [])])
+    # Another process shares only the database, not the state store
+    other = scope_sequence.ScopeSequenceCache()
+    assert len(other.graph().skills[(3, "Math")]) == 1
+
+    add_skills(3, "Math", [("Multiply", "hard", [])])
+    assert len(other.graph().skills[(3, "Math")]) == 1
+    scope_sequence.invalidate()
+    assert len(other.graph().skills[(3, "Math")]) == 2
+
+
+def test_seeding_invalidates_the_cache(app):
+    assert scope_sequence.get_default_sequence(3, "Math") == []
+    seed_database()
+
+    sequence = names(scope_sequence.get_default_sequence(3, "Math"))
+    assert len(sequence) == 5
+    assert (
+        sequence.index("Multiplication basics")
+        < sequence.index("Division basics")
+        < sequence.index("Fractions intro")
+    )
@@ -0,0 +1,151 @@
+"""
+Tests for the two-tier API response cache (open_learning/shared_cache.py)
+"""
+
+import threading
+import time
+
+import pytest
+
+from database import close_pools, init_database
+from open_learning import http_client, shared_cache
+from open_learning.cache import clear_cache
+from open_learning.schemas import ContentCard
+from open_learning.shared_cache import (
+    RedisBackend,
+    SQLiteBackend,
+    set_l2,
+    shared_cached,
+    shared_get_or_fetch,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(autouse=True)
+def fresh_tiers(monkeypatch):
+    clear_cache()
+    monkeypatch.setattr(shared_cache, "_stats", dict.fromkeys(shared_cache._stats, 0))
+    set_l2(RedisBackend(fakeredis.FakeRedis()))
+    yield
+    clear_cache()
+    set_l2(None)
+
+
+class CountingLoader:
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def test_concurrent_misses_make_one_upstream_call():
+    loader = CountingLoader({"answer": 42}, delay=0.2)
+    results = []
+
+    def worker():
+        results.append(shared_get_or_fetch("test", "key", loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.calls == 1
+    assert results == [{"answer": 42}] * 10
+    assert shared_cache.get_shared_cache_stats()["coalesced"] == 9
+
+
+def test_other_workers_are_served_from_redis():
+    card = ContentCard(source="Wikipedia", title="Fractions", meta={"pageid": 1})
+    loader = CountingLoader([card])
+    assert shared_get_or_fetch("test", "fractions", loader) == [card]
+
+    clear_cache()  # a different worker: empty L1, same Redis
+    cached = shared_get_or_fetch("test", "fractions", loader)
+
+    assert loader.calls == 1
+    assert cached == [card]
+    assert isinstance(cached[0], ContentCard)
+    assert shared_cache.get_shared_cache_stats()["l2_hits"] == 1
+
+
+def test_sqlite_fallback_is_shared(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "cache.db"))
+    init_database()
+    set_l2(SQLiteBackend())
+    try:
+        loader = CountingLoader({"pages": ["a", "b"]})
+        shared_get_or_fetch("test", "pages", loader, ttl=60)
+        clear_cache()
+
+        assert shared_get_or_fetch("test", "pages", loader, ttl=60) == {
+            "pages": ["a", "b"]
+        }
+        assert loader.calls == 1
+    finally:
+        close_pools()
+
+
+def test_decorator_keys_by_arguments_and_skips_empty_results():
+    calls = []
+
+    @shared_cached("test")
+    def lookup(term, limit=5):
+        calls.append(term)
+        return [term] * limit if term != "nothing" else []
+
+    assert lookup("cat", limit=2) == ["cat", "cat"]
+    assert lookup("cat", limit=2) == ["cat", "cat"]
+    assert lookup("dog") == ["dog"] * 5
+    assert lookup("nothing") == []
+    assert lookup("nothing") == []
+
+    assert calls == ["cat", "dog", "nothing", "nothing"]
+
+
+def test_failed_fetches_are_not_cached(monkeypatch):
+    redis = fakeredis.FakeRedis()
+    set_l2(RedisBackend(redis))
+    upstream = {"up": False}
+
+    def sync_get(url, params=None, headers=None):
+        if not upstream["up"]:
+            raise ConnectionError("upstream down")
+        return {"title": "Fractions", "extract": "Parts of a whole"}
+
+    monkeypatch.setattr(http_client, "sync_get", sync_get)
+
+    @shared_cached("test")
+    def summary(title):
+        data = http_client.safe_get(f"https://example.org/{title}", default={})
+        return ContentCard(source="Wiki", title=data.get("title", title))
+
+    assert summary("fractions") == ContentCard(source="Wiki", title="fractions")
+    assert redis.keys() == []
+
+    upstream["up"] = True
+    assert summary("fractions").title == "Fractions"
+    assert len(redis.keys()) == 1
+    assert shared_cache.get_shared_cache_stats()["upstream_fetches"] == 2
+
+
+def test_redis_errors_fall_through_to_upstream():
+    class BrokenRedis:
+        def get(self, key):
+            raise ConnectionError("redis down")
+
+        def set(self, key, value, ex=None):
+            raise ConnectionError("redis down")
+
+    set_l2(RedisBackend(BrokenRedis()))
+    loader = CountingLoader({"ok": True})
+
+    assert shared_get_or_fetch("test", "key", loader) == {"ok": True}
+    assert shared_cache.get_shared_cache_stats()["l2_errors"] == 2
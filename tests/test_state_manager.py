@@ -0,0 +1,213 @@
+"""
+Tests for services/state_manager.py (Redis hash storage and memory fallback)
+"""
+
+import threading
+
+import pytest
+
+from services.state_manager import (
+    GameRoomManager,
+    MemoryStore,
+    StateManager,
+    UserSessionManager,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(params=["redis", "memory"])
+def state(request, monkeypatch):
+    if request.param == "redis":
+        return StateManager(redis_client=fakeredis.FakeRedis())
+    monkeypatch.setattr("services.state_manager.REDIS_AVAILABLE", False)
+    return StateManager()
+
+
+def test_get_all_returns_live_values_only(state):
+    state.set("rooms", "a", {"n": 1}, ttl=60)
+    state.set("rooms", "b", {"n": 2})
+    state.set("rooms", "gone", {"n": 3}, ttl=-1)
+    state.set("other", "c", {"n": 4})
+
+    assert state.get_all("rooms") == {"a": {"n": 1}, "b": {"n": 2}}
+    assert state.get("rooms", "gone") is None
+
+    state.delete("rooms", "a")
+    assert state.get_many("rooms", ["a", "b", "missing"]) == {"b": {"n": 2}}
+
+
+def test_redis_layout_is_one_hash_per_prefix():
+    client = fakeredis.FakeRedis()
+    state = StateManager(redis_client=client)
+    state.set("rooms", "a", {"n": 1}, ttl=60)
+    state.set("rooms", "expired", {"n": 2}, ttl=-1)
+
+    state.get_all("rooms")
+
+    assert client.hkeys("tutor:rooms") == [b"a"]
+    assert client.zrange("tutor:rooms:expires", 0, -1) == [b"a"]
+    assert not client.keys("tutor:rooms:a")
+
+
+def test_user_sessions_use_the_per_user_index(state):
+    sessions = UserSessionManager(state)
+    mine = [sessions.create_session("ada", {"page": i}) for i in range(3)]
+    sessions.create_session("grace", {"page": 9})
+
+    sessions.delete_session(mine[0])
+    state.set("user_sessions", mine[1], {"user_id": "ada"}, ttl=-1)  # expire it
+
+    assert [s["id"] for s in sessions.get_user_sessions("ada")] == [mine[2]]
+    assert state.index_members("user_sessions:ada") == [mine[2]]
+
+
+def test_get_all_rooms(state):
+    rooms = GameRoomManager(state)
+    ids = {rooms.create_room(f"Room {i}", "math_race") for i in range(5)}
+
+    assert {room["id"] for room in rooms.get_all_rooms()} == ids
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def worker(i):
+        barrier.wait()
+        results.append(target(i))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_joins_never_overfill_a_room(state):
+    rooms = GameRoomManager(state)
+    room_id = rooms.create_room("Lobby", "math_race", max_players=10)
+
+    joined = _run_concurrently(50, lambda i: rooms.join_room(room_id, f"p{i}"))
+
+    player_ids = [pid for pid in joined if pid]
+    room = rooms.get_room(room_id)
+    assert len(player_ids) == 10
+    assert sorted(p["id"] for p in room["players"]) == sorted(player_ids)
+
+
+def test_concurrent_score_updates_are_not_lost(state):
+    rooms = GameRoomManager(state)
+    room_id = rooms.create_room("Race", "math_race", max_players=20)
+    players = [rooms.join_room(room_id, f"p{i}") for i in range(20)]
+
+    def play(i):
+        for _ in range(25):
+            rooms.add_to_score(room_id, players[i], i + 1)
+
+    _run_concurrently(20, play)
+
+    scores = {p["id"]: p["score"] for p in rooms.get_room(room_id)["players"]}
+    assert scores == {pid: 25 * (i + 1) for i, pid in enumerate(players)}
+    leaderboard = rooms.get_leaderboard(room_id, limit=3)
+    assert [entry["player_id"] for entry in leaderboard] == players[:-4:-1]
+    assert leaderboard[0] == {
+        "rank": 1,
+        "player_id": players[-1],
+        "name": "p19",
+        "score": 500,
+    }
+
+
+def test_room_lifecycle(state):
+    rooms = GameRoomManager(state)
+    room_id = rooms.create_room("Duel", "spelling", max_players=2)
+    first = rooms.join_room(room_id, "Ada")
+
+    assert not rooms.start_game(room_id)  # needs two players
+    second = rooms.join_room(room_id, "Grace")
+    assert rooms.join_room(room_id, "Late") is None
+    assert rooms.start_game(room_id)
+    assert rooms.get_room(room_id)["status"] == "playing"
+
+    rooms.update_player_score(room_id, first, 7)
+    rooms.update_player_score(room_id, "not-a-player", 99)
+    assert [e["score"] for e in rooms.get_leaderboard(room_id)] == [7, 0]
+
+    assert rooms.leave_room(room_id, first)
+    assert [p["id"] for p in rooms.get_room(room_id)["players"]] == [second]
+    assert rooms.leave_room(room_id, second)
+    assert rooms.get_room(room_id) is None
+    assert not rooms.leave_room(room_id, second)
+
+
+def test_memory_store_evicts_least_recently_used_per_prefix(monkeypatch):
+    monkeypatch.setattr("services.state_manager.REDIS_AVAILABLE", False)
+    store = MemoryStore(max_entries=3, prefix_limits={"rooms": 2})
+    state = StateManager(memory_store=store)
+
+    state.set("rooms", "a", 1)
+    state.set("rooms", "b", 2)
+    assert state.get("rooms", "a") == 1  # "b" is now least recently used
+    state.set("rooms", "c", 3)
+    for i in range(5):
+        state.set("sessions", str(i), i)
+
+    assert state.get_all("rooms") == {"a": 1, "c": 3}
+    assert set(state.get_all("sessions")) == {"2", "3", "4"}
+    stats = store.stats()
+    assert stats["prefixes"]["rooms"] == {
+        "entries": 2,
+        "bytes": 2 * len("a1"),
+        "max_entries": 2,
+        "evictions": 1,
+        "expirations": 0,
+    }
+    assert stats["evictions"] == 3
+
+
+def test_memory_store_sweep_reclaims_unread_entries():
+    store = MemoryStore()
+    store.set("user_sessions", "old", "{}", ttl=-1)
+    store.set("user_sessions", "new", "{}", ttl=60)
+    store.set("user_sessions", "again", "{}", ttl=-1)
+    store.set("user_sessions", "again", "{}", ttl=60)  # refreshed before expiry
+    store.index_add("user_sessions:ada", "old")
+    store.index_add("user_sessions:ada", "new")
+
+    assert store.sweep() == 1
+    assert set(store.items("user_sessions")) == {"new", "again"}
+    assert store.index_members("user_sessions:ada") == ["new"]
+    stats = store.stats()
+    assert stats["expirations"] == 1
+    assert stats["bytes"] == len("new{}") + len("again{}")
+
+
+def test_redis_sweep_reclaims_unread_fields_and_indexes():
+    client = fakeredis.FakeRedis()
+    state = StateManager(redis_client=client)
+    sessions = UserSessionManager(state)
+    old = sessions.create_session("ada", {})
+    new = sessions.create_session("ada", {})
+    state.set("user_sessions", old, {"user_id": "ada"}, ttl=-1)  # never read again
+    state.set("rooms", "gone", {}, ttl=-1)
+
+    assert state.memory_store is None
+    assert 0 < client.ttl("tutor:index:user_sessions:ada") <= 86400
+
+    assert state.sweep() == 2
+    assert client.hkeys("tutor:user_sessions") == [new.encode()]
+    assert client.zrange("tutor:user_sessions:expires", 0, -1) == [new.encode()]
+    assert not client.exists("tutor:rooms")
+    assert state.index_members("user_sessions:ada") == [new]
+
+
+def test_stats_report_backend_and_prefix_entries(state):
+    state.set("rooms", "a", {"n": 1})
+    state.set("rooms", "b", {"n": 2})
+
+    stats = state.get_stats()
+
+    assert stats["backend"] in ("redis", "memory")
+    assert stats["prefixes"]["rooms"]["entries"] == 2
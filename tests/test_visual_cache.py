@@ -0,0 +1,132 @@
+"""
+Tests for the static figure cache in visual_content_generator.py
+"""
+
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from cli import cli
+from database import add_lesson, add_subject, add_topic, close_pools, init_database
+from visual_content_generator import VisualContentGenerator
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return VisualContentGenerator(str(tmp_path / "lessons"), "/static/lessons")
+
+
+def _file(generator, visual):
+    return os.path.join(generator.output_dir, os.path.basename(visual["image_url"]))
+
+
+def test_figures_render_once_per_argument_set(generator):
+    half = generator.create_fraction_visual(1, 2)
+    assert generator.stats == {"hits": 0, "renders": 1}
+    assert half["image_url"].startswith("/static/lessons/fraction_visual-")
+    assert "figure" not in half and "image" not in half
+    with open(_file(generator, half), "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    assert generator.create_fraction_visual(1, 2) == half
+    assert generator.stats == {"hits": 1, "renders": 1}
+
+    quarters = generator.create_fraction_visual(3, 4)
+    assert quarters["image_url"] != half["image_url"]
+    assert generator.stats == {"hits": 1, "renders": 2}
+
+    # A fresh generator (another process, a restart) reuses the files too
+    again = VisualContentGenerator(generator.output_dir, generator.url_prefix)
+    assert again.create_fraction_visual(3, 4) == quarters
+    assert again.stats == {"hits": 1, "renders": 0}
+
+
+def test_lesson_rows_get_urls_instead_of_inline_images(generator):
+    lesson = {
+        "id": 7,
+        "title": "Multiplication Arrays",
+        "subject_name": "Mathematics",
+        "steps": ["Count the rows.", "Count the columns.", "Multiply them."],
+    }
+
+    visuals = generator.generate_visual_for_lesson(lesson)
+
+    assert visuals["header_image"].startswith("/static/lessons/header_image-")
+    assert len(visuals["concept_diagrams"]) == 2
+    assert [s["caption"] for s in visuals["step_illustrations"]] == lesson["steps"]
+    assert "data:image" not in json.dumps(visuals)
+    assert generator.stats["renders"] == 6
+
+    assert generator.generate_visual_for_lesson(lesson) == visuals
+    assert generator.stats == {"hits": 6, "renders": 6}
+
+
+def test_prerender_command_fills_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "tutor.db"))
+    monkeypatch.chdir(tmp_path)
+    init_database()
+    subject_id = add_subject("Science")
+    topic_id = add_topic(subject_id, "Cycles")
+    add_lesson(topic_id, "The Water Cycle", "", ["Evaporation"], [])
+    add_lesson(topic_id, "Weather", "", ["Look at clouds"], [])
+    close_pools()
+
+    first = CliRunner().invoke(cli, ["prerender-visuals", "--workers", "2"])
+    assert first.exit_code == 0, first.output
+    # Two headers, two steps and the water cycle diagram
+    assert "Rendered 5 figures, 0 already cached" in first.output
+    assert len(os.listdir(tmp_path / "static" / "images" / "lessons")) == 10
+
+    second = CliRunner().invoke(cli, ["prerender-visuals", "--workers", "2"])
+    assert "Rendered 0 figures, 5 already cached" in second.output
+
+
+LESSON = {
+    "title": "Fractions of a Pizza",
+    "subject_name": "Mathematics",
+    "steps": [f"Step {n}: cut the pizza" for n in range(1, 6)],
+}
+
+
+@pytest.fixture
+def pooled(tmp_path):
+    generator = VisualContentGenerator(
+        str(tmp_path / "lessons"), "/static/lessons", workers=2
+    )
+    yield generator
+    generator.pool.shutdown()
+
+
+def test_pool_renders_a_lesson_like_the_serial_path(pooled, generator):
+    visuals = pooled.generate_visual_for_lesson(LESSON)
+
+    assert len(visuals["concept_diagrams"]) == 3
+    assert len(visuals["step_illustrations"]) == 5
+    assert pooled.stats == {"hits": 0, "renders": 9}
+    for visual in visuals["concept_diagrams"] + visuals["step_illustrations"]:
+        assert os.path.exists(_file(pooled, visual))
+
+    # Same keys and files as drawing in-process
+    assert generator.generate_visual_for_lesson(LESSON) == visuals
+    assert generator.stats == {"hits": 9, "renders": 0}
+
+
+def test_figures_past_the_timeout_are_left_out_then_cached(pooled):
+    pooled.pool.warm_up()
+    visuals = pooled.generate_visual_for_lesson(LESSON, timeout=0)
+    assert visuals["header_image"] is None
+    assert visuals["step_illustrations"] == []
+
+    visuals = pooled.generate_visual_for_lesson(LESSON)
+    assert visuals["header_image"].startswith("/static/lessons/header_image-")
+    assert len(visuals["step_illustrations"]) == 5
+
+
+def test_a_failing_figure_does_not_sink_the_lesson(pooled):
+    visuals = pooled.render_figures(
+        [("create_number_line", (0, 20)), ("create_number_line", ("a", "b"))]
+    )
+    assert visuals[0]["image_url"].startswith("/static/lessons/number_line-")
+    assert visuals[1] is None
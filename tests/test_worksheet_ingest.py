@@ -0,0 +1,147 @@
+"""
+Tests for the background worksheet ingestion pipeline (services/worksheet_ingest.py)
+"""
+
+import io
+import os
+
+import pytest
+from flask import Flask
+from reportlab.pdfgen import canvas
+
+from blueprints import uploads
+from blueprints.tutor import routes as tutor_routes
+from database import add_subject, close_pools, get_connection, init_database
+from services import jobs, worksheet_ingest
+from services.state_manager import StateManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+WORKSHEET = b"Addition practice\n12 + 5 =\n7 + 8 =\n23 + 19 =\n6 x 7 =\n"
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    path = str(tmp_path / "tutor.db")
+    monkeypatch.setenv("DATABASE_URL", path)
+    monkeypatch.chdir(tmp_path)  # UPLOAD_FOLDER is relative
+    init_database()
+
+    state = StateManager(redis_client=fakeredis.FakeRedis())
+    monkeypatch.setattr(jobs, "state_manager", state)
+    queue = jobs.JobQueue(state, use_rq=False)
+    monkeypatch.setattr(uploads, "job_queue", queue)
+    monkeypatch.setattr(tutor_routes, "job_queue", queue)
+
+    app = Flask(__name__)
+    app.config["DATABASE_URL"] = path
+    app.register_blueprint(uploads.uploads_bp, url_prefix="/uploads")
+    app.register_blueprint(tutor_routes.tutor_bp)
+    yield app
+    close_pools()
+
+
+def _count(table):
+    conn = get_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _upload(client, data, filename="worksheet.txt"):
+    response = client.post(
+        "/uploads/api/upload/worksheet",
+        data={"file": (io.BytesIO(data), filename), "subject": "Math"},
+    )
+    assert response.status_code == 202, response.json
+    uploads.job_queue.wait(response.json["job_id"])
+    return client.get(response.json["status_url"]).json
+
+
+def test_upload_returns_a_job_and_the_lesson_lands_in_the_database(app):
+    add_subject("Math")
+    client = app.test_client()
+
+    status = _upload(client, WORKSHEET)
+
+    assert status["status"] == "finished"
+    assert status["stage"] == "persist"
+    assert status["progress"] == 100
+    assert set(status["stage_ms"]) == {"extract", "analyze", "persist"}
+    lesson = status["lesson_data"]
+    assert lesson["problems_found"] > 0
+    assert _count("lessons") == 1
+    assert _count("practice_problems") == lesson["problems_found"]
+    assert os.listdir(os.path.join("static", "uploads")) == []
+
+
+def test_failures_are_reported_with_the_stage_reached(app):
+    client = app.test_client()  # No subjects, so there is nowhere to save it
+
+    status = _upload(client, WORKSHEET)
+
+    assert status["status"] == "failed"
+    assert status["success"] is False
+    assert status["stage"] == "persist"
+    assert set(status["stage_ms"]) == {"extract", "analyze"}
+    assert status["error"].startswith("Failed to process worksheet")
+    assert _count("lessons") == 0
+    assert os.listdir(os.path.join("static", "uploads")) == []
+
+
+def test_pdf_extraction_reports_progress_per_page(app, tmp_path, monkeypatch):
+    add_subject("Math")
+    path = str(tmp_path / "scan.pdf")
+    pdf = canvas.Canvas(path)
+    for page in range(4):
+        pdf.drawString(72, 720, f"{page + 2} + {page + 3} =")
+        pdf.showPage()
+    pdf.save()
+
+    reports = []
+    report = worksheet_ingest.StageProgress.report
+
+    def record(self, stage, fraction):
+        reports.append((stage, fraction))
+        report(self, stage, fraction)
+
+    monkeypatch.setattr(worksheet_ingest.StageProgress, "report", record)
+    with app.app_context():
+        result = worksheet_ingest.ingest_worksheet_job("job", path, "Math")
+
+    assert result["problems_found"] > 0
+    assert [f for stage, f in reports if stage == "extract"] == [
+        0.0,
+        0.25,
+        0.5,
+        0.75,
+        1.0,
+        1.0,
+    ]
+    assert not os.path.exists(path)
+
+
+def test_tutor_conversions_run_the_same_job(app, tmp_path):
+    add_subject("Math")
+    os.mkdir(tmp_path / "temp")
+    client = app.test_client()
+
+    response = client.post(
+        "/tutor/worksheet/convert",
+        data={"file": (io.BytesIO(WORKSHEET), "worksheet.txt"), "subject": "Math"},
+    )
+    assert response.status_code == 202
+    uploads.job_queue.wait(response.json["job_id"])
+    status = client.get(response.json["status_url"]).json
+
+    assert status["status"] == "finished"
+    assert set(status["stage_ms"]) == {"extract", "analyze", "persist"}
+    assert _count("lessons") == 1
+    assert os.listdir(tmp_path / "temp") == []
+
+
+def test_unknown_jobs_are_not_found(app):
+    client = app.test_client()
+    assert client.get("/uploads/api/upload/jobs/nope").status_code == 404
+    assert client.get("/tutor/worksheet/jobs/nope").status_code == 404
@@ -14,14 +14,71 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import io
 import base64
+import functools
+import hashlib
+import json
+import logging
+import multiprocessing
 import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Tuple
 
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Bump when drawing code changes so previously rendered PNGs are not reused
+FIGURE_VERSION = 1
+
+
+def figure_key(name: str, args: tuple) -> str:
+    """File-safe cache key for a figure drawn by ``name`` from ``args``"""
+    payload = json.dumps([FIGURE_VERSION, args], default=str, ensure_ascii=False)
+    return f"{name}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]}"
+
+
+def cached_figure(method):
+    """Memoize a create_* figure as a static PNG keyed on its arguments.
+
+    The wrapped method returns a figure, or a dict holding one under
+    "figure". The first call saves the PNG and returns its URL in place of
+    the figure; later calls with the same arguments skip drawing entirely.
+    """
+    name = method.__name__.replace("create_", "", 1)
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = figure_key(name, args)
+        visual = self.load_figure(key)
+        if visual is None:
+            visual = self.save_figure(key, method(self, *args))
+        return visual
+
+    wrapper.figure_name = name
+    return wrapper
+
 
 class VisualContentGenerator:
-    def __init__(self):
-        """Initialize visual content generator"""
-        self.output_dir = "static/images/lessons"
+    def __init__(
+        self,
+        output_dir: str = "static/images/lessons",
+        url_prefix: str = "/static/images/lessons",
+        workers: int = 0,
+        timeout: float = 20.0,
+    ):
+        """Initialize visual content generator
+
+        With ``workers`` set, uncached figures are drawn on a RenderPool of
+        that many processes; ``timeout`` bounds each lesson's wait for them.
+        """
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix
+        self.timeout = timeout
+        self.pool = RenderPool(workers, output_dir, url_prefix) if workers else None
+        self.stats = {"hits": 0, "renders": 0}
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
@@ -32,36 +89,114 @@ class VisualContentGenerator:
             "bright": ["#FF1744", "#00E676", "#2196F3", "#FFEA00", "#FF6E40"],
         }
 
-    def generate_visual_for_lesson(self, lesson_data: Dict) -> Dict:
-        """Generate all visuals for a lesson"""
-        subject = lesson_data.get("subject", "general")
-        topic = lesson_data.get("topic", "")
-        lesson_id = lesson_data.get("lesson_id", 0)
+    def generate_visual_for_lesson(
+        self, lesson_data: Dict, timeout: float = None
+    ) -> Dict:
+        """Generate all visuals for a lesson
+
+        Figures that are not cached yet are drawn in parallel on the render
+        pool, if there is one. Any still missing after ``timeout`` seconds
+        are left out; they keep rendering and are cached for the next call.
+        """
+        plan = self.lesson_figure_calls(lesson_data)
+        rendered = iter(
+            self.render_figures(
+                [call for calls in plan.values() for call in calls],
+                self.timeout if timeout is None else timeout,
+            )
+        )
+        figures = {
+            group: [next(rendered) for _ in calls] for group, calls in plan.items()
+        }
 
-        visuals = {
-            "header_image": self.create_header_image(topic, subject),
-            "concept_diagrams": [],
-            "step_illustrations": [],
+        return {
+            "header_image": figures["header_image"][0],
+            "concept_diagrams": [v for v in figures["concept_diagrams"] if v],
+            "step_illustrations": [v for v in figures["step_illustrations"] if v],
             "practice_images": [],
         }
 
-        # Generate subject-specific visuals
+    def lesson_figure_calls(
+        self, lesson_data: Dict
+    ) -> Dict[str, List[Tuple[str, tuple]]]:
+        """Every figure a lesson shows, as (method name, args) pairs by section"""
+        # Accept both generator-style dicts and lesson rows from the database
+        subject = lesson_data.get("subject") or lesson_data.get(
+            "subject_name", "general"
+        )
+        topic = lesson_data.get("topic") or lesson_data.get("title", "")
+
+        # Subject-specific visuals
+        diagrams = []
         if "math" in subject.lower():
-            visuals["concept_diagrams"] = self.create_math_diagrams(topic, lesson_id)
+            diagrams = self.math_diagram_calls(topic)
         elif "science" in subject.lower():
-            visuals["concept_diagrams"] = self.create_science_diagrams(topic, lesson_id)
+            diagrams = self.science_diagram_calls(topic)
 
-        # Generate step-by-step illustrations
+        # Step-by-step illustrations for the first 5 steps
         steps = lesson_data.get("steps", [])
-        for i, step in enumerate(steps[:5]):  # First 5 steps
-            visual = self.create_step_illustration(step, i, subject)
-            if visual:
-                visuals["step_illustrations"].append(visual)
+        return {
+            "header_image": [("create_header_image", (topic, subject))],
+            "concept_diagrams": diagrams,
+            "step_illustrations": [
+                self.step_card_call(step, i, subject)
+                for i, step in enumerate(steps[:5])
+            ],
+        }
 
-        return visuals
+    def render_figures(
+        self, calls: List[Tuple[str, tuple]], timeout: float = None
+    ) -> List:
+        """Run (method name, args) figure calls and return their visuals in order
+
+        Without a pool each figure is drawn here in turn. With one, cached
+        figures are read here and the rest are submitted to the pool at once
+        and gathered for up to ``timeout`` seconds (no limit when None). A
+        figure that failed or is still drawing comes back as None; the pool
+        finishes the ones still drawing, so the next request finds them cached.
+        """
+        if self.pool is None:
+            return [getattr(self, method)(*args) for method, args in calls]
+
+        results = [None] * len(calls)
+        misses = {}
+        for i, (method, args) in enumerate(calls):
+            key = figure_key(getattr(type(self), method).figure_name, args)
+            results[i] = self.load_figure(key)
+            if results[i] is None:
+                misses.setdefault((method, args), []).append(i)
+        if not misses:
+            return results
+
+        futures = {
+            self.pool.submit(method, args): indexes
+            for (method, args), indexes in misses.items()
+        }
+        done, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            logger.warning(
+                "%d of %d figures still rendering after %ss",
+                len(not_done),
+                len(futures),
+                timeout,
+            )
 
+        for future in done:
+            try:
+                visual, rendered = future.result()
+            except Exception as e:
+                logger.exception("Figure render failed")
+                if isinstance(e, BrokenProcessPool):
+                    self.pool.reset()
+                continue
+            self.stats["renders" if rendered else "hits"] += 1
+            for i in futures[future]:
+                results[i] = visual
+        return results
+
+    @cached_figure
     def create_header_image(self, topic: str, subject: str) -> str:
-        """Create colorful header image for lesson"""
+        """Create colorful header image for lesson (returns its URL)"""
         fig, ax = plt.subplots(figsize=(12, 3))
 
         # Gradient background
@@ -90,46 +225,50 @@ class VisualContentGenerator:
 
         ax.axis("off")
 
-        # Save to base64
-        return self.fig_to_base64(fig)
+        return fig
 
     def create_math_diagrams(self, topic: str, lesson_id: int) -> List[Dict]:
         """Create math-specific diagrams"""
-        diagrams = []
+        return self.render_figures(self.math_diagram_calls(topic))
+
+    def math_diagram_calls(self, topic: str) -> List[Tuple[str, tuple]]:
+        """The math diagrams for a topic, as (method name, args) pairs"""
+        calls = []
 
         topic_lower = topic.lower()
 
         # Division visuals
         if "division" in topic_lower:
-            diagrams.append(self.create_division_visual(24, 6))
-            diagrams.append(self.create_division_visual(48, 8))
+            calls.append(("create_division_visual", (24, 6)))
+            calls.append(("create_division_visual", (48, 8)))
 
         # Fraction visuals
         elif "fraction" in topic_lower:
-            diagrams.append(self.create_fraction_visual(1, 2))
-            diagrams.append(self.create_fraction_visual(3, 4))
-            diagrams.append(self.create_fraction_visual(2, 3))
+            calls.append(("create_fraction_visual", (1, 2)))
+            calls.append(("create_fraction_visual", (3, 4)))
+            calls.append(("create_fraction_visual", (2, 3)))
 
         # Geometry visuals
         elif "geometry" in topic_lower or "shape" in topic_lower:
-            diagrams.append(self.create_shapes_visual())
-            diagrams.append(self.create_angles_visual())
+            calls.append(("create_shapes_visual", ()))
+            calls.append(("create_angles_visual", ()))
 
         # Number line
         elif "number" in topic_lower or "counting" in topic_lower:
-            diagrams.append(self.create_number_line(0, 20))
+            calls.append(("create_number_line", (0, 20)))
 
         # Multiplication array
         elif "multiplication" in topic_lower:
-            diagrams.append(self.create_multiplication_array(4, 5))
-            diagrams.append(self.create_multiplication_array(3, 6))
+            calls.append(("create_multiplication_array", (4, 5)))
+            calls.append(("create_multiplication_array", (3, 6)))
 
         # Graph/coordinate plane
         elif "graph" in topic_lower or "coordinate" in topic_lower:
-            diagrams.append(self.create_coordinate_plane())
+            calls.append(("create_coordinate_plane", ()))
 
-        return diagrams
+        return calls
 
+    @cached_figure
     def create_division_visual(self, dividend: int, divisor: int) -> Dict:
         """Create visual representation of division"""
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -192,10 +331,11 @@ class VisualContentGenerator:
 
         return {
             "type": "division",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": f"Visual representation: {dividend} items divided into {divisor} groups of {quotient}",
         }
 
+    @cached_figure
     def create_fraction_visual(self, numerator: int, denominator: int) -> Dict:
         """Create visual representation of fractions"""
         fig, ax = plt.subplots(figsize=(8, 8))
@@ -245,10 +385,11 @@ class VisualContentGenerator:
 
         return {
             "type": "fraction",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": f"{numerator} out of {denominator} parts shaded",
         }
 
+    @cached_figure
     def create_shapes_visual(self) -> Dict:
         """Create visual of basic shapes"""
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -306,10 +447,11 @@ class VisualContentGenerator:
 
         return {
             "type": "shapes",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "Common geometric shapes",
         }
 
+    @cached_figure
     def create_angles_visual(self) -> Dict:
         """Create visual of different angles"""
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -357,10 +499,11 @@ class VisualContentGenerator:
 
         return {
             "type": "angles",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "Different types of angles",
         }
 
+    @cached_figure
     def create_number_line(self, start: int, end: int) -> Dict:
         """Create number line visual"""
         fig, ax = plt.subplots(figsize=(14, 3))
@@ -400,10 +543,11 @@ class VisualContentGenerator:
 
         return {
             "type": "number_line",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": f"Number line from {start} to {end}",
         }
 
+    @cached_figure
     def create_multiplication_array(self, rows: int, cols: int) -> Dict:
         """Create multiplication array visual"""
         fig, ax = plt.subplots(figsize=(10, 8))
@@ -449,10 +593,11 @@ class VisualContentGenerator:
 
         return {
             "type": "multiplication_array",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": f"Array showing {rows} × {cols} = {rows*cols}",
         }
 
+    @cached_figure
     def create_coordinate_plane(self) -> Dict:
         """Create coordinate plane"""
         fig, ax = plt.subplots(figsize=(10, 10))
@@ -481,27 +626,32 @@ class VisualContentGenerator:
 
         return {
             "type": "coordinate_plane",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "Coordinate plane with example points",
         }
 
     def create_science_diagrams(self, topic: str, lesson_id: int) -> List[Dict]:
         """Create science-specific diagrams"""
-        diagrams = []
+        return self.render_figures(self.science_diagram_calls(topic))
+
+    def science_diagram_calls(self, topic: str) -> List[Tuple[str, tuple]]:
+        """The science diagrams for a topic, as (method name, args) pairs"""
+        calls = []
 
         topic_lower = topic.lower()
 
         if "cell" in topic_lower:
-            diagrams.append(self.create_cell_diagram())
+            calls.append(("create_cell_diagram", ()))
         elif "photosynthesis" in topic_lower or "plant" in topic_lower:
-            diagrams.append(self.create_photosynthesis_diagram())
+            calls.append(("create_photosynthesis_diagram", ()))
         elif "water cycle" in topic_lower:
-            diagrams.append(self.create_water_cycle())
+            calls.append(("create_water_cycle", ()))
         elif "solar system" in topic_lower or "planet" in topic_lower:
-            diagrams.append(self.create_solar_system())
+            calls.append(("create_solar_system", ()))
 
-        return diagrams
+        return calls
 
+    @cached_figure
     def create_cell_diagram(self) -> Dict:
         """Create simple cell diagram"""
         fig, ax = plt.subplots(figsize=(10, 10))
@@ -539,10 +689,11 @@ class VisualContentGenerator:
 
         return {
             "type": "cell",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "Basic parts of a cell",
         }
 
+    @cached_figure
     def create_photosynthesis_diagram(self) -> Dict:
         """Create photosynthesis diagram"""
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -598,10 +749,11 @@ class VisualContentGenerator:
 
         return {
             "type": "photosynthesis",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "How plants make food from sunlight",
         }
 
+    @cached_figure
     def create_water_cycle(self) -> Dict:
         """Create water cycle diagram"""
         fig, ax = plt.subplots(figsize=(14, 10))
@@ -655,10 +807,11 @@ class VisualContentGenerator:
 
         return {
             "type": "water_cycle",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "How water moves through our environment",
         }
 
+    @cached_figure
     def create_solar_system(self) -> Dict:
         """Create solar system diagram"""
         fig, ax = plt.subplots(figsize=(16, 10))
@@ -694,12 +847,27 @@ class VisualContentGenerator:
 
         return {
             "type": "solar_system",
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": "The planets in our solar system",
         }
 
     def create_step_illustration(self, step: Dict, step_num: int, subject: str) -> Dict:
         """Create illustration for a teaching step"""
+        return self.create_step_card(*self.step_card_call(step, step_num, subject)[1])
+
+    def step_card_call(self, step, step_num: int, subject: str) -> Tuple[str, tuple]:
+        """The step card for a teaching step, as a (method name, args) pair"""
+        if isinstance(step, str):
+            title = step  # Seeded lessons store steps as plain text
+        else:
+            title = step.get("title", f"Step {step_num + 1}")
+        icons = {"math": "📐", "science": "🔬", "english": "📖", "social": "🌍"}
+        icon = next((v for k, v in icons.items() if k in subject.lower()), "💡")
+        return "create_step_card", (title, step_num, icon)
+
+    @cached_figure
+    def create_step_card(self, title: str, step_num: int, icon: str) -> Dict:
+        """Draw a numbered step card (keyed only on what it shows)"""
         fig, ax = plt.subplots(figsize=(10, 6))
 
         # Step number badge
@@ -736,12 +904,9 @@ class VisualContentGenerator:
         ax.add_patch(rect)
 
         # Step title
-        title = step.get("title", f"Step {step_num + 1}")
         ax.text(5.75, 5.5, title, ha="center", fontsize=14, weight="bold", wrap=True)
 
-        # Add icon based on subject
-        icons = {"math": "📐", "science": "🔬", "english": "📖", "social": "🌍"}
-        icon = next((v for k, v in icons.items() if k in subject.lower()), "💡")
+        # Subject icon
         ax.text(8.5, 5, icon, fontsize=48, ha="center", va="center")
 
         ax.set_xlim(0, 10)
@@ -750,12 +915,47 @@ class VisualContentGenerator:
 
         return {
             "step": step_num + 1,
-            "image": self.fig_to_base64(fig),
+            "figure": fig,
             "caption": title,
         }
 
-    def fig_to_base64(self, fig) -> str:
-        """Convert matplotlib figure to base64 string"""
+    def load_figure(self, key: str):
+        """The visual saved under ``key``, or None if it was never rendered"""
+        try:
+            with open(os.path.join(self.output_dir, f"{key}.json"), "rb") as f:
+                visual = json.load(f)["visual"]
+        except (OSError, ValueError, KeyError):
+            return None
+        self.stats["hits"] += 1
+        return visual
+
+    def save_figure(self, key: str, visual):
+        """Write the figure in ``visual`` to ``<key>.png`` and swap in its URL"""
+        fig = visual.pop("figure") if isinstance(visual, dict) else visual
+        url = f"{self.url_prefix}/{key}.png"
+        if isinstance(visual, dict):
+            visual["image_url"] = url
+        else:
+            visual = url
+
+        # PNG first: a sidecar on disk means its image is complete
+        self._write_atomic(f"{key}.png", self.fig_to_png(fig))
+        self._write_atomic(f"{key}.json", json.dumps({"visual": visual}).encode())
+        self.stats["renders"] += 1
+        return visual
+
+    def _write_atomic(self, filename: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=self.output_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, os.path.join(self.output_dir, filename))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def fig_to_png(self, fig) -> bytes:
+        """Render a matplotlib figure to PNG bytes and close it"""
         buf = io.BytesIO()
         fig.savefig(
             buf,
@@ -765,14 +965,93 @@ class VisualContentGenerator:
             facecolor="white",
             edgecolor="none",
         )
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode("utf-8")
         plt.close(fig)
+        return buf.getvalue()
+
+    def fig_to_base64(self, fig) -> str:
+        """Convert matplotlib figure to base64 string"""
+        img_base64 = base64.b64encode(self.fig_to_png(fig)).decode("utf-8")
         return f"data:image/png;base64,{img_base64}"
 
 
+class RenderPool:
+    """Worker processes that draw figures for a VisualContentGenerator.
+
+    pyplot keeps global state and holds the GIL while drawing, so figures
+    for concurrent requests can't be drawn in threads in parallel, or even
+    safely. Workers are spawned once, import matplotlib on the Agg backend
+    and draw a warm-up figure so fonts are loaded before the first real
+    render. They write into the same static figure cache as the parent.
+    """
+
+    def __init__(self, workers: int, output_dir: str, url_prefix: str):
+        self.workers = workers
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_render_worker,
+                    initargs=(self.output_dir, self.url_prefix),
+                )
+            return self._executor
+
+    def submit(self, method: str, args: tuple) -> Future:
+        """Draw ``method(*args)`` in a worker; resolves to (visual, rendered)"""
+        try:
+            return self._get_executor().submit(_render_in_worker, method, args)
+        except BrokenProcessPool:
+            self.reset()
+            return self._get_executor().submit(_render_in_worker, method, args)
+
+    def warm_up(self):
+        """Start the workers now instead of on the first request"""
+        executor = self._get_executor()
+        wait([executor.submit(os.getpid) for _ in range(self.workers)])
+
+    def reset(self):
+        """Drop the executor (a worker died); the next submit starts a new one"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Set in each RenderPool worker process by _init_render_worker
+_worker_generator = None
+
+
+def _init_render_worker(output_dir: str, url_prefix: str):
+    global _worker_generator
+    _worker_generator = VisualContentGenerator(output_dir, url_prefix)
+    fig, ax = plt.subplots(figsize=(2, 1))
+    ax.text(0.5, 0.5, "Warm-up", weight="bold", ha="center")
+    _worker_generator.fig_to_png(fig)
+
+
+def _render_in_worker(method: str, args: tuple):
+    before = _worker_generator.stats["renders"]
+    visual = getattr(_worker_generator, method)(*args)
+    return visual, _worker_generator.stats["renders"] > before
+
+
 # Global instance
-visual_generator = VisualContentGenerator()
+visual_generator = VisualContentGenerator(
+    workers=get_config().VISUAL_RENDER_WORKERS,
+    timeout=get_config().VISUAL_RENDER_TIMEOUT,
+)
 
 
 def generate_visual_content(lesson_data: Dict) -> Dict:
@@ -7,12 +7,30 @@ This uses OCR, AI, and pattern recognition to create BADASS lessons!
 import os
 import json
 import re
-from typing import Dict, List, Tuple
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
 from PIL import Image
 import PyPDF2
 from docx import Document
 import pytesseract
-from database import add_lesson, add_practice_problem, add_topic, get_all_subjects
+from database import (
+    add_lesson,
+    add_practice_problem,
+    add_topic,
+    bulk_seeding,
+    get_all_subjects,
+)
+
+
+class _NoProgress:
+    """Stage reporter for conversions nobody is watching"""
+
+    @contextmanager
+    def stage(self, stage: str):
+        yield
+
+    def report(self, stage: str, fraction: float):
+        pass
 
 
 class WorksheetAIConverter:
@@ -47,24 +65,39 @@ class WorksheetAIConverter:
             "matching": r"\d+\.\s*.+\s+[A-Z]\.",
         }
 
-    def process_uploaded_worksheet(self, file_path: str, subject: str = "Math") -> Dict:
-        """Main function to process uploaded worksheet"""
+    def process_uploaded_worksheet(
+        self, file_path: str, subject: str = "Math", progress=None
+    ) -> Dict:
+        """Main function to process uploaded worksheet
+
+        Runs in three stages: extract, analyze and persist. ``progress``
+        (e.g. services.worksheet_ingest.StageProgress) gets a ``stage(name)``
+        block around each one and ``report(stage, fraction)`` calls as PDF
+        pages are read.
+        """
         print(f"🚀 Processing worksheet: {file_path}")
+        progress = progress or _NoProgress()
 
         # Step 1: Extract text from file
-        extracted_text = self.extract_text(file_path)
+        with progress.stage("extract"):
+            extracted_text = self.extract_text(
+                file_path,
+                lambda done, total: progress.report("extract", done / total),
+            )
 
-        # Step 2: Analyze and identify problem types
-        analysis = self.analyze_worksheet(extracted_text, subject)
+        with progress.stage("analyze"):
+            # Step 2: Analyze and identify problem types
+            analysis = self.analyze_worksheet(extracted_text, subject)
 
-        # Step 3: Generate comprehensive lesson
-        lesson_data = self.generate_lesson_from_worksheet(analysis, subject)
+            # Step 3: Generate comprehensive lesson
+            lesson_data = self.generate_lesson_from_worksheet(analysis, subject)
 
-        # Step 4: Create practice problems
-        practice_problems = self.generate_practice_problems(analysis)
+            # Step 4: Create practice problems
+            practice_problems = self.generate_practice_problems(analysis)
 
         # Step 5: Save to database
-        lesson_id = self.save_to_database(lesson_data, practice_problems, subject)
+        with progress.stage("persist"):
+            lesson_id = self.save_to_database(lesson_data, practice_problems, subject)
 
         return {
             "lesson_id": lesson_id,
@@ -74,14 +107,19 @@ class WorksheetAIConverter:
             "success": True,
         }
 
-    def extract_text(self, file_path: str) -> str:
-        """Extract text from various file formats"""
+    def extract_text(
+        self, file_path: str, progress: Optional[Callable[[int, int], None]] = None
+    ) -> str:
+        """Extract text from various file formats
+
+        ``progress(done, total)`` is called as PDF pages are read.
+        """
         file_ext = os.path.splitext(file_path)[1].lower()
 
         print(f"📄 Extracting text from {file_ext} file...")
 
         if file_ext == ".pdf":
-            return self.extract_from_pdf(file_path)
+            return self.extract_from_pdf(file_path, progress)
         elif file_ext in [".png", ".jpg", ".jpeg"]:
             return self.extract_from_image(file_path)
         elif file_ext in [".docx", ".doc"]:
@@ -91,7 +129,9 @@ class WorksheetAIConverter:
         else:
             raise ValueError(f"Unsupported file format: {file_ext}")
 
-    def extract_from_pdf(self, file_path: str) -> str:
+    def extract_from_pdf(
+        self, file_path: str, progress: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """Extract text from PDF using PyPDF2 and OCR"""
         text = ""
 
@@ -109,6 +149,9 @@ class WorksheetAIConverter:
                         print(f"  Using OCR for page {page_num + 1}...")
                         # Would convert PDF page to image and use OCR
                         # For now, return what we have
+
+                    if progress:
+                        progress(page_num + 1, len(pdf_reader.pages))
         except Exception as e:
             print(f"  Error extracting PDF: {e}")
 
@@ -538,9 +581,20 @@ class WorksheetAIConverter:
     def save_to_database(
         self, lesson_data: Dict, practice_problems: List[Dict], subject: str
     ) -> int:
-        """Save generated lesson and problems to database"""
+        """Save generated lesson and problems to database (one transaction)"""
         print("💾 Saving to database...")
 
+        with bulk_seeding():
+            lesson_id = self._save_rows(lesson_data, practice_problems, subject)
+
+        print(f"✅ Lesson created with ID: {lesson_id}")
+        print(f"✅ {len(practice_problems)} practice problems added")
+
+        return lesson_id
+
+    def _save_rows(
+        self, lesson_data: Dict, practice_problems: List[Dict], subject: str
+    ) -> int:
         # Get subject ID
         subjects = get_all_subjects()
         subject_obj = next(
@@ -580,10 +634,6 @@ class WorksheetAIConverter:
                 difficulty=problem.get("difficulty", "medium"),
                 display_order=i,
             )
-
-        print(f"✅ Lesson created with ID: {lesson_id}")
-        print(f"✅ {len(practice_problems)} practice problems added")
-
         return lesson_id
 
 
@@ -591,6 +641,8 @@ class WorksheetAIConverter:
 worksheet_converter = WorksheetAIConverter()
 
 
-def convert_worksheet_to_lesson(file_path: str, subject: str = "Math") -> Dict:
+def convert_worksheet_to_lesson(
+    file_path: str, subject: str = "Math", progress=None
+) -> Dict:
     """Quick function to convert worksheet to lesson"""
-    return worksheet_converter.process_uploaded_worksheet(file_path, subject)
+    return worksheet_converter.process_uploaded_worksheet(file_path, subject, progress)